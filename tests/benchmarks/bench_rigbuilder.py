@@ -0,0 +1,291 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for the hot paths of RigBuilder executed on a synthetic project
+Results are stored per RigBuilder version, so regressions are visible between versions
+Usage: python -m tests.benchmarks.bench_rigbuilder [--rigs N] [--nodes N] [--large-nodes N] [--save] [--compare FILE]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+
+from tests.benchmarks import generator
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+REGRESSION_THRESHOLD = 1.2
+BENCHMARKS = list()
+
+
+class BenchmarkContext(object):
+    """
+    Class that contains the synthetic project used by benchmarks
+    Single rig benchmarks use the last rig of the project, which is the largest one
+    """
+
+    def __init__(self, project_path, rig_paths, project=None):
+        self.project_path = project_path
+        self.rig_paths = rig_paths
+        self.project = project
+
+    def get_rig(self, index=-1):
+        """
+        Returns a new rig object of the rig with the given index
+        :param index: int
+        :return: RigObject
+        """
+
+        from tpRigToolkit.tools.rigbuilder.objects import helpers
+
+        return helpers.RigHelpers.get_rig(self.rig_paths[index])
+
+
+def benchmark(name, setup=None):
+    """
+    Decorator that registers a benchmark function
+    :param name: str, name of the benchmark
+    :param setup: callable or None, function that receives the benchmark context and returns the arguments of the
+        benchmark function. Setup time is not measured
+    """
+
+    def _register(fn):
+        BENCHMARKS.append((name, fn, setup))
+        return fn
+
+    return _register
+
+
+@benchmark('RigHelpers.find_rigs')
+def bench_find_rigs(context):
+    from tpRigToolkit.tools.rigbuilder.objects import helpers
+
+    return list(helpers.RigHelpers.find_rigs(context.project_path, as_full_path=True))
+
+
+@benchmark('RigBuilderProject.find_rig')
+def bench_find_rig(context):
+    if not context.project:
+        raise NotImplementedError('Synthetic project could not be loaded')
+    return context.project.find_rig(os.path.basename(context.rig_paths[-1]))
+
+
+@benchmark('ScriptObject.get_scripts_manifest', setup=lambda context: (context.get_rig(), ))
+def bench_get_scripts_manifest(context, rig_object):
+    return rig_object.get_scripts_manifest()
+
+
+@benchmark('ScriptObject.get_scripts_manifest (cached)', setup=lambda context: (_get_rig_with_manifest(context), ))
+def bench_get_scripts_manifest_cached(context, rig_object):
+    return rig_object.get_scripts_manifest()
+
+
+@benchmark('ScriptObject.sync', setup=lambda context: (context.get_rig(), ))
+def bench_sync(context, rig_object):
+    return rig_object.sync()
+
+
+@benchmark('ScriptObject.get_code_files', setup=lambda context: (context.get_rig(), ))
+def bench_get_code_files(context, rig_object):
+    return rig_object.get_code_files()
+
+
+@benchmark('RigObject.get_build_node_instance', setup=lambda context: (_get_rig_with_manifest(context), ))
+def bench_get_build_node_instance(context, rig_object):
+    scripts, _ = rig_object.get_scripts_manifest()
+    return [rig_object.get_build_node_instance(os.path.splitext(script)[0]) for script in scripts]
+
+
+@benchmark('RigObject.run', setup=lambda context: (context.get_rig(), ))
+def bench_run(context, rig_object):
+    return rig_object.run(hard_error=False)
+
+
+def create_context(root_directory, rigs, nodes, large_nodes=None):
+    """
+    Creates the synthetic project used by benchmarks
+    :param root_directory: str
+    :param rigs: int
+    :param nodes: int
+    :param large_nodes: int or None
+    :return: BenchmarkContext
+    """
+
+    from tpRigToolkit.tools.rigbuilder.core import api
+
+    project_path, rig_paths = generator.create_project(
+        root_directory, rigs=rigs, nodes=nodes, large_nodes=large_nodes)
+    project = api.get_project_by_name(root_directory, os.path.basename(project_path))
+    api.set_project(project)
+
+    return BenchmarkContext(project_path, rig_paths, project=project)
+
+
+def run_benchmarks(context, repeat=3, names=None):
+    """
+    Runs registered benchmarks
+    :param context: BenchmarkContext
+    :param repeat: int, number of times each benchmark is executed
+    :param names: list(str) or None, names of the benchmarks to execute. If not given, all benchmarks are executed
+    :return: dict, best and mean time in seconds of each benchmark
+    """
+
+    results = dict()
+    for name, fn, setup in BENCHMARKS:
+        if names and name not in names:
+            continue
+        times = list()
+        try:
+            for _ in range(repeat):
+                args = setup(context) if setup else tuple()
+                start = time.time()
+                fn(context, *args)
+                times.append(time.time() - start)
+        except NotImplementedError as exc:
+            print('Skipping {}: {}'.format(name, exc))
+            continue
+        results[name] = {'best': min(times), 'mean': sum(times) / len(times), 'repeat': repeat}
+
+    return results
+
+
+def get_results_file(rigbuilder_version=None):
+    """
+    Returns the file where results of the given RigBuilder version are stored
+    :param rigbuilder_version: str or None, if not given, current version is used
+    :return: str
+    """
+
+    if not rigbuilder_version:
+        from tpRigToolkit.tools.rigbuilder import __version__
+        rigbuilder_version = __version__.__version__
+
+    return os.path.join(RESULTS_PATH, '{}.json'.format(rigbuilder_version))
+
+
+def save_results(results, params, results_file=None):
+    """
+    Stores given benchmark results in disk
+    :param results: dict
+    :param params: dict, parameters used to generate the synthetic project
+    :param results_file: str or None
+    :return: str, file where results were stored
+    """
+
+    results_file = results_file or get_results_file()
+    if not os.path.isdir(os.path.dirname(results_file)):
+        os.makedirs(os.path.dirname(results_file))
+
+    with open(results_file, 'w') as fh:
+        json.dump({
+            'python': platform.python_version(), 'platform': platform.platform(), 'date': time.strftime('%Y-%m-%d'),
+            'params': params, 'results': results}, fh, indent=2, sort_keys=True)
+
+    return results_file
+
+
+def load_results(results_file):
+    """
+    Returns benchmark results stored in the given file
+    :param results_file: str
+    :return: dict
+    """
+
+    with open(results_file, 'r') as fh:
+        return json.load(fh)
+
+
+def print_results(results, baseline=None):
+    """
+    Prints given results. If baseline results are given, the ratio between both results is printed and regressions
+    are highlighted
+    :param results: dict
+    :param baseline: dict or None
+    :return: list(str), names of the benchmarks that regressed
+    """
+
+    regressions = list()
+    name_width = max([len(name) for name in results] + [9])
+    print('{}  {:>10}  {:>10}  {:>10}'.format('benchmark'.ljust(name_width), 'best', 'mean', 'ratio'))
+    for name, _, _ in BENCHMARKS:
+        if name not in results:
+            continue
+        ratio = ''
+        baseline_result = (baseline or dict()).get(name, None)
+        if baseline_result and baseline_result['best']:
+            value = results[name]['best'] / baseline_result['best']
+            ratio = '{:.2f}'.format(value)
+            if value > REGRESSION_THRESHOLD:
+                ratio += ' !'
+                regressions.append(name)
+        print('{}  {:>10.4f}  {:>10.4f}  {:>10}'.format(
+            name.ljust(name_width), results[name]['best'], results[name]['mean'], ratio))
+
+    return regressions
+
+
+def main(args=None):
+    """
+    Runs benchmarks and prints the results
+    :param args: list(str) or None
+    :return: int, exit code. 1 if any benchmark regressed compared with the baseline results; 0 otherwise
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmarks RigBuilder hot paths on a synthetic project')
+    parser.add_argument('--rigs', type=int, default=200, help='Number of rigs of the synthetic project')
+    parser.add_argument('--nodes', type=int, default=50, help='Number of build nodes of each rig')
+    parser.add_argument(
+        '--large-nodes', type=int, default=2000, help='Number of build nodes of the rig used by single rig benchmarks')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of times each benchmark is executed')
+    parser.add_argument('--benchmarks', nargs='*', default=None, help='Names of the benchmarks to execute')
+    parser.add_argument('--save', action='store_true', help='Store results of the current RigBuilder version')
+    parser.add_argument('--compare', default=None, help='Results file used as baseline')
+    parsed_args = parser.parse_args(args)
+
+    logging.getLogger('tpRigToolkit').setLevel(logging.ERROR)
+
+    from tpRigToolkit.tools.rigbuilder.core import nulldcc
+
+    root_directory = tempfile.mkdtemp(prefix='rigbuilder_bench_')
+    try:
+        # Builds are executed against the in-memory null DCC, so only RigBuilder time is measured
+        with nulldcc.use_dcc():
+            context = create_context(
+                root_directory, parsed_args.rigs, parsed_args.nodes, large_nodes=parsed_args.large_nodes)
+            results = run_benchmarks(context, repeat=parsed_args.repeat, names=parsed_args.benchmarks)
+    finally:
+        shutil.rmtree(root_directory)
+
+    baseline = load_results(parsed_args.compare)['results'] if parsed_args.compare else None
+    regressions = print_results(results, baseline=baseline)
+    if parsed_args.save:
+        print('Results stored in: {}'.format(
+            save_results(results, {
+                'rigs': parsed_args.rigs, 'nodes': parsed_args.nodes, 'large_nodes': parsed_args.large_nodes})))
+
+    return 1 if regressions else 0
+
+
+def _get_rig_with_manifest(context):
+    """
+    Internal function that returns a rig object whose manifest is already loaded
+    :param context: BenchmarkContext
+    :return: RigObject
+    """
+
+    rig_object = context.get_rig()
+    rig_object.get_scripts_manifest()
+
+    return rig_object
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains benchmarks for the synchronization of rig manifests with the code folders stored in disk
+Usage: python -m tests.benchmarks.bench_sync [entries ...]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+DEFAULT_SIZES = [1250, 2500, 5000, 10000, 20000]
+
+
+def create_rig(root_directory, entries, rig_name='rig'):
+    """
+    Creates a rig in disk with the given number of code folders
+    Half of the code folders are stored in the manifest, the other half are new folders that sync must append
+    :param root_directory: str
+    :param entries: int
+    :param rig_name: str
+    :return: RigObject
+    """
+
+    from tpRigToolkit.tools.rigbuilder.objects import script
+
+    rig_path = os.path.join(root_directory, rig_name)
+    code_path = os.path.join(rig_path, script.ScriptObject.CODE_FOLDER)
+    manifest_path = os.path.join(code_path, script.ScriptObject.MANIFEST_FOLDER)
+    os.makedirs(manifest_path)
+
+    lines = list()
+    for i in range(entries):
+        parent_name = 'node_{}'.format(i // 10)
+        code_name = parent_name if not i % 10 else '{}/child_{}'.format(parent_name, i)
+        code_folder = os.path.join(code_path, code_name)
+        if not os.path.isdir(code_folder):
+            os.makedirs(code_folder)
+        with open(os.path.join(code_folder, '{}.py'.format(os.path.basename(code_name))), 'w') as fh:
+            fh.write('\ndef main():\n    return\n')
+        if i % 2:
+            lines.append('{} True'.format(code_name + '.py'))
+
+    with open(os.path.join(manifest_path, 'manifest.data'), 'w') as fh:
+        fh.write('\n'.join(lines))
+
+    script_object = script.ScriptObject(rig_name)
+    script_object.set_directory(root_directory)
+
+    return script_object
+
+
+def bench_sync(entries):
+    """
+    Returns the time in seconds that takes to sync a rig with the given number of code folders
+    :param entries: int
+    :return: float
+    """
+
+    root_directory = tempfile.mkdtemp(prefix='rigbuilder_bench_')
+    try:
+        script_object = create_rig(root_directory, entries)
+        start = time.time()
+        script_object.sync()
+        elapsed = time.time() - start
+        scripts, states = script_object.get_scripts_manifest()
+        assert len(scripts) == entries
+    finally:
+        shutil.rmtree(root_directory)
+
+    return elapsed
+
+
+def main(sizes=None):
+    """
+    Runs sync benchmark for each one of the given sizes and prints the results
+    :param sizes: list(int)
+    """
+
+    sizes = sizes or DEFAULT_SIZES
+    print('{:>10} {:>12} {:>16}'.format('entries', 'seconds', 'usec/entry'))
+    for entries in sizes:
+        elapsed = bench_sync(entries)
+        print('{:>10} {:>12.4f} {:>16.2f}'.format(entries, elapsed, elapsed / entries * 1000000.0))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,143 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to generate synthetic RigBuilder projects used by benchmarks
+Generated projects contain rigs with nested build node folders, manifests, options files and data folders
+"""
+
+from __future__ import print_function, division, absolute_import
+
+import os
+import json
+
+PROJECT_FILE = 'project.json'
+NODE_PACKAGE = 'core'
+NODE_CLASS = 'PythonScript'
+
+
+def get_node_names(nodes, children=10, depth=3):
+    """
+    Returns the names of the nodes of a synthetic rig
+    Nodes are nested: each top level node has children nodes and each child node has its own children until the
+    given depth is reached
+    :param nodes: int, total number of nodes
+    :param children: int, number of children of each node
+    :param depth: int, maximum depth of the node hierarchy
+    :return: list(str), node names sorted in build order (parents before their children)
+    """
+
+    node_names = list()
+
+    def _add_node(parent_name, index, level):
+        if len(node_names) >= nodes:
+            return
+        node_name = 'node_{}'.format(index) if not parent_name else '{}/child_{}'.format(parent_name, index)
+        node_names.append(node_name)
+        if level + 1 >= depth:
+            return
+        for i in range(children):
+            _add_node(node_name, i, level + 1)
+
+    top_index = 0
+    while len(node_names) < nodes:
+        _add_node(None, top_index, 0)
+        top_index += 1
+
+    return node_names
+
+
+def create_node(code_path, node_name, options=5):
+    """
+    Creates a build node folder in disk. Build nodes execute a Python script that does nothing
+    :param code_path: str, code folder of the rig
+    :param node_name: str
+    :param options: int, number of options stored in the options file of the node
+    :return: str, path of the node folder
+    """
+
+    node_path = os.path.join(code_path, node_name)
+    if not os.path.isdir(node_path):
+        os.makedirs(node_path)
+
+    base_name = os.path.basename(node_name)
+    with open(os.path.join(node_path, '{}.yml'.format(base_name)), 'w') as fh:
+        fh.write('class: {}\npackage: {}\n'.format(NODE_CLASS, NODE_PACKAGE))
+    with open(os.path.join(node_path, '{}.py'.format(base_name)), 'w') as fh:
+        fh.write('\ndef main():\n    return\n')
+    with open(os.path.join(node_path, 'options.json'), 'w') as fh:
+        json.dump(dict(('option_{}'.format(i), i) for i in range(options)), fh)
+
+    return node_path
+
+
+def create_rig(project_path, rig_name, nodes=100, disabled_ratio=0.1, data_folders=5, options=5):
+    """
+    Creates a synthetic rig in disk
+    :param project_path: str, folder where the rig is created
+    :param rig_name: str
+    :param nodes: int, number of build nodes of the rig
+    :param disabled_ratio: float, ratio of nodes that are disabled in the manifest
+    :param data_folders: int, number of data folders of the rig
+    :param options: int, number of options stored in each options file
+    :return: str, path of the rig
+    """
+
+    from tpRigToolkit.tools.rigbuilder.core import consts
+    from tpRigToolkit.tools.rigbuilder.objects import script
+
+    rig_path = os.path.join(project_path, rig_name)
+    code_path = os.path.join(rig_path, consts.CODE_FOLDER)
+    manifest_path = os.path.join(code_path, consts.MANIFEST_FOLDER)
+    if not os.path.isdir(manifest_path):
+        os.makedirs(manifest_path)
+
+    node_names = get_node_names(nodes)
+    disabled_step = int(1.0 / disabled_ratio) if disabled_ratio else 0
+    scripts, states = list(), list()
+    for i, node_name in enumerate(node_names):
+        create_node(code_path, node_name, options=options)
+        scripts.append('{}.yml'.format(node_name))
+        states.append(not disabled_step or bool(i % disabled_step))
+
+    manifest = script.ScriptManifest(os.path.join(manifest_path, '{}.data'.format(consts.MANIFEST_FILE)))
+    manifest.write(scripts, states)
+
+    with open(os.path.join(rig_path, 'options.json'), 'w') as fh:
+        json.dump(dict(('option_{}'.format(i), i) for i in range(options)), fh)
+
+    data_path = os.path.join(rig_path, consts.DATA_FOLDER)
+    for i in range(data_folders):
+        data_folder = os.path.join(data_path, 'data_{}'.format(i))
+        os.makedirs(data_folder)
+        with open(os.path.join(data_folder, 'data.json'), 'w') as fh:
+            json.dump({'name': 'data_{}'.format(i), 'data_type': 'Python'}, fh)
+
+    return rig_path
+
+
+def create_project(root_directory, project_name='bench_project', rigs=100, nodes=100, large_nodes=None, **kwargs):
+    """
+    Creates a synthetic project in disk
+    :param root_directory: str, folder where the project is created
+    :param project_name: str
+    :param rigs: int, number of rigs of the project
+    :param nodes: int, number of build nodes of each rig
+    :param large_nodes: int or None, number of build nodes of the last rig of the project. Used to benchmark
+        functions that work on a single rig without generating thousands of nodes for every rig
+    :param kwargs: dict, extra keyword arguments passed to create_rig
+    :return: tuple(str, list(str)), path of the project and paths of its rigs
+    """
+
+    project_path = os.path.join(root_directory, project_name)
+    if not os.path.isdir(project_path):
+        os.makedirs(project_path)
+    with open(os.path.join(project_path, PROJECT_FILE), 'w') as fh:
+        json.dump({'name': project_name, 'image': ''}, fh)
+
+    rig_paths = list()
+    for i in range(rigs):
+        rig_nodes = large_nodes if large_nodes and i == rigs - 1 else nodes
+        rig_paths.append(create_rig(project_path, 'rig_{}'.format(i), nodes=rig_nodes, **kwargs))
+
+    return project_path, rig_paths
@@ -0,0 +1,51 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains pytest configuration for tpRigToolkit.tools.rigbuilder tests
+If tpDcc is not installed, a minimal tpDcc package is registered so the modules that do not depend on a DCC or on Qt
+(options store, rig index, build cache, DCC commands, ...) can be tested. Tests that need the real tpDcc skip
+themselves when its modules are not available
+"""
+
+import sys
+import types
+
+
+def _create_module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__path__ = list()
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    parent_name, _, child_name = name.rpartition('.')
+    if parent_name:
+        setattr(sys.modules[parent_name], child_name, module)
+
+    return module
+
+
+class _ScriptTypes(object):
+    Unknown = 'Unknown'
+    Python = 'Python'
+    Manifest = 'Manifest'
+
+
+class _JSONSettings(object):
+    def __init__(self):
+        self.settings_dict = dict()
+        self.settings_order = list()
+
+
+def _install_tpdcc_stub():
+    _create_module('tpDcc', Dcc=None, is_maya=lambda: False)
+    _create_module('tpDcc.core')
+    _create_module('tpDcc.core.scripts', ScriptTypes=_ScriptTypes)
+    _create_module('tpDcc.libs')
+    _create_module('tpDcc.libs.python')
+    _create_module('tpDcc.libs.python.settings', JSONSettings=_JSONSettings)
+
+
+try:
+    import tpDcc
+except ImportError:
+    _install_tpdcc_stub()
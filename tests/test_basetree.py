@@ -0,0 +1,137 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder base tree items index
+"""
+
+import pytest
+
+pytest.importorskip('Qt')
+pytest.importorskip('tpDcc.libs.qt')
+
+from Qt.QtWidgets import QApplication
+
+from tpRigToolkit.tools.rigbuilder.items import base
+from tpRigToolkit.tools.rigbuilder.widgets.base import basetree
+
+
+def _add_item(tree, text, parent=None):
+    item = base.BaseItem()
+    item.set_text(text)
+    if parent:
+        parent.addChild(item)
+    else:
+        tree.addTopLevelItem(item)
+
+    return item
+
+
+@pytest.fixture
+def tree():
+    app = QApplication.instance() or QApplication([])
+    tree = basetree.BaseTree()
+    yield tree
+    tree.clear()
+    tree.deleteLater()
+    app.processEvents()
+
+
+@pytest.fixture
+def items(tree):
+    arm = _add_item(tree, 'arm.py')
+    ik = _add_item(tree, 'ik.py', parent=arm)
+    leg = _add_item(tree, 'leg.py')
+
+    # Index is built the first time an item is looked up
+    assert tree._items_index is None
+    assert tree._get_item_by_name('arm.py') is arm
+    assert tree._items_index is not None
+
+    return arm, ik, leg
+
+
+def test_items_are_found_by_path(tree, items):
+    arm, ik, leg = items
+
+    assert tree._get_item_by_name('arm/ik.py') is ik
+    assert tree._get_item_by_name('leg.py') is leg
+    assert tree._get_item_by_name('ik.py') is None
+    assert sorted(tree._items_index.keys()) == ['arm.py', 'arm/ik.py', 'leg.py']
+
+
+def test_added_items_are_indexed(tree, items):
+    arm, ik, leg = items
+
+    spine = _add_item(tree, 'spine.py')
+    fk = _add_item(tree, 'fk.py', parent=arm)
+
+    assert tree._items_index.get('spine.py', None) is spine
+    assert tree._items_index.get('arm/fk.py', None) is fk
+    assert tree._get_item_by_name('arm/fk.py') is fk
+
+
+def test_renamed_items_are_reindexed(tree, items):
+    arm, ik, leg = items
+
+    arm.set_text('spine.py')
+
+    assert 'arm.py' not in tree._items_index
+    assert 'arm/ik.py' not in tree._items_index
+    assert tree._items_index.get('spine.py', None) is arm
+    assert tree._items_index.get('spine/ik.py', None) is ik
+    assert tree._get_item_by_name('arm.py') is None
+    assert tree._get_item_by_name('spine/ik.py') is ik
+
+
+def test_reparented_items_are_reindexed(tree, items):
+    arm, ik, leg = items
+
+    arm.removeChild(ik)
+    assert 'arm/ik.py' not in tree._items_index
+
+    leg.addChild(ik)
+    assert tree._items_index.get('leg/ik.py', None) is ik
+    assert tree._get_item_by_name('arm/ik.py') is None
+    assert tree._get_item_by_name('leg/ik.py') is ik
+
+
+def test_removed_items_are_unindexed(tree, items):
+    arm, ik, leg = items
+
+    tree.takeTopLevelItem(tree.indexOfTopLevelItem(arm))
+
+    assert sorted(tree._items_index.keys()) == ['leg.py']
+    assert tree._get_item_by_name('arm.py') is None
+    assert tree._get_item_by_name('arm/ik.py') is None
+    assert tree._get_item_by_name('leg.py') is leg
+
+
+def test_index_is_reset_when_tree_is_cleared(tree, items):
+    tree.clear()
+
+    assert tree._items_index is None
+    assert tree._get_item_by_name('arm.py') is None
+
+    spine = _add_item(tree, 'spine.py')
+    assert tree._get_item_by_name('spine.py') is spine
+
+
+def test_padded_names_are_normalized(tree, items):
+    arm, ik, leg = items
+
+    assert tree._get_item_by_name('   arm.py') is arm
+    assert tree._get_item_by_name('arm/   ik.py') is ik
+
+
+def test_index_is_rebuilt_when_item_is_not_found(tree, items):
+    arm, ik, leg = items
+
+    # Items added while the model does not notify its changes are not indexed
+    tree.model().blockSignals(True)
+    spine = _add_item(tree, 'spine.py')
+    tree.model().blockSignals(False)
+    assert 'spine.py' not in tree._items_index
+
+    assert tree._get_item_by_name('spine.py') is spine
+    assert tree._get_item_by_name('arm/ik.py') is ik
@@ -0,0 +1,169 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder build cache
+"""
+
+import os
+
+from tpRigToolkit.tools.rigbuilder.core import scheduler, buildcache, nulldcc
+
+
+def _write_file(file_path, contents):
+    with open(file_path, 'w') as fh:
+        fh.write(contents)
+
+    return file_path.replace('\\', '/')
+
+
+def test_fingerprint_depends_on_values():
+    assert buildcache.get_fingerprint(values=['a']) == buildcache.get_fingerprint(values=['a'])
+    assert buildcache.get_fingerprint(values=['a']) != buildcache.get_fingerprint(values=['b'])
+    assert buildcache.get_fingerprint(values=['ab', 'c']) != buildcache.get_fingerprint(values=['a', 'bc'])
+
+
+def test_fingerprint_depends_on_file_contents(tmpdir):
+    file_a = _write_file(os.path.join(str(tmpdir), 'a.py'), 'a = 1')
+    file_b = _write_file(os.path.join(str(tmpdir), 'b.py'), 'b = 1')
+
+    fingerprint = buildcache.get_fingerprint(file_paths=[file_a, file_b])
+    assert fingerprint == buildcache.get_fingerprint(file_paths=[file_b, file_a])
+
+    _write_file(file_b, 'b = 2')
+    assert fingerprint != buildcache.get_fingerprint(file_paths=[file_a, file_b])
+
+
+def test_fingerprint_of_missing_file(tmpdir):
+    missing_file = os.path.join(str(tmpdir), 'missing.py').replace('\\', '/')
+    fingerprint = buildcache.get_fingerprint(file_paths=[missing_file])
+
+    assert fingerprint == buildcache.get_fingerprint(file_paths=[missing_file])
+    _write_file(missing_file, '')
+    assert fingerprint != buildcache.get_fingerprint(file_paths=[missing_file])
+
+
+def test_fingerprint_depends_on_dependencies():
+    parent_a = buildcache.get_fingerprint(values=['a'])
+    parent_b = buildcache.get_fingerprint(values=['b'])
+
+    fingerprint = buildcache.get_fingerprint(values=['child'], fingerprints=[parent_a, parent_b])
+    assert fingerprint == buildcache.get_fingerprint(values=['child'], fingerprints=[parent_b, parent_a])
+    assert fingerprint != buildcache.get_fingerprint(values=['child'], fingerprints=[parent_a])
+
+
+def test_cache_entries_are_stored(tmpdir):
+    build_cache = buildcache.BuildCache(str(tmpdir))
+    build_cache.set_entry('build|a', 'fingerprint', 'Success')
+    build_cache.set_entry('build|b', 'fingerprint', 'Fail')
+    build_cache.save()
+
+    build_cache = buildcache.BuildCache(str(tmpdir))
+    assert build_cache.is_valid('build|a', 'fingerprint')
+    assert not build_cache.is_valid('build|a', 'other_fingerprint')
+    assert not build_cache.is_valid('build|b', 'fingerprint')
+    assert not build_cache.is_valid('build|c', 'fingerprint')
+
+
+def _create_session(directory, tasks, **kwargs):
+    build_scheduler = scheduler.BuildScheduler()
+    build_session = buildcache.BuildSession(buildcache.BuildCache(directory), **kwargs)
+    for name, outputs, dcc_free in tasks:
+        task = build_scheduler.add_task(name, inputs=list(), outputs=outputs, dcc_free=dcc_free)
+        build_session.add_task('build', task, outputs=outputs)
+
+    return build_session
+
+
+def test_task_fingerprint_changes_with_dependencies(tmpdir):
+    file_path = _write_file(os.path.join(str(tmpdir), 'a.py'), 'a = 1')
+    build_scheduler = scheduler.BuildScheduler()
+    build_session = buildcache.BuildSession(buildcache.BuildCache(str(tmpdir)))
+    fingerprint_a = build_session.add_task(
+        'build', build_scheduler.add_task('a', outputs=['x']), file_paths=[file_path])
+    fingerprint_b = build_session.add_task('build', build_scheduler.add_task('b', inputs=['x']))
+
+    _write_file(file_path, 'a = 2')
+    build_scheduler = scheduler.BuildScheduler()
+    build_session = buildcache.BuildSession(buildcache.BuildCache(str(tmpdir)))
+    assert fingerprint_a != build_session.add_task(
+        'build', build_scheduler.add_task('a', outputs=['x']), file_paths=[file_path])
+    assert fingerprint_b != build_session.add_task('build', build_scheduler.add_task('b', inputs=['x']))
+
+
+def test_dcc_free_tasks_with_outputs_are_not_restored(tmpdir):
+    tasks = [('no_outputs', list(), True), ('outputs', ['x'], True)]
+    build_session = _create_session(str(tmpdir), tasks, incremental=True)
+    build_session.restore()
+    for name, _, _ in tasks:
+        build_session.task_finished('build', name, 'Success')
+    build_session.finish()
+
+    build_session = _create_session(str(tmpdir), tasks, incremental=True)
+    build_session.restore()
+    assert build_session.is_reused('build', 'no_outputs')
+    assert not build_session.is_reused('build', 'outputs')
+
+
+def test_checkpoints_are_opt_in(tmpdir):
+    tasks = [('a', list(), False), ('b', list(), False)]
+    with nulldcc.use_dcc():
+        build_session = _create_session(str(tmpdir), tasks)
+        build_session.restore()
+        for name, _, _ in tasks:
+            build_session.task_finished('build', name, 'Success')
+        build_session.finish()
+
+    assert not build_session.cache.has_checkpoint('build|a')
+    assert not build_session.cache.has_checkpoint('build|b')
+
+
+def test_incremental_builds_checkpoint_last_scene_node(tmpdir):
+    tasks = [('a', list(), False), ('b', list(), False), ('c', list(), True)]
+    with nulldcc.use_dcc():
+        build_session = _create_session(str(tmpdir), tasks, incremental=True)
+        build_session.restore()
+        for name, _, _ in tasks:
+            build_session.task_finished('build', name, 'Success')
+        build_session.finish()
+
+        assert not build_session.cache.has_checkpoint('build|a')
+        assert build_session.cache.has_checkpoint('build|b')
+
+        build_session = _create_session(str(tmpdir), tasks, incremental=True)
+        build_session.restore()
+        assert all(build_session.is_reused('build', name) for name, _, _ in tasks)
+
+
+def test_restored_checkpoint_is_not_current_scene(tmpdir):
+    tasks = [('a', list(), False)]
+    with nulldcc.use_dcc() as dcc:
+        dcc.create_empty_group('root')
+        build_session = _create_session(str(tmpdir), tasks, incremental=True)
+        build_session.restore()
+        build_session.task_finished('build', 'a', 'Success')
+        build_session.finish()
+
+        dcc.new_file(force=True)
+        build_session = _create_session(str(tmpdir), tasks, incremental=True)
+        build_session.restore()
+
+        assert build_session.is_reused('build', 'a')
+        assert dcc.object_exists('root')
+        assert dcc.scene_name() != build_session.cache.get_entry('build|a')['checkpoint']
+
+
+def test_checkpoint_does_not_rename_scene(tmpdir):
+    scene_path = os.path.join(str(tmpdir), 'scene.json')
+    tasks = [('a', list(), False), ('b', list(), False)]
+    with nulldcc.use_dcc() as dcc:
+        dcc.save_current_scene(path_to_save=scene_path)
+        build_session = _create_session(str(tmpdir), tasks, incremental=True, checkpoint_scripts=['a'])
+        build_session.restore()
+        for name, _, _ in tasks:
+            build_session.task_finished('build', name, 'Success')
+        build_session.finish()
+
+        assert dcc.scene_name() == scene_path
+    assert build_session.cache.has_checkpoint('build|a')
+    assert not build_session.cache.has_checkpoint('build|b')
@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder DCC command buffer
+"""
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.core import dcccommands, nulldcc
+
+
+def _get_commands(command_buffer):
+    return [(command.name, ) + command.args for command in command_buffer.get_commands()]
+
+
+def test_consecutive_attribute_states_are_merged():
+    command_buffer = dcccommands.DccCommandBuffer()
+    command_buffer.unkeyable_attribute('guide', 'scaleX')
+    command_buffer.hide_attribute('guide', 'scaleX')
+    command_buffer.lock_attribute('guide', 'scaleX')
+    command_buffer.set_parent('axis', 'guide_orient')
+
+    assert _get_commands(command_buffer) == [
+        ('set_attribute_state', 'guide', 'scaleX', {'lock': True, 'keyable': False, 'channel_box': False}),
+        ('set_parent', 'axis', 'guide_orient')]
+
+
+def test_attribute_states_are_not_moved_before_other_commands():
+    command_buffer = dcccommands.DccCommandBuffer()
+    command_buffer.hide_attribute('guide', 'scaleX')
+    command_buffer.set_attribute_value('guide', 'scaleX', 2.0)
+    command_buffer.lock_attribute('guide', 'scaleX')
+
+    assert _get_commands(command_buffer) == [
+        ('set_attribute_state', 'guide', 'scaleX', {'keyable': False, 'channel_box': False}),
+        ('set_attribute_value', 'guide', 'scaleX', 2.0),
+        ('set_attribute_state', 'guide', 'scaleX', {'lock': True})]
+
+
+def test_batch_flushes_commands_on_exit():
+    with nulldcc.use_dcc() as dcc:
+        dcc.create_empty_group('guide')
+        with dcccommands.batch() as commands:
+            commands.add_float_attribute('guide', 'size', default_value=1.0)
+            commands.set_attribute_value('guide', 'size', 2.0)
+            assert dcccommands.get_active_buffer() is commands
+            with pytest.raises(RuntimeError):
+                dcc.get_attribute_value('guide', 'size')
+
+        assert dcccommands.get_active_buffer() is None
+        assert dcc.get_attribute_value('guide', 'size') == 2.0
+
+
+def test_batch_keeps_traceback_of_failures():
+    def _fail_fn():
+        raise ValueError('failed')
+
+    with nulldcc.use_dcc() as dcc:
+        dcc.create_empty_group('guide')
+        with pytest.raises(ValueError) as exc_info:
+            with dcccommands.batch() as commands:
+                commands.add_float_attribute('guide', 'size', default_value=1.0)
+                _fail_fn()
+
+        assert exc_info.traceback[-1].name == '_fail_fn'
+        assert dcc.get_attribute_value('guide', 'size') == 1.0
+
+
+def test_null_dcc_does_not_use_maya_commands(monkeypatch):
+    monkeypatch.setattr(dcccommands.tp, 'is_maya', lambda: True)
+    with nulldcc.use_dcc() as dcc:
+        assert nulldcc.is_null_dcc()
+        assert not nulldcc.is_maya()
+
+        dcc.create_empty_group('guide')
+        with dcccommands.undo_chunk('rigbuilder_commands'):
+            dcccommands.execute_command(
+                dcccommands.DccCommand('set_attribute_state', ('guide', 'scaleX', {'lock': True}), dict()), dcc=dcc)
+
+        assert 'lock_attribute' in [stat['name'] for stat in dcc.get_stats()]
@@ -0,0 +1,140 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder option store
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.core import optionstore
+
+
+def _read(file_path):
+    with open(file_path, 'r') as fh:
+        return json.load(fh, object_pairs_hook=OrderedDict)
+
+
+def _write(file_path, data):
+    with open(file_path, 'w') as fh:
+        json.dump(data, fh)
+    # Make sure the modification time changes even in file systems with low time resolution
+    mtime = time.time() + 10
+    os.utime(file_path, (mtime, mtime))
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    optionstore.evict()
+    yield
+    optionstore.evict()
+
+
+def test_load_creates_missing_file(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'options.json')
+    option_file = optionstore.OptionFile(file_path)
+    option_file.load()
+
+    assert os.path.isfile(file_path)
+    assert not option_file.data
+
+
+def test_flush_only_writes_changed_keys(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'options.json')
+    _write(file_path, OrderedDict([('a', 1), ('b', 2)]))
+    option_file = optionstore.OptionFile(file_path)
+    option_file.load()
+
+    option_file.set('a', 10)
+    option_file.set('c', 3)
+    # Other process changes a key that is not changed in memory
+    _write(file_path, OrderedDict([('a', 1), ('b', 20)]))
+
+    assert option_file.flush()
+    assert _read(file_path) == OrderedDict([('a', 10), ('b', 20), ('c', 3)])
+    assert not option_file.dirty
+    assert not option_file.flush()
+
+
+def test_flush_removes_cleared_keys(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'options.json')
+    _write(file_path, OrderedDict([('a', 1), ('b', 2)]))
+    option_file = optionstore.OptionFile(file_path)
+    option_file.load()
+
+    option_file.clear()
+    option_file.set('c', 3)
+    option_file.flush()
+
+    assert _read(file_path) == OrderedDict([('c', 3)])
+    assert option_file.order == ['c']
+
+
+def test_stale_files(tmpdir):
+    file_path = os.path.join(str(tmpdir), 'options.json')
+    option_file = optionstore.OptionFile(file_path)
+    option_file.load()
+    assert not option_file.is_stale()
+
+    _write(file_path, {'a': 1})
+    assert option_file.is_stale()
+
+    # Files with changes that are not flushed are never stale
+    option_file.set('b', 2)
+    assert not option_file.is_stale()
+
+
+def test_stores_share_contents(tmpdir):
+    store_a = optionstore.OptionStore()
+    store_a.set_directory(str(tmpdir))
+    store_b = optionstore.OptionStore()
+    store_b.set_directory(str(tmpdir))
+
+    store_a.set('a', 1)
+
+    assert store_b.get('a') == 1
+    assert _read(store_a.get_file()) == {'a': 1}
+
+
+def test_session_flushes_on_exit(tmpdir):
+    store = optionstore.OptionStore()
+    store.set_directory(str(tmpdir))
+
+    with optionstore.session():
+        with optionstore.session():
+            store.set('a', 1)
+        assert _read(store.get_file()) == {}
+    assert _read(store.get_file()) == {'a': 1}
+
+
+def test_session_reloads_stale_files_once(tmpdir):
+    store = optionstore.OptionStore()
+    store.set_directory(str(tmpdir))
+
+    _write(store.get_file(), {'a': 1})
+    with optionstore.session():
+        assert store.get('a') == 1
+        _write(store.get_file(), {'a': 2})
+        store.set_directory(str(tmpdir))
+        assert store.get('a') == 1
+
+
+def test_evict_flushes_and_relinks_stores(tmpdir):
+    rig_path = os.path.join(str(tmpdir), 'rig')
+    other_path = os.path.join(str(tmpdir), 'other')
+    store = optionstore.OptionStore()
+    store.set_directory(other_path)
+
+    with optionstore.session():
+        store.set('a', 1)
+        assert not optionstore.evict(rig_path)
+    assert optionstore.evict(rig_path) == 1
+    assert _read(store.get_file()) == {'a': 1}
+
+    _write(store.get_file(), {'a': 2})
+    assert store.get('a') == 2
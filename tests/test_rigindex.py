@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder rig index
+"""
+
+import os
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.core import consts, rigindex
+
+
+def _create_rig(project_path, rig_path, enabled=False):
+    full_path = os.path.join(project_path, rig_path)
+    os.makedirs(os.path.join(full_path, consts.CODE_FOLDER))
+    if enabled:
+        open(os.path.join(full_path, consts.ENABLE_FILE), 'w').close()
+
+    return full_path.replace('\\', '/')
+
+
+@pytest.fixture
+def project_path(tmpdir):
+    project_path = os.path.join(str(tmpdir), 'project')
+    os.makedirs(project_path)
+
+    return project_path.replace('\\', '/')
+
+
+@pytest.fixture
+def index_file(tmpdir):
+    return os.path.join(str(tmpdir), 'cache', 'rigindex.db').replace('\\', '/')
+
+
+def test_find_rigs(project_path, index_file):
+    body = _create_rig(project_path, 'body')
+    arm = _create_rig(project_path, 'body/arm')
+    os.makedirs(os.path.join(project_path, 'folder'))
+    os.makedirs(os.path.join(project_path, 'Trash'))
+
+    index = rigindex.RigIndex(project_path, index_file=index_file)
+    rigs, folders = index.find_rigs(return_also_non_objects_list=True)
+
+    assert rigs == [body]
+    assert folders == ['{}/folder'.format(project_path)]
+    assert index.find_rigs(body) == [arm]
+    assert index.is_rig(arm)
+    assert index.has_sub_rigs(body)
+    assert not index.has_sub_rigs(arm)
+
+
+def test_find_rig_only_returns_rigs_located_under_project_folder(project_path, index_file):
+    _create_rig(project_path, 'folder/arm')
+    index = rigindex.RigIndex(project_path, index_file=index_file)
+
+    assert index.find_rig('arm') is None
+
+    arm = _create_rig(project_path, 'arm')
+    index.mark_dirty(arm)
+    assert index.find_rig('arm') == arm
+    assert index.find_rig('leg') is None
+
+
+def test_index_is_stored_outside_project_folder(project_path):
+    index_file = rigindex.RigIndex.get_index_file(project_path)
+
+    assert not index_file.startswith('{}/'.format(project_path))
+    assert index_file != rigindex.RigIndex.get_index_file('{}_other'.format(project_path))
+
+
+def test_index_is_loaded_from_disk(project_path, index_file):
+    body = _create_rig(project_path, 'body', enabled=True)
+    rigindex.RigIndex(project_path, index_file=index_file).refresh()
+
+    index = rigindex.RigIndex(project_path, index_file=index_file)
+    assert index.find_rig('body') == body
+    assert index.is_enabled(body)
+
+
+def test_mark_dirty_updates_changed_folders(project_path, index_file):
+    body = _create_rig(project_path, 'body')
+    index = rigindex.RigIndex(project_path, index_file=index_file)
+    assert not index.is_enabled(body)
+
+    open(os.path.join(body, consts.ENABLE_FILE), 'w').close()
+    index.mark_dirty(body)
+    assert index.is_enabled(body)
+
+    leg = _create_rig(project_path, 'body/leg')
+    index.mark_dirty(leg)
+    assert index.find_rigs(body) == [leg]
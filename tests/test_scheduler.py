@@ -0,0 +1,183 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder build scheduler
+"""
+
+import time
+import threading
+
+import pytest
+
+from tpRigToolkit.tools.rigbuilder.core import scheduler
+
+
+def _run(build_scheduler, **kwargs):
+    executed = list()
+    lock = threading.Lock()
+
+    def _run_fn(name):
+        with lock:
+            executed.append(name)
+        return name
+
+    build_scheduler.run(_run_fn, **kwargs)
+
+    return executed
+
+
+def test_tasks_without_inputs_outputs_run_in_order():
+    build_scheduler = scheduler.BuildScheduler()
+    for name in ['a', 'b', 'c', 'd']:
+        build_scheduler.add_task(name)
+
+    assert _run(build_scheduler) == ['a', 'b', 'c', 'd']
+
+
+def test_barrier_depends_on_all_previous_tasks():
+    build_scheduler = scheduler.BuildScheduler()
+    build_scheduler.add_task('a', outputs=['x'])
+    build_scheduler.add_task('b', inputs=['y'])
+    barrier = build_scheduler.add_task('barrier')
+    after = build_scheduler.add_task('after', inputs=['x'])
+
+    assert barrier.dependencies == {'a', 'b'}
+    assert after.dependencies == {'barrier'}
+
+
+def test_inputs_depend_on_producers():
+    build_scheduler = scheduler.BuildScheduler()
+    build_scheduler.add_task('consumer_first', inputs=['x'])
+    producer = build_scheduler.add_task('producer', outputs=['x'])
+    consumer = build_scheduler.add_task('consumer', inputs=['x'])
+    independent = build_scheduler.add_task('independent', inputs=['z'])
+
+    # Writers wait for previous readers of the same data, readers wait for the last writer
+    assert producer.dependencies == {'consumer_first'}
+    assert consumer.dependencies == {'producer'}
+    assert not independent.dependencies
+
+    executed = _run(build_scheduler)
+    assert executed.index('producer') < executed.index('consumer')
+    assert executed.index('consumer_first') < executed.index('producer')
+
+
+def test_children_run_after_parent():
+    build_scheduler = scheduler.BuildScheduler()
+    build_scheduler.add_task('child', parent='parent', inputs=[])
+    build_scheduler.add_task('parent', inputs=[])
+    child = build_scheduler.add_task('parent/child', parent='parent', inputs=[])
+
+    assert child.dependencies == {'parent'}
+
+
+def test_finished_fn_called_for_each_task():
+    build_scheduler = scheduler.BuildScheduler()
+    for name in ['a', 'b']:
+        build_scheduler.add_task(name)
+    finished = list()
+
+    results = build_scheduler.run(lambda name: name.upper(), finished_fn=lambda name, result: finished.append(result))
+
+    assert finished == ['A', 'B']
+    assert results == {'a': 'A', 'b': 'B'}
+
+
+def test_failure_stops_build():
+    build_scheduler = scheduler.BuildScheduler()
+    for name in ['a', 'b', 'c']:
+        build_scheduler.add_task(name)
+    executed = list()
+
+    def _run_fn(name):
+        executed.append(name)
+        if name == 'b':
+            raise ValueError(name)
+
+    with pytest.raises(ValueError):
+        build_scheduler.run(_run_fn)
+    assert executed == ['a', 'b']
+
+
+def test_failure_in_worker_thread_is_raised():
+    build_scheduler = scheduler.BuildScheduler(max_workers=2)
+    build_scheduler.add_task('a', outputs=['x'], dcc_free=True)
+    build_scheduler.add_task('b', inputs=['x'])
+    executed = list()
+
+    def _run_fn(name):
+        executed.append(name)
+        if name == 'a':
+            raise RuntimeError(name)
+
+    with pytest.raises(RuntimeError) as exc_info:
+        build_scheduler.run(_run_fn)
+    assert executed == ['a']
+    # Traceback of the worker thread is kept
+    assert exc_info.traceback[-1].name == '_run_fn'
+
+
+def test_failure_in_finished_fn_stops_build():
+    build_scheduler = scheduler.BuildScheduler()
+    for name in ['a', 'b']:
+        build_scheduler.add_task(name)
+
+    def _finished_fn(name, result):
+        raise RuntimeError(name)
+
+    executed = list()
+    with pytest.raises(RuntimeError):
+        build_scheduler.run(executed.append, finished_fn=_finished_fn)
+    assert executed == ['a']
+
+
+def test_stop_fn_prevents_new_tasks():
+    build_scheduler = scheduler.BuildScheduler()
+    for name in ['a', 'b', 'c']:
+        build_scheduler.add_task(name)
+    executed = list()
+
+    build_scheduler.run(executed.append, stop_fn=lambda: len(executed) >= 2)
+
+    assert executed == ['a', 'b']
+
+
+def test_dcc_free_tasks_run_in_parallel_outside_main_thread():
+    build_scheduler = scheduler.BuildScheduler(max_workers=2)
+    build_scheduler.add_task('a', outputs=['a'], dcc_free=True)
+    build_scheduler.add_task('b', outputs=['b'], dcc_free=True)
+    build_scheduler.add_task('main', inputs=['a', 'b'])
+    main_thread = threading.current_thread()
+    both_started = threading.Barrier(2, timeout=5) if hasattr(threading, 'Barrier') else None
+    threads = dict()
+
+    def _run_fn(name):
+        threads[name] = threading.current_thread()
+        if name != 'main' and both_started:
+            # Fails with BrokenBarrierError if tasks are not executed at the same time
+            both_started.wait()
+        return name
+
+    results = build_scheduler.run(_run_fn)
+
+    assert set(results) == {'a', 'b', 'main'}
+    assert threads['a'] is not main_thread
+    assert threads['b'] is not main_thread
+    assert threads['main'] is main_thread
+
+
+def test_dependant_waits_for_dcc_free_task():
+    build_scheduler = scheduler.BuildScheduler(max_workers=2)
+    build_scheduler.add_task('slow', outputs=['x'], dcc_free=True)
+    build_scheduler.add_task('consumer', inputs=['x'])
+    finished = list()
+
+    def _run_fn(name):
+        if name == 'slow':
+            time.sleep(0.05)
+        finished.append(name)
+
+    build_scheduler.run(_run_fn)
+
+    assert finished == ['slow', 'consumer']
@@ -0,0 +1,95 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder scripts item model
+"""
+
+import pytest
+
+pytest.importorskip('Qt')
+pytest.importorskip('tpDcc.libs.qt')
+
+from Qt.QtCore import Qt, QModelIndex
+from Qt.QtWidgets import QApplication
+
+from tpRigToolkit.tools.rigbuilder.widgets.base import scriptsmodel
+
+SCRIPTS = ['arm.py', 'arm/ik.py', 'arm/fk.py', 'leg.py', 'arm/ik/solver.py']
+STATES = [True, False, True, True, False]
+
+
+@pytest.fixture
+def model():
+    app = QApplication.instance() or QApplication([])
+    model = scriptsmodel.ScriptsModel()
+    model.set_scripts(SCRIPTS, STATES)
+    yield model
+    model.deleteLater()
+    app.processEvents()
+
+
+def test_children_rows_are_fetched_lazily(model):
+    root_index = QModelIndex()
+    assert model.rowCount(root_index) == 0
+    assert model.hasChildren(root_index)
+    assert model.canFetchMore(root_index)
+
+    model.fetchMore(root_index)
+    assert model.rowCount(root_index) == 2
+    assert not model.canFetchMore(root_index)
+
+    arm_index = model.index(0, 0, root_index)
+    assert arm_index.data() == 'arm.py'
+    assert model.rowCount(arm_index) == 0
+    assert model.canFetchMore(arm_index)
+
+    model.fetchMore(arm_index)
+    assert [model.index(i, 0, arm_index).data() for i in range(model.rowCount(arm_index))] == ['ik.py', 'fk.py']
+    assert model.parent(model.index(0, 0, arm_index)) == arm_index
+
+
+def test_rows_are_fetched_in_chunks(model, monkeypatch):
+    monkeypatch.setattr(scriptsmodel.ScriptsModel, 'FETCH_SIZE', 1)
+    scripts = ['script_{}.py'.format(i) for i in range(3)]
+    model.set_scripts(scripts, [True] * len(scripts))
+
+    root_index = QModelIndex()
+    model.fetchMore(root_index)
+    assert model.rowCount(root_index) == 1
+    assert model.canFetchMore(root_index)
+    model.fetchMore(root_index)
+    model.fetchMore(root_index)
+    assert model.rowCount(root_index) == 3
+    assert not model.canFetchMore(root_index)
+
+
+def test_index_from_path_fetches_ancestors(model):
+    index = model.index_from_path('arm/ik/solver.py')
+
+    assert index.isValid()
+    assert index.data(scriptsmodel.PATH_ROLE) == 'arm/ik/solver.py'
+    assert index.parent().data(scriptsmodel.PATH_ROLE) == 'arm/ik.py'
+    assert not model.index_from_path('spine.py').isValid()
+
+
+def test_manifest_includes_not_fetched_scripts(model):
+    index = model.index_from_path('arm/fk.py')
+    assert model.setData(index, Qt.Unchecked, Qt.CheckStateRole)
+
+    scripts, states = model.get_scripts_manifest()
+    assert scripts == ['arm.py', 'arm/ik.py', 'arm/ik/solver.py', 'arm/fk.py', 'leg.py']
+    assert states == [True, False, False, False, True]
+
+
+def test_run_states_are_stored_in_records(model):
+    model.set_run_state('arm/ik.py', 1)
+    model.set_log('arm/ik.py', 'done')
+
+    index = model.index_from_path('arm/ik.py')
+    assert index.data(scriptsmodel.RUN_STATE_ROLE) == 1
+    assert index.data(scriptsmodel.LOG_ROLE) == 'done'
+
+    model.reset_run_states()
+    assert index.data(scriptsmodel.RUN_STATE_ROLE) == -1
+    assert index.data(scriptsmodel.LOG_ROLE) == ''
@@ -0,0 +1,145 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpRigToolkit.tools.rigbuilder file watcher
+"""
+
+import os
+import time
+
+import pytest
+
+pytest.importorskip('Qt')
+
+from Qt.QtCore import QCoreApplication
+
+from tpRigToolkit.tools.rigbuilder.core import watcher, ownwrites
+
+
+def _write(file_path, contents):
+    with open(file_path, 'w') as fh:
+        fh.write(contents)
+
+
+def _touch(path):
+    # Make sure the modification time changes even in file systems with low time resolution
+    mtime = time.time() + 10
+    os.utime(path, (mtime, mtime))
+
+
+def _events(file_watcher, *changed_paths):
+    for path in changed_paths:
+        _touch(path)
+    file_watcher.poll()
+
+    return sorted((event.type, event.path, event.new_path, event.is_dir) for event in file_watcher.flush())
+
+
+@pytest.fixture(autouse=True)
+def _app():
+    app = QCoreApplication.instance() or QCoreApplication([])
+    ownwrites.clear()
+    yield app
+    ownwrites.clear()
+
+
+@pytest.fixture
+def root_path(tmpdir):
+    return str(tmpdir).replace('\\', '/')
+
+
+@pytest.fixture
+def file_watcher(root_path):
+    file_watcher = watcher.FileWatcher(use_polling=True)
+    yield file_watcher
+    file_watcher.clear()
+
+
+def test_folder_changes(root_path, file_watcher):
+    _write('{}/a.py'.format(root_path), 'a')
+    _write('{}/b.py'.format(root_path), 'b')
+    assert file_watcher.add_root(root_path)
+    assert file_watcher.is_polling()
+    assert _events(file_watcher) == []
+
+    # New file is written first, so it does not reuse the inode of the removed one
+    _write('{}/d.py'.format(root_path), 'd')
+    os.remove('{}/a.py'.format(root_path))
+    os.rename('{}/b.py'.format(root_path), '{}/c.py'.format(root_path))
+
+    assert _events(file_watcher, root_path) == [
+        (watcher.ADDED, '{}/d.py'.format(root_path), None, False),
+        (watcher.REMOVED, '{}/a.py'.format(root_path), None, False),
+        (watcher.RENAMED, '{}/b.py'.format(root_path), '{}/c.py'.format(root_path), False)]
+
+
+def test_recursive_folders(root_path, file_watcher):
+    file_watcher.add_root(root_path, recursive=True)
+
+    os.makedirs('{}/arm'.format(root_path))
+    assert _events(file_watcher, root_path) == [(watcher.ADDED, '{}/arm'.format(root_path), None, True)]
+    assert file_watcher.is_watching('{}/arm'.format(root_path))
+
+    _write('{}/arm/arm.py'.format(root_path), 'arm')
+    assert _events(file_watcher, '{}/arm'.format(root_path)) == [
+        (watcher.ADDED, '{}/arm/arm.py'.format(root_path), None, False)]
+    assert not file_watcher.is_watching('{}/arm/arm.py'.format(root_path))
+
+    os.rename('{}/arm'.format(root_path), '{}/leg'.format(root_path))
+    assert _events(file_watcher, root_path) == [
+        (watcher.RENAMED, '{}/arm'.format(root_path), '{}/leg'.format(root_path), True)]
+    assert not file_watcher.is_watching('{}/arm'.format(root_path))
+    assert file_watcher.is_watching('{}/leg'.format(root_path))
+
+
+def test_only_filtered_files_are_watched(root_path, file_watcher):
+    os.makedirs('{}/arm'.format(root_path))
+    _write('{}/arm/arm.py'.format(root_path), 'arm')
+    _write('{}/arm/options.json'.format(root_path), '{}')
+
+    file_watcher.add_root(
+        root_path, recursive=True, watch_files=lambda file_path: os.path.basename(file_path).startswith('arm'))
+
+    assert file_watcher.is_watching('{}/arm/arm.py'.format(root_path))
+    assert not file_watcher.is_watching('{}/arm/options.json'.format(root_path))
+
+    _write('{}/arm/arm_ik.py'.format(root_path), 'arm_ik')
+    _write('{}/arm/data.json'.format(root_path), '{}')
+    _events(file_watcher, '{}/arm'.format(root_path))
+    assert file_watcher.is_watching('{}/arm/arm_ik.py'.format(root_path))
+    assert not file_watcher.is_watching('{}/arm/data.json'.format(root_path))
+
+    _write('{}/arm/arm.py'.format(root_path), 'arm changed')
+    assert _events(file_watcher) == [(watcher.MODIFIED, '{}/arm/arm.py'.format(root_path), None, False)]
+
+
+def test_own_writes_are_ignored(root_path, file_watcher):
+    manifest_file = '{}/manifest.yml'.format(root_path)
+    options_file = '{}/options.json'.format(root_path)
+    _write(manifest_file, 'a.py True ')
+    file_watcher.add_root(root_path, watch_files=True)
+
+    _write(manifest_file, 'a.py False')
+    _touch(manifest_file)
+    ownwrites.record(manifest_file)
+    _write(options_file, '{}')
+    ownwrites.record(options_file)
+    assert _events(file_watcher, root_path) == []
+
+    # Changes done later by other processes are notified
+    _write(manifest_file, 'a.py True b.py True ')
+    assert _events(file_watcher) == [(watcher.MODIFIED, manifest_file, None, False)]
+
+
+def test_removed_root(root_path, file_watcher):
+    code_path = '{}/code'.format(root_path)
+    os.makedirs('{}/arm'.format(code_path))
+    file_watcher.add_root(code_path, recursive=True)
+    assert file_watcher.roots() == [code_path]
+
+    os.rename('{}/arm'.format(code_path), '{}/arm_tmp'.format(root_path))
+    os.rmdir(code_path)
+    assert _events(file_watcher) == [(watcher.REMOVED, code_path, None, True)]
+    assert not file_watcher.is_watching(code_path)
+    assert not file_watcher.is_watching('{}/arm'.format(code_path))
@@ -10,7 +10,9 @@ from tpDcc.libs.qt.widgets import project
 
 import tpRigToolkit
 from tpRigToolkit.tools import rigbuilder
-from tpRigToolkit.tools.rigbuilder.core import consts, project as project_rigbuilder, rigbuilder as core_rigbuilder
+from tpRigToolkit.tools.rigbuilder.core import consts, optionstore, project as project_rigbuilder
+from tpRigToolkit.tools.rigbuilder.core import rigbuilder as core_rigbuilder
+from tpRigToolkit.tools.rigbuilder.objects import script
 
 
 def get_project_by_name(projects_path, project_name):
@@ -53,6 +55,9 @@ def set_project(project_inst):
     """
 
     core_rigbuilder.init()
+    if getattr(rigbuilder, 'project', None) is not project_inst:
+        optionstore.evict()
+        script.CodeFolderIndex.evict()
     rigbuilder.project = project_inst
     if project_inst:
         rigbuilder.project.naming_lib.load_session()
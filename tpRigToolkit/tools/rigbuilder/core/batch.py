@@ -0,0 +1,333 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains functions to build rigs in batch mode (without RigBuilder UI) for tpRigToolkit.tools.rigbuilder
+Each rig is built in its own worker process, so several rigs can be built at the same time
+Usage: mayapy -m tpRigToolkit.tools.rigbuilder.core.batch --projects-path PATH --project NAME [--rigs RIG ...]
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import sys
+import json
+import time
+import fnmatch
+import logging
+import argparse
+import traceback
+import multiprocessing
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+
+class BuildStatus(object):
+    SUCCESS = 'Success'
+    FAIL = 'Fail'
+
+
+def initialize_dcc():
+    """
+    Initializes the DCC when running in a standalone interpreter (for example, mayapy)
+    Does nothing if no standalone DCC is available
+    """
+
+    try:
+        import maya.standalone
+    except ImportError:
+        return
+
+    try:
+        maya.standalone.initialize(name='python')
+    except RuntimeError:
+        # Maya standalone was already initialized in this process
+        pass
+
+
+def get_project(projects_path, project_name):
+    """
+    Returns the project with the given name and sets it as the project used by RigBuilder
+    :param projects_path: str
+    :param project_name: str
+    :return: RigBuilderProject
+    """
+
+    from tpRigToolkit.tools.rigbuilder.core import api
+
+    project = api.get_project_by_name(projects_path, project_name)
+    if not project:
+        raise ValueError('Project "{}" not found in "{}"'.format(project_name, projects_path))
+    api.set_project(project)
+
+    return project
+
+
+def find_rigs(project, rig_patterns=None):
+    """
+    Returns the paths of the rigs of the given project whose name matches any of the given patterns
+    All the rigs that share a matching name are returned, a warning is logged for each ambiguous name
+    :param project: RigBuilderProject
+    :param rig_patterns: list(str) or None, rig names or glob patterns. If not given, all rigs are returned
+    :return: list(str)
+    """
+
+    rig_patterns = rig_patterns or ['*']
+    rig_paths = dict()
+    for rig in project.find_rigs():
+        if not rig:
+            continue
+        rig_paths.setdefault(rig.get_name(), list()).append(rig.get_path())
+
+    found = list()
+    warned = set()
+    for rig_pattern in rig_patterns:
+        matches = fnmatch.filter(sorted(rig_paths.keys()), rig_pattern)
+        if not matches:
+            LOGGER.warning('No rigs found matching "{}"'.format(rig_pattern))
+        for rig_name in matches:
+            paths = sorted(rig_paths[rig_name])
+            if len(paths) > 1 and rig_name not in warned:
+                warned.add(rig_name)
+                LOGGER.warning('Rig name "{}" is ambiguous, all the rigs with that name are built: {}'.format(
+                    rig_name, ', '.join(paths)))
+            for rig_path in paths:
+                if rig_path not in found:
+                    found.append(rig_path)
+
+    return found
+
+
+def get_output_names(project, rig_paths):
+    """
+    Returns the names used to save the built scene and the build trace of each one of the given rigs
+    Rigs that share their name with other rigs use their path relative to the project instead, so their files do
+    not overwrite each other when they are saved in the same folder
+    :param project: RigBuilderProject
+    :param rig_paths: list(str)
+    :return: dict(str, str)
+    """
+
+    rig_names = dict()
+    for rig_path in rig_paths:
+        rig_names.setdefault(os.path.basename(rig_path), list()).append(rig_path)
+
+    output_names = dict()
+    for rig_name, paths in rig_names.items():
+        for rig_path in paths:
+            if len(paths) == 1:
+                output_names[rig_path] = rig_name
+            else:
+                relative_path = os.path.relpath(rig_path, project.full_path).replace('\\', '/')
+                output_names[rig_path] = relative_path.replace('/', '_').replace('.', '_')
+
+    return output_names
+
+
+def build_rig(rig_path, output_path=None, trace_path=None, output_name=None, **kwargs):
+    """
+    Builds the rig located in the given path in a new scene and saves the resulting scene
+    :param rig_path: str
+    :param output_path: str or None, folder where the built scene is saved. If not given, scene is stored in the
+        build folder of the rig
+    :param trace_path: str or None, folder where the build trace of the rig is exported in Chrome trace format
+    :param output_name: str or None, name of the saved scene and build trace files. If not given, rig name is used
+    :param kwargs: dict, keyword arguments passed to the rig run function. If dry_run is True, the rig is built
+        against an in-memory null DCC and the DCC calls done during the build are added to the report
+    :return: dict, report with the status of the build and the status and execution time of each one of the nodes
+    """
+
+    if kwargs.pop('dry_run', False):
+        from tpRigToolkit.tools.rigbuilder.core import nulldcc
+        with nulldcc.use_dcc() as dry_run_dcc:
+            report = build_rig(
+                rig_path, output_path=output_path, trace_path=trace_path, output_name=output_name, **kwargs)
+        report['dcc_calls'] = dry_run_dcc.get_stats()
+        return report
+
+    import tpDcc as tp
+    from tpRigToolkit.tools.rigbuilder.core import consts
+    from tpRigToolkit.tools.rigbuilder.objects import helpers, script
+
+    rig_name = os.path.basename(rig_path)
+    output_name = output_name or rig_name
+    report = {
+        'rig': rig_name, 'path': rig_path, 'status': BuildStatus.FAIL, 'scene': None, 'time': 0.0, 'error': None,
+        'nodes': list()
+    }
+    if trace_path:
+        report['trace'] = os.path.join(trace_path, '{}.trace.json'.format(output_name)).replace('\\', '/')
+        kwargs['trace_file'] = report['trace']
+
+    start_time = time.time()
+    try:
+        rig_object = helpers.RigHelpers.get_rig(rig_path)
+        if not rig_object:
+            raise ValueError('"{}" is not a valid rig'.format(rig_path))
+
+        tp.Dcc.new_file(force=True)
+        kwargs['hard_error'] = False
+        rig_object.run(**kwargs)
+        report['nodes'] = rig_object.get_build_report()
+
+        output_path = output_path or os.path.join(rig_path, consts.BUILD_FOLDER)
+        if not os.path.isdir(output_path):
+            os.makedirs(output_path)
+        tp.Dcc.save_current_scene(force=True, path_to_save=output_path, name_to_save=output_name)
+        for file_name in os.listdir(output_path):
+            if os.path.splitext(file_name)[0] == output_name:
+                report['scene'] = os.path.join(output_path, file_name).replace('\\', '/')
+                break
+
+        node_errors = [node for node in report['nodes'] if node['status'] not in (
+            script.ScriptStatus.SUCCESS, script.ScriptStatus.SKIPPED, True)]
+        if not node_errors:
+            report['status'] = BuildStatus.SUCCESS
+        else:
+            report['error'] = 'Nodes with errors: {}'.format(', '.join(node['script'] for node in node_errors))
+    except Exception:
+        report['error'] = traceback.format_exc()
+        LOGGER.error('Error while building rig "{}": {}'.format(rig_name, report['error']))
+
+    report['time'] = time.time() - start_time
+
+    return report
+
+
+def build_rigs(projects_path, project_name, rig_patterns=None, output_path=None, workers=None, **kwargs):
+    """
+    Builds the rigs of the given project. Each rig is built in its own worker process
+    :param projects_path: str
+    :param project_name: str
+    :param rig_patterns: list(str) or None, rig names or glob patterns of the rigs to build
+    :param output_path: str or None, folder where built scenes are saved
+    :param workers: int or None, maximum number of rigs built at the same time. If not given, CPU count is used
+    :param kwargs: dict, keyword arguments passed to the rig run function
+    :return: dict, report of the build
+    """
+
+    project = get_project(projects_path, project_name)
+    rig_paths = find_rigs(project, rig_patterns)
+    output_names = get_output_names(project, rig_paths)
+    workers = max(1, min(workers or multiprocessing.cpu_count(), len(rig_paths) or 1))
+
+    report = {'project': project_name, 'workers': workers, 'time': 0.0, 'rigs': list()}
+    if not rig_paths:
+        return report
+
+    LOGGER.info('Building {} rigs using {} worker processes'.format(len(rig_paths), workers))
+
+    start_time = time.time()
+
+    # New processes are used for each rig, so rigs do not share DCC scene nor Python state between them
+    pool = multiprocessing.Pool(
+        processes=workers, initializer=_init_worker, initargs=(projects_path, project_name), maxtasksperchild=1)
+    try:
+        results = list()
+        for rig_path in rig_paths:
+            rig_kwargs = dict(kwargs, output_name=output_names[rig_path])
+            results.append(pool.apply_async(_build_rig_worker, (rig_path, output_path, rig_kwargs)))
+        pool.close()
+        for rig_path, result in zip(rig_paths, results):
+            try:
+                rig_report = result.get()
+            except Exception:
+                rig_report = {
+                    'rig': os.path.basename(rig_path), 'path': rig_path, 'status': BuildStatus.FAIL, 'scene': None,
+                    'time': 0.0, 'error': traceback.format_exc(), 'nodes': list()}
+            LOGGER.info('{}: {} ({:.2f} seconds)'.format(rig_report['rig'], rig_report['status'], rig_report['time']))
+            report['rigs'].append(rig_report)
+        pool.join()
+    except BaseException:
+        pool.terminate()
+        raise
+
+    report['time'] = time.time() - start_time
+
+    return report
+
+
+def write_report(report, report_file):
+    """
+    Writes given build report into a JSON file
+    :param report: dict
+    :param report_file: str
+    """
+
+    report_dir = os.path.dirname(os.path.abspath(report_file))
+    if not os.path.isdir(report_dir):
+        os.makedirs(report_dir)
+
+    with open(report_file, 'w') as fh:
+        json.dump(report, fh, indent=2, sort_keys=True, default=str)
+
+
+def main(args=None):
+    """
+    Command line entry point of batch builds
+    :param args: list(str) or None
+    :return: int, exit code. 0 if all rigs were built successfully; 1 otherwise
+    """
+
+    parser = argparse.ArgumentParser(description='Builds RigBuilder rigs without UI')
+    parser.add_argument('--projects-path', required=True, help='Folder where projects are located')
+    parser.add_argument('--project', required=True, help='Name of the project that contains the rigs')
+    parser.add_argument(
+        '--rigs', nargs='*', default=None, help='Names or glob patterns of the rigs to build. All rigs by default')
+    parser.add_argument('--workers', type=int, default=None, help='Number of rigs built at the same time')
+    parser.add_argument('--output-path', default=None, help='Folder where built scenes are saved')
+    parser.add_argument('--report', default=None, help='JSON file where build report is written')
+    parser.add_argument('--incremental', action='store_true', help='Restore unchanged nodes from build cache')
+    parser.add_argument(
+        '--dry-run', action='store_true', help='Build rigs against an in-memory null DCC instead of the current one')
+    parser.add_argument(
+        '--trace-path', default=None, help='Folder where the Chrome trace of the build of each rig is exported')
+    parsed_args = parser.parse_args(args)
+
+    if not LOGGER.handlers:
+        logging.basicConfig(level=logging.INFO)
+
+    report = build_rigs(
+        parsed_args.projects_path, parsed_args.project, rig_patterns=parsed_args.rigs,
+        output_path=parsed_args.output_path, workers=parsed_args.workers, incremental=parsed_args.incremental,
+        trace_path=parsed_args.trace_path, dry_run=parsed_args.dry_run)
+    if parsed_args.report:
+        write_report(report, parsed_args.report)
+
+    failed = [rig_report['rig'] for rig_report in report['rigs'] if rig_report['status'] != BuildStatus.SUCCESS]
+    if failed:
+        LOGGER.error('The following rigs failed to build: {}'.format(', '.join(failed)))
+
+    return 1 if failed else 0
+
+
+def _init_worker(projects_path, project_name):
+    """
+    Internal function that initializes worker processes
+    :param projects_path: str
+    :param project_name: str
+    """
+
+    initialize_dcc()
+    get_project(projects_path, project_name)
+
+
+def _build_rig_worker(rig_path, output_path, kwargs):
+    """
+    Internal function that builds a rig inside a worker process
+    :param rig_path: str
+    :param output_path: str or None
+    :param kwargs: dict
+    :return: dict
+    """
+
+    return build_rig(rig_path, output_path=output_path, **kwargs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
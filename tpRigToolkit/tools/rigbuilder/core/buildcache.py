@@ -0,0 +1,587 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains build cache implementation used by incremental builds in tpRigToolkit.tools.rigbuilder
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import time
+import hashlib
+import logging
+
+import tpDcc as tp
+
+from tpRigToolkit.tools.rigbuilder.core import consts, nulldcc
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+
+def get_fingerprint(values=None, file_paths=None, fingerprints=None):
+    """
+    Returns a fingerprint that identifies the given values, the contents of the given files and the given fingerprints
+    :param values: list(str), values to add to the fingerprint
+    :param file_paths: list(str), files whose name and contents are added to the fingerprint
+    :param fingerprints: list(str), fingerprints to add to the fingerprint (for example, the ones of the ancestors)
+    :return: str
+    """
+
+    hasher = hashlib.md5()
+    for value in values or list():
+        hasher.update(str(value).encode('utf-8'))
+        hasher.update(b'\0')
+    for file_path in sorted(file_paths or list()):
+        hasher.update(file_path.encode('utf-8'))
+        hasher.update(b'\0')
+        try:
+            with open(file_path, 'rb') as fh:
+                for chunk in iter(lambda: fh.read(65536), b''):
+                    hasher.update(chunk)
+        except (IOError, OSError):
+            hasher.update(b'<missing>')
+        hasher.update(b'\0')
+    for fingerprint in sorted(fingerprints or list()):
+        hasher.update(fingerprint.encode('utf-8'))
+        hasher.update(b'\0')
+
+    return hasher.hexdigest()
+
+
+def get_folder_files(directory, recursive=False):
+    """
+    Returns all the files located in the given directory
+    Backup and version folders are ignored
+    :param directory: str
+    :param recursive: bool, whether to return also the files of the sub folders
+    :return: list(str)
+    """
+
+    found = list()
+    if not directory or not os.path.isdir(directory):
+        return found
+
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if d not in (consts.VERSIONS_FOLDER, consts.BACKUP_FOLDER)]
+        found.extend(os.path.join(root, f).replace('\\', '/') for f in files)
+        if not recursive:
+            break
+
+    return found
+
+
+class BuildCache(object):
+    """
+    Class that stores, for each one of the nodes of the last build of an object, its fingerprint, its build status
+    and, optionally, a checkpoint with the scene produced by the build until that node
+    Incremental builds use this information to restore the result of the nodes that did not change instead of
+    executing them again
+    """
+
+    CACHE_FILE = 'cache.json'
+    CHECKPOINTS_FOLDER = 'checkpoints'
+    MAX_CHECKPOINTS = 10
+    VERSION = 1
+
+    def __init__(self, directory, max_checkpoints=None):
+        super(BuildCache, self).__init__()
+
+        self._directory = directory
+        self._max_checkpoints = self.MAX_CHECKPOINTS if max_checkpoints is None else max_checkpoints
+        self._entries = None
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def get_cache_file(self):
+        """
+        Returns path of the file where cache entries are stored
+        :return: str
+        """
+
+        return os.path.join(self._directory, self.CACHE_FILE).replace('\\', '/')
+
+    def get_checkpoints_path(self):
+        """
+        Returns path of the folder where scene checkpoints are stored
+        :return: str
+        """
+
+        return os.path.join(self._directory, self.CHECKPOINTS_FOLDER).replace('\\', '/')
+
+    def load(self, force=False):
+        """
+        Loads cache entries from disk
+        :param force: bool, whether to load entries even if they were already loaded
+        """
+
+        if self._entries is not None and not force:
+            return
+
+        self._entries = dict()
+        cache_file = self.get_cache_file()
+        if not os.path.isfile(cache_file):
+            return
+
+        try:
+            with open(cache_file, 'r') as fh:
+                cache_data = json.load(fh)
+        except (IOError, OSError, ValueError) as exc:
+            LOGGER.warning('Impossible to read build cache file "{}": {}'.format(cache_file, exc))
+            return
+
+        if cache_data.get('version', None) != self.VERSION:
+            return
+
+        self._entries = cache_data.get('entries', dict())
+
+    def save(self):
+        """
+        Stores cache entries in disk
+        """
+
+        self.load()
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+        cache_file = self.get_cache_file()
+        temp_file = '{}.tmp'.format(cache_file)
+        with open(temp_file, 'w') as fh:
+            json.dump({'version': self.VERSION, 'entries': self._entries}, fh, indent=2, sort_keys=True)
+        if os.path.isfile(cache_file):
+            os.remove(cache_file)
+        os.rename(temp_file, cache_file)
+
+    def clear(self):
+        """
+        Removes all cache entries and checkpoints
+        """
+
+        self._entries = dict()
+        self.remove_unused_checkpoints()
+        self.save()
+
+    def get_entry(self, key):
+        """
+        Returns the cache entry of the given key
+        :param key: str
+        :return: dict or None
+        """
+
+        self.load()
+        return self._entries.get(key, None)
+
+    def set_entry(self, key, fingerprint, status, checkpoint=None):
+        """
+        Stores the build result of the given key
+        :param key: str
+        :param fingerprint: str
+        :param status: str or bool
+        :param checkpoint: str or None, path of the scene checkpoint saved after building the node
+        """
+
+        self.load()
+        self._entries[key] = {'fingerprint': fingerprint, 'status': status, 'checkpoint': checkpoint}
+
+    def remove_entries(self, keys_to_keep):
+        """
+        Removes all entries whose key is not in the given list
+        :param keys_to_keep: list(str)
+        """
+
+        self.load()
+        keys_to_keep = set(keys_to_keep)
+        for key in list(self._entries.keys()):
+            if key not in keys_to_keep:
+                self._entries.pop(key)
+
+    def is_valid(self, key, fingerprint):
+        """
+        Returns whether or not the stored result of the given key can be reused
+        :param key: str
+        :param fingerprint: str, current fingerprint of the node
+        :return: bool
+        """
+
+        entry = self.get_entry(key)
+        if not entry or entry.get('fingerprint', None) != fingerprint:
+            return False
+
+        status = entry.get('status', None)
+
+        return status == 'Success' or status is True
+
+    def has_checkpoint(self, key):
+        """
+        Returns whether or not given key has a scene checkpoint stored in disk
+        :param key: str
+        :return: bool
+        """
+
+        entry = self.get_entry(key) or dict()
+        checkpoint = entry.get('checkpoint', None)
+
+        return bool(checkpoint and os.path.isfile(checkpoint))
+
+    def save_checkpoint(self, name):
+        """
+        Saves a copy of the current DCC scene as a new checkpoint. The current scene is not renamed, so checkpoints
+        never become the file the user is working on
+        If the maximum number of checkpoints is reached, the least recently used checkpoints are removed
+        :param name: str, name of the checkpoint (usually the fingerprint of the last executed node)
+        :return: str or None, path of the saved checkpoint file
+        """
+
+        checkpoints_path = self.get_checkpoints_path()
+        if not os.path.isdir(checkpoints_path):
+            os.makedirs(checkpoints_path)
+
+        try:
+            checkpoint = self._export_scene(checkpoints_path, name)
+        except Exception as exc:
+            LOGGER.warning('Impossible to save build checkpoint "{}": {}'.format(name, exc))
+            return None
+
+        if not checkpoint or not os.path.isfile(checkpoint):
+            return None
+
+        checkpoint = checkpoint.replace('\\', '/')
+        self._remove_least_recently_used_checkpoints(keep=checkpoint)
+
+        return checkpoint
+
+    def open_checkpoint(self, key):
+        """
+        Opens the scene checkpoint of the given key
+        The checkpoint is imported into a new untitled scene, so saving the restored scene never overwrites the
+        checkpoint file
+        :param key: str
+        :return: bool
+        """
+
+        if not self.has_checkpoint(key):
+            return False
+
+        checkpoint = self.get_entry(key)['checkpoint']
+        LOGGER.info('Restoring build checkpoint: {}'.format(checkpoint))
+        tp.Dcc.new_file(force=True)
+        tp.Dcc.import_file(checkpoint, force=True)
+        try:
+            os.utime(checkpoint, None)
+        except OSError:
+            pass
+
+        return True
+
+    def remove_unused_checkpoints(self):
+        """
+        Removes from disk all checkpoints that are not referenced by any cache entry
+        """
+
+        checkpoints_path = self.get_checkpoints_path()
+        if not os.path.isdir(checkpoints_path):
+            return
+
+        self.load()
+        used = set(entry.get('checkpoint', None) for entry in self._entries.values())
+        for file_name in os.listdir(checkpoints_path):
+            checkpoint = os.path.join(checkpoints_path, file_name).replace('\\', '/')
+            if checkpoint in used or not os.path.isfile(checkpoint):
+                continue
+            self._remove_checkpoint(checkpoint)
+
+    def _export_scene(self, checkpoints_path, name):
+        """
+        Internal function that exports a copy of the current DCC scene into the given folder
+        :param checkpoints_path: str
+        :param name: str, name of the exported file (without extension)
+        :return: str, path of the exported file
+        """
+
+        export_scene = getattr(tp.Dcc, 'export_scene', None)
+        if export_scene:
+            return export_scene(path_to_save=checkpoints_path, name_to_save=name)
+
+        if not nulldcc.is_maya():
+            raise NotImplementedError('Scene checkpoints are not supported in current DCC')
+
+        import tpDcc.dccs.maya as maya
+        checkpoint = os.path.join(checkpoints_path, '{}.mb'.format(name))
+        maya.cmds.file(checkpoint, exportAll=True, preserveReferences=True, type='mayaBinary', force=True)
+
+        return checkpoint
+
+    def _remove_least_recently_used_checkpoints(self, keep=None):
+        """
+        Internal function that removes the least recently used checkpoints until the maximum number of checkpoints
+        is not exceeded. Checkpoints are updated each time they are saved or opened
+        :param keep: str or None, checkpoint that should not be removed
+        """
+
+        if self._max_checkpoints is None:
+            return
+
+        checkpoints_path = self.get_checkpoints_path()
+        checkpoints = list()
+        for file_name in os.listdir(checkpoints_path):
+            checkpoint = os.path.join(checkpoints_path, file_name).replace('\\', '/')
+            if checkpoint == keep or not os.path.isfile(checkpoint):
+                continue
+            checkpoints.append((os.path.getmtime(checkpoint), checkpoint))
+
+        max_checkpoints = self._max_checkpoints - 1 if keep else self._max_checkpoints
+        checkpoints.sort()
+        for _, checkpoint in checkpoints[:max(len(checkpoints) - max_checkpoints, 0)]:
+            self._remove_checkpoint(checkpoint)
+
+    def _remove_checkpoint(self, checkpoint):
+        """
+        Internal function that removes given checkpoint file from disk
+        :param checkpoint: str
+        """
+
+        try:
+            os.remove(checkpoint)
+        except OSError as exc:
+            LOGGER.warning('Impossible to remove build checkpoint "{}": {}'.format(checkpoint, exc))
+
+
+class BuildSession(object):
+    """
+    Class that uses the build cache to decide which nodes of a build must be executed
+    Nodes are identified by their fingerprint, that takes into account the files of the node and the fingerprints of
+    the nodes it depends on. DCC free nodes can be restored if their fingerprint did not change and they do not declare
+    outputs (the cache only stores the status of the nodes, not the data they output). The rest of nodes modify the DCC
+    scene, so they can only be restored if all the previous nodes did not change and a scene checkpoint saved after
+    them is available.
+    In incremental builds, all the nodes that can be restored are restored. When a build starts from a start point,
+    the scene is restored from the nearest checkpoint before the start point and the nodes located between that
+    checkpoint and the start point are executed. If no checkpoint is available, the nodes before the start point
+    are skipped and the current scene is used.
+    Checkpoints are saved after the given checkpoint scripts or, if a checkpoint interval is given, when the build
+    time since the last checkpoint exceeds it. If an incremental build does not define any of them, the default
+    checkpoint interval is used and a checkpoint is also saved after the last node that modifies the DCC scene, so
+    the next build can restore all the nodes if nothing changed.
+    """
+
+    DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+    def __init__(self, build_cache, incremental=False, checkpoint_interval=None, checkpoint_scripts=None):
+        super(BuildSession, self).__init__()
+
+        self._cache = build_cache
+        self._incremental = incremental
+        self._checkpoint_interval = checkpoint_interval
+        self._checkpoint_scripts = set(checkpoint_scripts or list())
+        self._checkpoint_last = False
+        if incremental and checkpoint_interval is None and not checkpoint_scripts:
+            self._checkpoint_interval = self.DEFAULT_CHECKPOINT_INTERVAL
+            self._checkpoint_last = True
+        self._keys = list()
+        self._names = dict()
+        self._fingerprints = dict()
+        self._dcc_free = dict()
+        self._has_outputs = dict()
+        self._reused = set()
+        self._skipped = set()
+        self._current_level = None
+        self._level_seed = ''
+        self._level_fingerprints = list()
+        self._last_checkpoint_time = None
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def add_task(self, build_level, task, file_paths=None, outputs=None):
+        """
+        Adds given scheduler task into the session and calculates its fingerprint
+        Tasks must be added in execution order
+        :param build_level: str
+        :param task: scheduler.BuildTask
+        :param file_paths: list(str), files used by the task
+        :param outputs: list(str) or None, names of the data the task writes
+        :return: str, fingerprint of the task
+        """
+
+        if build_level != self._current_level:
+            self._level_seed = get_fingerprint(values=[self._level_seed], fingerprints=self._level_fingerprints)
+            self._level_fingerprints = list()
+            self._current_level = build_level
+
+        key = self._get_key(build_level, task.name)
+        dependencies = [self._fingerprints[self._get_key(build_level, name)] for name in task.dependencies]
+        fingerprint = get_fingerprint(
+            values=[build_level, task.name, self._level_seed], file_paths=file_paths, fingerprints=dependencies)
+
+        self._keys.append(key)
+        self._names[key] = task.name
+        self._fingerprints[key] = fingerprint
+        self._dcc_free[key] = task.dcc_free
+        self._has_outputs[key] = bool(outputs)
+        self._level_fingerprints.append(fingerprint)
+
+        return fingerprint
+
+    def restore(self, start_script=None):
+        """
+        Checks which tasks can be restored from the cache and opens the scene checkpoint of the latest of them
+        This function must be called once all the tasks of the build are added and before executing them
+        :param start_script: str or None, name of the script the build starts from
+        """
+
+        self._reused = set()
+        self._skipped = set()
+
+        start_index = len(self._keys)
+        if start_script:
+            for i, key in enumerate(self._keys):
+                if self._names[key] == start_script:
+                    start_index = i
+                    break
+            else:
+                LOGGER.warning('Start point "{}" is not part of the build'.format(start_script))
+
+        valid_dcc_free = set()
+        prefix = list()
+        prefix_open = True
+        for key in self._keys[:start_index]:
+            is_valid = self._cache.is_valid(key, self._fingerprints[key])
+            if self._dcc_free[key]:
+                # Outputs of DCC free nodes are not stored in the cache, so those nodes are always executed again
+                if is_valid and not self._has_outputs[key]:
+                    valid_dcc_free.add(key)
+                continue
+            if prefix_open and is_valid:
+                prefix.append(key)
+            else:
+                prefix_open = False
+
+        restore_key = None
+        if self._incremental or start_script:
+            for key in reversed(prefix):
+                if self._cache.has_checkpoint(key):
+                    restore_key = key
+                    break
+
+        if restore_key:
+            restore_index = self._keys.index(restore_key)
+            self._reused.update(prefix[:prefix.index(restore_key) + 1])
+            if self._incremental:
+                self._reused.update(valid_dcc_free)
+            else:
+                self._reused.update(key for key in self._keys[:restore_index] if key in valid_dcc_free)
+            self._cache.open_checkpoint(restore_key)
+        elif start_script:
+            self._skipped.update(self._keys[:start_index])
+            if self._incremental:
+                self._reused.update(valid_dcc_free)
+        elif self._incremental:
+            self._reused.update(valid_dcc_free)
+
+        self._skipped.difference_update(self._reused)
+        self._last_checkpoint_time = time.time()
+        if self._incremental or start_script:
+            LOGGER.info('{} of {} nodes restored from build cache, {} nodes skipped'.format(
+                len(self._reused), len(self._keys), len(self._skipped)))
+
+    def is_reused(self, build_level, task_name):
+        """
+        Returns whether or not the given task is restored from the cache
+        :param build_level: str
+        :param task_name: str
+        :return: bool
+        """
+
+        return self._get_key(build_level, task_name) in self._reused
+
+    def is_skipped(self, build_level, task_name):
+        """
+        Returns whether or not the given task must not be executed because it is located before the start point
+        :param build_level: str
+        :param task_name: str
+        :return: bool
+        """
+
+        return self._get_key(build_level, task_name) in self._skipped
+
+    def get_status(self, build_level, task_name):
+        """
+        Returns the cached status of the given task
+        :param build_level: str
+        :param task_name: str
+        :return: str or bool
+        """
+
+        entry = self._cache.get_entry(self._get_key(build_level, task_name)) or dict()
+
+        return entry.get('status', None)
+
+    def task_finished(self, build_level, task_name, status):
+        """
+        Stores the result of the given executed task in the cache
+        A checkpoint is saved if the task is one of the checkpoint scripts, if the time since the last checkpoint
+        exceeds the checkpoint interval or if the task is the last one that modifies the scene of an incremental build
+        that uses the default checkpoint policy
+        :param build_level: str
+        :param task_name: str
+        :param status: str or bool
+        """
+
+        key = self._get_key(build_level, task_name)
+        if key in self._reused or key in self._skipped:
+            return
+
+        fingerprint = self._fingerprints[key]
+        checkpoint = None
+        is_success = status == 'Success' or status is True
+        if is_success and not self._dcc_free[key]:
+            save_checkpoint = task_name in self._checkpoint_scripts
+            if not save_checkpoint and self._checkpoint_last:
+                save_checkpoint = key == self._get_last_dcc_key()
+            if not save_checkpoint and self._checkpoint_interval is not None:
+                save_checkpoint = time.time() - self._last_checkpoint_time >= self._checkpoint_interval
+            if save_checkpoint:
+                checkpoint = self._cache.save_checkpoint(fingerprint)
+                self._last_checkpoint_time = time.time()
+
+        self._cache.set_entry(key, fingerprint, status, checkpoint=checkpoint)
+
+    def finish(self):
+        """
+        Stores cache in disk removing entries and checkpoints of the nodes that are not part of this build anymore
+        """
+
+        self._cache.remove_entries(self._keys)
+        self._cache.save()
+        self._cache.remove_unused_checkpoints()
+
+    def _get_last_dcc_key(self):
+        """
+        Internal function that returns cache key of the last task of the build that modifies the DCC scene
+        :return: str or None
+        """
+
+        for key in reversed(self._keys):
+            if not self._dcc_free[key]:
+                return key
+
+        return None
+
+    def _get_key(self, build_level, task_name):
+        """
+        Internal function that returns cache key of the given task
+        :param build_level: str
+        :param task_name: str
+        :return: str
+        """
+
+        return '{}|{}'.format(build_level, task_name)
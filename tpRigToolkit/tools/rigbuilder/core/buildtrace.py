@@ -0,0 +1,189 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains build trace implementation used to profile builds in tpRigToolkit.tools.rigbuilder
+Traces can be exported in Chrome trace format (chrome://tracing or https://ui.perfetto.dev)
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import time
+import threading
+import contextlib
+
+from tpRigToolkit.tools.rigbuilder.core import consts
+
+
+class TracePhase(object):
+    """
+    Class that defines the phases of the execution of a node that are recorded by build traces
+    """
+
+    OPTIONS = 'options'
+    LOGGING = 'logging'
+    SOURCE = 'source'
+    EXECUTE = 'execute'
+
+
+class BuildTrace(object):
+    """
+    Class that records the time spent by each one of the nodes of a build
+    Each node records a span for each build level it is executed in and, inside them, spans for each one of its
+    execution phases (options loading, logging, script sourcing and execution)
+    """
+
+    BUILD_LEVELS = [consts.BuildLevel.PRE, consts.BuildLevel.MAIN, consts.BuildLevel.POST]
+    PHASES = [TracePhase.OPTIONS, TracePhase.LOGGING, TracePhase.SOURCE, TracePhase.EXECUTE]
+
+    def __init__(self, name=None):
+        super(BuildTrace, self).__init__()
+
+        self._name = name
+        self._events = list()
+        self._lock = threading.Lock()
+        self._start_time = time.time()
+
+    @property
+    def name(self):
+        return self._name
+
+    @contextlib.contextmanager
+    def span(self, name, category, **kwargs):
+        """
+        Context manager that records the time spent inside it
+        :param name: str, name of the node
+        :param category: str, build level or phase of the span
+        :param kwargs: dict, extra values stored with the span
+        """
+
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.add_event(name, category, start_time, time.time() - start_time, **kwargs)
+
+    def add_event(self, name, category, start_time, duration, **kwargs):
+        """
+        Adds a new span to the trace
+        :param name: str, name of the node
+        :param category: str, build level or phase of the span
+        :param start_time: float, time (in seconds since the epoch) the span started
+        :param duration: float, duration of the span in seconds
+        :param kwargs: dict, extra values stored with the span
+        """
+
+        event = {
+            'name': name, 'category': category, 'start': start_time - self._start_time, 'duration': duration,
+            'thread': threading.current_thread().ident, 'args': kwargs}
+        with self._lock:
+            self._events.append(event)
+
+    def get_events(self):
+        """
+        Returns all recorded spans
+        :return: list(dict)
+        """
+
+        with self._lock:
+            return list(self._events)
+
+    def get_summary(self):
+        """
+        Returns the time spent by each node, sorted from the most expensive to the cheapest one
+        :return: list(dict), each dict contains the total time of the node, the time per build level and the time
+            per phase
+        """
+
+        nodes = dict()
+        for event in self.get_events():
+            node = nodes.get(event['name'], None)
+            if not node:
+                node = dict((key, 0.0) for key in ['total'] + self.BUILD_LEVELS + self.PHASES)
+                node['name'] = event['name']
+                nodes[event['name']] = node
+            if event['category'] in self.BUILD_LEVELS:
+                node['total'] += event['duration']
+            node[event['category']] = node.get(event['category'], 0.0) + event['duration']
+
+        return sorted(nodes.values(), key=lambda n: n['total'], reverse=True)
+
+    def format_summary(self, limit=None):
+        """
+        Returns a table with the summary of the trace
+        :param limit: int or None, maximum number of nodes to include
+        :return: str
+        """
+
+        summary = self.get_summary()
+        build_time = sum(node['total'] for node in summary) or 1.0
+        columns = ['total', '%'] + self.BUILD_LEVELS + self.PHASES
+        name_width = max([len(node['name']) for node in summary] + [4])
+
+        lines = ['{}  {}'.format('node'.ljust(name_width), '  '.join(column.rjust(10) for column in columns))]
+        for node in summary[:limit]:
+            values = [node['total'], node['total'] / build_time * 100.0] + [node[key] for key in columns[2:]]
+            lines.append('{}  {}'.format(
+                node['name'].ljust(name_width), '  '.join('{:10.3f}'.format(value) for value in values)))
+
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self):
+        """
+        Returns trace in Chrome trace event format
+        :return: dict
+        """
+
+        pid = os.getpid()
+        trace_events = list()
+        if self._name:
+            trace_events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': self._name}})
+        for event in self.get_events():
+            trace_events.append({
+                'name': event['name'] if event['category'] in self.BUILD_LEVELS else event['category'],
+                'cat': event['category'],
+                'ph': 'X',
+                'ts': int(event['start'] * 1000000),
+                'dur': int(event['duration'] * 1000000),
+                'pid': pid,
+                'tid': event['thread'],
+                'args': dict(event['args'], node=event['name'])
+            })
+
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, file_path):
+        """
+        Writes trace in the given file in Chrome trace event format
+        :param file_path: str
+        """
+
+        trace_dir = os.path.dirname(os.path.abspath(file_path))
+        if not os.path.isdir(trace_dir):
+            os.makedirs(trace_dir)
+
+        with open(file_path, 'w') as fh:
+            json.dump(self.to_chrome_trace(), fh, default=str)
+
+
+class NullTrace(object):
+    """
+    Class that implements BuildTrace interface without recording anything. Used when builds are not traced
+    """
+
+    @contextlib.contextmanager
+    def span(self, name, category, **kwargs):
+        yield
+
+    def add_event(self, name, category, start_time, duration, **kwargs):
+        pass
+
+
+NULL_TRACE = NullTrace()
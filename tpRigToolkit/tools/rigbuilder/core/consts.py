@@ -18,6 +18,7 @@ SUB_DATA_FOLDER = '__sub__'
 NODE_FOLDER = '__node__'
 BACKUP_FOLDER = '__backup__'
 VERSIONS_FOLDER = '__versions__'
+BUILD_FOLDER = '__build__'
 MANIFEST_FOLDER = 'manifest'
 DATA_FILE = 'data'
 VERSION_NAME = 'version'
@@ -0,0 +1,558 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains a build daemon that keeps initialized worker processes to build rigs without paying
+the cost of starting the DCC and initializing RigBuilder for each build
+Usage:
+    mayapy -m tpRigToolkit.tools.rigbuilder.core.daemon serve --projects-path PATH --project NAME [--workers N]
+    python -m tpRigToolkit.tools.rigbuilder.core.daemon build [--rigs RIG ...] [--report FILE]
+Daemon and clients must run as the same user (or share RIGBUILDER_DAEMON_KEY) to authenticate their connections
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import sys
+import stat
+import time
+import binascii
+import logging
+import argparse
+import itertools
+import threading
+import traceback
+import multiprocessing
+from multiprocessing.connection import Listener, Client
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+from tpRigToolkit.tools.rigbuilder.core import batch
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+DEFAULT_ADDRESS = ('localhost', 6520)
+AUTHKEY_ENV = 'RIGBUILDER_DAEMON_KEY'
+AUTHKEY_FILE = 'rigbuilder_daemon.key'
+AUTHKEY_MIN_LENGTH = 32
+
+
+def get_authkey_file():
+    """
+    Returns path of the file where the per-user build daemon key is stored
+    :return: str
+    """
+
+    return os.path.join(os.path.expanduser('~'), 'tpRigToolkit', AUTHKEY_FILE)
+
+
+def get_authkey():
+    """
+    Returns the key used to authenticate the connections between the build daemon and its clients
+    The key is read from RIGBUILDER_DAEMON_KEY environment variable. If it is not defined, a random key is
+    generated the first time and stored in a file, located in the user home folder, that only the user can read
+    Daemon connections send pickled data, so they are never authenticated with a known default key
+    :return: bytes
+    """
+
+    authkey = os.environ.get(AUTHKEY_ENV, None)
+    if authkey:
+        return authkey.encode('utf-8')
+
+    authkey_file = get_authkey_file()
+    if not os.path.isfile(authkey_file):
+        _create_authkey_file(authkey_file)
+
+    if os.name == 'posix':
+        file_stat = os.stat(authkey_file)
+        if file_stat.st_uid != os.getuid() or file_stat.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+            raise RuntimeError(
+                'Build daemon key file "{}" must be owned and only be accessible by the current user '
+                '(chmod 600)'.format(authkey_file))
+
+    with open(authkey_file, 'rb') as fh:
+        authkey = fh.read().strip()
+    if len(authkey) < AUTHKEY_MIN_LENGTH:
+        raise RuntimeError('Build daemon key file "{}" does not contain a valid key'.format(authkey_file))
+
+    return authkey
+
+
+def get_process_memory():
+    """
+    Returns the peak memory, in megabytes, used by the current process
+    :return: float or None, None if the memory cannot be retrieved in current platform
+    """
+
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().rss / (1024.0 * 1024.0)
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return max_rss / (1024.0 * 1024.0)
+
+    return max_rss / 1024.0
+
+
+class BuildDaemon(object):
+    """
+    Class that keeps a pool of initialized worker processes and builds the rigs requested by its clients
+    Workers are recycled (replaced by a new process) after building a number of rigs or once their memory exceeds
+    a limit, so memory leaks of the builds are bounded
+    """
+
+    MAX_JOBS_PER_WORKER = 50
+
+    def __init__(self, projects_path, project_name, workers=None, address=None, max_jobs=None, max_memory=None):
+        super(BuildDaemon, self).__init__()
+
+        self._projects_path = projects_path
+        self._project_name = project_name
+        self._workers_count = workers or multiprocessing.cpu_count()
+        self._address = address or DEFAULT_ADDRESS
+        self._max_jobs = max_jobs or self.MAX_JOBS_PER_WORKER
+        self._max_memory = max_memory
+        self._project = None
+        self._jobs_queue = multiprocessing.Queue()
+        self._results_queue = multiprocessing.Queue()
+        self._workers = dict()
+        self._running_jobs = dict()
+        self._finished_jobs = dict()
+        self._job_events = dict()
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._listener = None
+
+    @property
+    def address(self):
+        return self._listener.address if self._listener else self._address
+
+    def start(self):
+        """
+        Starts worker processes and the thread that collects the results of the jobs
+        """
+
+        self._project = batch.get_project(self._projects_path, self._project_name)
+        for _ in range(self._workers_count):
+            self._start_worker()
+
+        results_thread = threading.Thread(target=self._collect_results)
+        results_thread.daemon = True
+        results_thread.start()
+
+    def stop(self):
+        """
+        Stops the daemon and all its worker processes
+        """
+
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+
+        with self._lock:
+            workers = list(self._workers.values())
+        for _ in workers:
+            self._jobs_queue.put(None)
+        for worker in workers:
+            worker.join(10)
+            if worker.is_alive():
+                worker.terminate()
+
+        if self._listener:
+            # Wake up the listener so serve_forever can exit
+            try:
+                Client(self._listener.address, authkey=get_authkey()).close()
+            except Exception:
+                pass
+
+    def serve_forever(self):
+        """
+        Accepts client requests until the daemon is stopped
+        """
+
+        self.start()
+        self._listener = Listener(self._address, authkey=get_authkey())
+        LOGGER.info('Build daemon listening on {}:{} with {} workers'.format(
+            self._listener.address[0], self._listener.address[1], self._workers_count))
+        try:
+            while not self._stopped.is_set():
+                try:
+                    connection = self._listener.accept()
+                except Exception as exc:
+                    LOGGER.warning('Build daemon connection refused: {}'.format(exc))
+                    continue
+                connection_thread = threading.Thread(target=self._handle_connection, args=(connection,))
+                connection_thread.daemon = True
+                connection_thread.start()
+        finally:
+            self._listener.close()
+            self.stop()
+
+    def build(self, rig_patterns=None, output_path=None, **kwargs):
+        """
+        Builds the rigs of the daemon project whose name matches given patterns
+        :param rig_patterns: list(str) or None, rig names or glob patterns of the rigs to build
+        :param output_path: str or None, folder where built scenes are saved
+        :param kwargs: dict, keyword arguments passed to the rig run function
+        :return: dict, report of the build
+        """
+
+        start_time = time.time()
+        rig_paths = batch.find_rigs(self._project, rig_patterns)
+        output_names = batch.get_output_names(self._project, rig_paths)
+        job_ids = [
+            self._add_job(rig_path, output_path, dict(kwargs, output_name=output_names[rig_path]))
+            for rig_path in rig_paths]
+
+        rig_reports = list()
+        for job_id in job_ids:
+            self._job_events[job_id].wait()
+            with self._lock:
+                self._job_events.pop(job_id)
+                rig_reports.append(self._finished_jobs.pop(job_id))
+
+        return {
+            'project': self._project_name, 'workers': self._workers_count, 'time': time.time() - start_time,
+            'rigs': rig_reports}
+
+    def get_status(self):
+        """
+        Returns the current status of the daemon
+        :return: dict
+        """
+
+        with self._lock:
+            return {
+                'project': self._project_name, 'workers': sorted(self._workers.keys()),
+                'running_jobs': len(self._running_jobs), 'queued_jobs': len(self._job_events) - len(self._running_jobs)
+            }
+
+    def _start_worker(self):
+        """
+        Internal function that starts a new worker process
+        :return: multiprocessing.Process
+        """
+
+        worker = multiprocessing.Process(
+            target=_worker_loop,
+            args=(self._projects_path, self._project_name, self._jobs_queue, self._results_queue,
+                  self._max_jobs, self._max_memory))
+        worker.daemon = True
+        worker.start()
+        with self._lock:
+            self._workers[worker.pid] = worker
+
+        return worker
+
+    def _add_job(self, rig_path, output_path, kwargs):
+        """
+        Internal function that adds a new build job to the queue
+        :param rig_path: str
+        :param output_path: str or None
+        :param kwargs: dict
+        :return: int, ID of the job
+        """
+
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._job_events[job_id] = threading.Event()
+        self._jobs_queue.put((job_id, rig_path, output_path, kwargs))
+
+        return job_id
+
+    def _finish_job(self, job_id, report):
+        """
+        Internal function that stores the report of the given job and notifies the client waiting for it
+        :param job_id: int
+        :param report: dict
+        """
+
+        with self._lock:
+            self._running_jobs.pop(job_id, None)
+            self._finished_jobs[job_id] = report
+            event = self._job_events.get(job_id, None)
+        if event:
+            event.set()
+
+    def _collect_results(self):
+        """
+        Internal function that collects the messages sent by worker processes and replaces the workers that
+        were recycled or that died unexpectedly
+        """
+
+        while not self._stopped.is_set():
+            try:
+                message = self._results_queue.get(timeout=1.0)
+            except queue.Empty:
+                self._check_workers()
+                continue
+
+            message_type, pid, job_id, data = message
+            if message_type == 'started':
+                with self._lock:
+                    self._running_jobs[job_id] = (pid, data)
+            elif message_type == 'finished':
+                self._finish_job(job_id, data)
+            elif message_type == 'recycle':
+                with self._lock:
+                    worker = self._workers.pop(pid, None)
+                if not worker:
+                    continue
+                worker.join()
+                LOGGER.info('Recycling build worker {}: {}'.format(pid, data))
+                if not self._stopped.is_set():
+                    self._start_worker()
+
+    def _check_workers(self):
+        """
+        Internal function that replaces dead workers. The job they were building is reported as failed
+        """
+
+        with self._lock:
+            dead_workers = [pid for pid, worker in self._workers.items() if not worker.is_alive()]
+            for pid in dead_workers:
+                self._workers.pop(pid)
+            lost_jobs = [
+                (job_id, rig_path) for job_id, (pid, rig_path) in self._running_jobs.items() if pid in dead_workers]
+
+        for job_id, rig_path in lost_jobs:
+            self._finish_job(job_id, {
+                'rig': os.path.basename(rig_path), 'path': rig_path, 'status': batch.BuildStatus.FAIL,
+                'scene': None, 'time': 0.0, 'error': 'Build worker process died unexpectedly', 'nodes': list()})
+        for pid in dead_workers:
+            LOGGER.warning('Build worker {} died unexpectedly'.format(pid))
+            if not self._stopped.is_set():
+                self._start_worker()
+
+    def _handle_connection(self, connection):
+        """
+        Internal function that handles the requests of a client connection
+        :param connection: multiprocessing.connection.Connection
+        """
+
+        try:
+            while not self._stopped.is_set():
+                try:
+                    request = connection.recv()
+                except (EOFError, IOError):
+                    break
+                command = request.get('command', None)
+                try:
+                    if command == 'build':
+                        response = self.build(
+                            request.get('rigs', None), output_path=request.get('output_path', None),
+                            **request.get('kwargs', dict()))
+                    elif command == 'status':
+                        response = self.get_status()
+                    elif command == 'stop':
+                        connection.send({'stopped': True})
+                        self.stop()
+                        break
+                    else:
+                        response = {'error': 'Unknown build daemon command: {}'.format(command)}
+                except Exception:
+                    response = {'error': traceback.format_exc()}
+                connection.send(response)
+        finally:
+            connection.close()
+
+
+class BuildClient(object):
+    """
+    Class that sends build requests to a running build daemon
+    """
+
+    def __init__(self, address=None):
+        super(BuildClient, self).__init__()
+
+        self._address = address or DEFAULT_ADDRESS
+
+    def build(self, rig_patterns=None, output_path=None, **kwargs):
+        """
+        Builds the rigs whose name matches given patterns and waits until all of them are built
+        :param rig_patterns: list(str) or None
+        :param output_path: str or None
+        :param kwargs: dict, keyword arguments passed to the rig run function
+        :return: dict, report of the build
+        """
+
+        return self._send({'command': 'build', 'rigs': rig_patterns, 'output_path': output_path, 'kwargs': kwargs})
+
+    def get_status(self):
+        """
+        Returns the current status of the daemon
+        :return: dict
+        """
+
+        return self._send({'command': 'status'})
+
+    def stop(self):
+        """
+        Stops the daemon
+        """
+
+        return self._send({'command': 'stop'})
+
+    def _send(self, request):
+        """
+        Internal function that sends a request to the daemon and waits for its response
+        :param request: dict
+        :return: dict
+        """
+
+        connection = Client(self._address, authkey=get_authkey())
+        try:
+            connection.send(request)
+            response = connection.recv()
+        finally:
+            connection.close()
+
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+
+        return response
+
+
+def main(args=None):
+    """
+    Command line entry point of the build daemon
+    :param args: list(str) or None
+    :return: int, exit code
+    """
+
+    parser = argparse.ArgumentParser(description='RigBuilder build daemon')
+    parser.add_argument('--host', default=DEFAULT_ADDRESS[0], help='Host the daemon listens on')
+    parser.add_argument('--port', type=int, default=DEFAULT_ADDRESS[1], help='Port the daemon listens on')
+    subparsers = parser.add_subparsers(dest='command')
+
+    serve_parser = subparsers.add_parser('serve', help='Starts the build daemon')
+    serve_parser.add_argument('--projects-path', required=True, help='Folder where projects are located')
+    serve_parser.add_argument('--project', required=True, help='Name of the project that contains the rigs')
+    serve_parser.add_argument('--workers', type=int, default=None, help='Number of worker processes')
+    serve_parser.add_argument(
+        '--max-jobs', type=int, default=None, help='Number of rigs a worker builds before it is recycled')
+    serve_parser.add_argument(
+        '--max-memory', type=float, default=None, help='Memory (in MB) after which a worker is recycled')
+
+    build_parser = subparsers.add_parser('build', help='Builds rigs using a running build daemon')
+    build_parser.add_argument(
+        '--rigs', nargs='*', default=None, help='Names or glob patterns of the rigs to build. All rigs by default')
+    build_parser.add_argument('--output-path', default=None, help='Folder where built scenes are saved')
+    build_parser.add_argument('--report', default=None, help='JSON file where build report is written')
+    build_parser.add_argument('--incremental', action='store_true', help='Restore unchanged nodes from build cache')
+
+    subparsers.add_parser('status', help='Prints the status of a running build daemon')
+    subparsers.add_parser('stop', help='Stops a running build daemon')
+
+    parsed_args = parser.parse_args(args)
+    address = (parsed_args.host, parsed_args.port)
+
+    if not LOGGER.handlers:
+        logging.basicConfig(level=logging.INFO)
+
+    if parsed_args.command == 'serve':
+        daemon = BuildDaemon(
+            parsed_args.projects_path, parsed_args.project, workers=parsed_args.workers, address=address,
+            max_jobs=parsed_args.max_jobs, max_memory=parsed_args.max_memory)
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            daemon.stop()
+        return 0
+
+    client = BuildClient(address)
+    if parsed_args.command == 'build':
+        report = client.build(
+            parsed_args.rigs, output_path=parsed_args.output_path, incremental=parsed_args.incremental)
+        if parsed_args.report:
+            batch.write_report(report, parsed_args.report)
+        failed = [
+            rig_report['rig'] for rig_report in report['rigs'] if rig_report['status'] != batch.BuildStatus.SUCCESS]
+        if failed:
+            LOGGER.error('The following rigs failed to build: {}'.format(', '.join(failed)))
+        return 1 if failed else 0
+    elif parsed_args.command == 'status':
+        print(client.get_status())
+    elif parsed_args.command == 'stop':
+        client.stop()
+
+    return 0
+
+
+def _worker_loop(projects_path, project_name, jobs_queue, results_queue, max_jobs, max_memory):
+    """
+    Internal function executed by build daemon worker processes
+    DCC and RigBuilder are initialized once and the worker builds rigs until it is stopped or recycled. Each build
+    starts in a new scene, so the state of a build does not leak into the next one
+    :param projects_path: str
+    :param project_name: str
+    :param jobs_queue: multiprocessing.Queue
+    :param results_queue: multiprocessing.Queue
+    :param max_jobs: int, number of jobs after which the worker is recycled
+    :param max_memory: float or None, memory (in MB) after which the worker is recycled
+    """
+
+    batch.initialize_dcc()
+    batch.get_project(projects_path, project_name)
+
+    pid = os.getpid()
+    jobs_done = 0
+    while True:
+        job = jobs_queue.get()
+        if job is None:
+            break
+        job_id, rig_path, output_path, kwargs = job
+        results_queue.put(('started', pid, job_id, rig_path))
+        report = batch.build_rig(rig_path, output_path=output_path, **kwargs)
+        results_queue.put(('finished', pid, job_id, report))
+
+        jobs_done += 1
+        memory = get_process_memory()
+        if jobs_done >= max_jobs:
+            results_queue.put(('recycle', pid, None, '{} jobs done'.format(jobs_done)))
+            break
+        if max_memory and memory and memory > max_memory:
+            results_queue.put(('recycle', pid, None, '{:.0f} MB used'.format(memory)))
+            break
+
+
+def _create_authkey_file(authkey_file):
+    """
+    Internal function that creates a file, only accessible by the current user, with a new random key
+    :param authkey_file: str
+    """
+
+    authkey_dir = os.path.dirname(authkey_file)
+    if not os.path.isdir(authkey_dir):
+        os.makedirs(authkey_dir)
+
+    try:
+        fd = os.open(authkey_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except OSError:
+        # Key file was created by other process (for example, the daemon and a client started at the same time)
+        if os.path.isfile(authkey_file):
+            return
+        raise
+    try:
+        os.write(fd, binascii.hexlify(os.urandom(AUTHKEY_MIN_LENGTH)))
+    finally:
+        os.close(fd)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
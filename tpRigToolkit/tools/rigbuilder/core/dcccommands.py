@@ -0,0 +1,280 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains DCC command buffer implementation for tpRigToolkit.tools.rigbuilder
+DCC commands that do not return values (attribute sets, locks, connections, parenting, ...) are collected in a buffer
+and sent to the DCC in one batch, inside a single undo chunk
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import sys
+import logging
+import threading
+import contextlib
+from collections import namedtuple, OrderedDict
+
+import six
+
+import tpDcc as tp
+
+from tpRigToolkit.tools.rigbuilder.core import nulldcc
+
+DccCommand = namedtuple('DccCommand', ['name', 'args', 'kwargs'])
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+_local = threading.local()
+
+
+class DccCommandBuffer(object):
+    """
+    Class that collects DCC commands and executes them in order when the buffer is flushed
+    Consecutive lock, hide and unkeyable calls done on the same attribute are merged into a single
+    set_attribute_state command
+    """
+
+    def __init__(self, name='rigbuilder_commands'):
+        super(DccCommandBuffer, self).__init__()
+
+        self._name = name
+        self._commands = list()
+        self._attribute_states = OrderedDict()
+
+    def __len__(self):
+        return len(self._commands)
+
+    @property
+    def name(self):
+        return self._name
+
+    def add(self, name, *args, **kwargs):
+        """
+        Adds a new command into the buffer
+        :param name: str, name of the DCC function to call
+        :param args: list, arguments passed to the DCC function
+        :param kwargs: dict, keyword arguments passed to the DCC function
+        """
+
+        if name != 'set_attribute_state' and self._attribute_states:
+            # Commands that use a node stop merging its attribute states, so later state changes are not executed
+            # before them
+            for key in [key for key in self._attribute_states if key[0] in args]:
+                self._attribute_states.pop(key)
+
+        self._commands.append(DccCommand(name, args, kwargs))
+
+    def get_commands(self):
+        """
+        Returns the commands stored in the buffer
+        :return: list(DccCommand)
+        """
+
+        return list(self._commands)
+
+    def clear(self):
+        """
+        Removes all commands stored in the buffer
+        """
+
+        self._commands = list()
+        self._attribute_states.clear()
+
+    def flush(self):
+        """
+        Executes all commands stored in the buffer and clears it
+        If current DCC implements execute_commands, all commands are sent in a single call. Otherwise, commands are
+        executed one by one inside a single undo chunk
+        :return: int, number of executed commands
+        """
+
+        commands = self._commands
+        self.clear()
+        if not commands:
+            return 0
+
+        execute_commands = getattr(tp.Dcc, 'execute_commands', None)
+        if execute_commands:
+            execute_commands(commands)
+        else:
+            with undo_chunk(self._name):
+                for command in commands:
+                    execute_command(command)
+
+        return len(commands)
+
+    # ================================================================================================
+    # ======================== COMMANDS
+    # ================================================================================================
+
+    def set_attribute_value(self, node, attribute_name, attribute_value):
+        self.add('set_attribute_value', node, attribute_name, attribute_value)
+
+    def add_bool_attribute(self, node, attribute_name, **kwargs):
+        self.add('add_bool_attribute', node, attribute_name, **kwargs)
+
+    def add_float_attribute(self, node, attribute_name, **kwargs):
+        self.add('add_float_attribute', node, attribute_name, **kwargs)
+
+    def add_string_attribute(self, node, attribute_name, default_value='', **kwargs):
+        self.add('add_string_attribute', node, attribute_name, default_value, **kwargs)
+
+    def connect_attribute(self, source_node, source_attribute, target_node, target_attribute):
+        self.add('connect_attribute', source_node, source_attribute, target_node, target_attribute)
+
+    def lock_attribute(self, node, attribute_name):
+        self._set_attribute_state(node, attribute_name, lock=True)
+
+    def unkeyable_attribute(self, node, attribute_name):
+        self._set_attribute_state(node, attribute_name, keyable=False, channel_box=True)
+
+    def hide_attribute(self, node, attribute_name):
+        self._set_attribute_state(node, attribute_name, keyable=False, channel_box=False)
+
+    def hide_node(self, node):
+        self.add('hide_node', node)
+
+    def set_parent(self, node, parent):
+        self.add('set_parent', node, parent)
+
+    def apply_shader(self, shader, node):
+        self.add('apply_shader', shader, node)
+
+    def add_node_to_selection_group(self, node, selection_group_name):
+        self.add('add_node_to_selection_group', node, selection_group_name)
+
+    def reset_transform_attributes(self, node):
+        self.add('reset_transform_attributes', node)
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _set_attribute_state(self, node, attribute_name, **kwargs):
+        """
+        Internal function that updates the lock, keyable and channel box state of the given attribute
+        The first state change of an attribute adds a set_attribute_state command; next ones update that command
+        while no other command that uses the node is added in between
+        :param node: str
+        :param attribute_name: str
+        :param kwargs: dict, lock, keyable and channel_box states
+        """
+
+        key = (node, attribute_name)
+        state = self._attribute_states.get(key, None)
+        if state is None:
+            state = self._attribute_states[key] = dict()
+            self.add('set_attribute_state', node, attribute_name, state)
+        state.update(kwargs)
+
+
+def get_active_buffer():
+    """
+    Returns the command buffer that is active in current thread
+    :return: DccCommandBuffer or None
+    """
+
+    return getattr(_local, 'buffer', None)
+
+
+@contextlib.contextmanager
+def batch(name='rigbuilder_commands'):
+    """
+    Context manager that collects the DCC commands added to the returned buffer and flushes them on exit
+    If a buffer is already active in current thread, that buffer is returned and it is flushed by its owner, so nested
+    batches are sent to the DCC at once. If an exception is raised, the commands buffered until the failure are
+    flushed before raising it, so the scene is left as if the commands were executed immediately
+    :param name: str, name of the undo chunk used to execute the commands
+    :return: DccCommandBuffer
+    """
+
+    active_buffer = get_active_buffer()
+    if active_buffer is not None:
+        yield active_buffer
+        return
+
+    command_buffer = DccCommandBuffer(name=name)
+    _local.buffer = command_buffer
+    try:
+        yield command_buffer
+    except Exception:
+        _local.buffer = None
+        exc_info = sys.exc_info()
+        try:
+            command_buffer.flush()
+        except Exception:
+            LOGGER.exception('Impossible to flush DCC commands buffered before the failure')
+        six.reraise(*exc_info)
+    finally:
+        _local.buffer = None
+
+    command_buffer.flush()
+
+
+@contextlib.contextmanager
+def undo_chunk(name):
+    """
+    Context manager that groups all DCC operations done while active into a single undo step
+    :param name: str
+    """
+
+    if not nulldcc.is_maya():
+        yield
+        return
+
+    import tpDcc.dccs.maya as maya
+    maya.cmds.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        maya.cmds.undoInfo(closeChunk=True)
+
+
+def execute_command(command, dcc=None):
+    """
+    Executes given command in the given DCC
+    :param command: DccCommand
+    :param dcc: object or None, DCC used to execute the command. If not given, current DCC is used
+    """
+
+    dcc = dcc or tp.Dcc
+    if command.name == 'set_attribute_state':
+        _set_attribute_state(dcc, *command.args)
+    else:
+        getattr(dcc, command.name)(*command.args, **command.kwargs)
+
+
+def _set_attribute_state(dcc, node, attribute_name, state):
+    """
+    Internal function that sets the lock, keyable and channel box state of the given attribute
+    Maya sets all the states with a single command, other DCCs use lock, unkeyable and hide DCC functions
+    :param dcc: object
+    :param node: str
+    :param attribute_name: str
+    :param state: dict
+    """
+
+    if tp.is_maya() and not nulldcc.is_null_dcc(dcc):
+        import tpDcc.dccs.maya as maya
+        flags = dict()
+        if 'lock' in state:
+            flags['lock'] = state['lock']
+        if 'keyable' in state:
+            flags['keyable'] = state['keyable']
+        if 'channel_box' in state:
+            flags['channelBox'] = state['channel_box']
+        maya.cmds.setAttr('{}.{}'.format(node, attribute_name), **flags)
+        return
+
+    if state.get('keyable', True) is False:
+        dcc.unkeyable_attribute(node, attribute_name)
+    if state.get('channel_box', True) is False:
+        dcc.hide_attribute(node, attribute_name)
+    if state.get('lock', False):
+        dcc.lock_attribute(node, attribute_name)
@@ -0,0 +1,824 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains null DCC implementation used to run dry-run builds in tpRigToolkit.tools.rigbuilder
+The null DCC implements the DCC functions used by RigBuilder against an in-memory scene graph, so builds can be
+executed without a DCC. The calls done to the DCC can be recorded to measure their count and latency
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+import contextlib
+
+import tpDcc as tp
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+IDENTITY_MATRIX = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+class NodeTypes(object):
+    TRANSFORM = 'transform'
+    JOINT = 'joint'
+    LOCATOR = 'locator'
+    MESH = 'mesh'
+    NURBS_SURFACE = 'nurbsSurface'
+    CLUSTER = 'cluster'
+    CLUSTER_HANDLE = 'clusterHandle'
+    AIM_CONSTRAINT = 'aimConstraint'
+    SURFACE_SHADER = 'surfaceShader'
+    OBJECT_SET = 'objectSet'
+
+    SHAPES = [LOCATOR, MESH, NURBS_SURFACE, CLUSTER_HANDLE]
+
+
+class SceneNode(object):
+    """
+    Class that defines a node of the in-memory scene graph of the null DCC
+    """
+
+    def __init__(self, name, node_type=NodeTypes.TRANSFORM, parent=None):
+        super(SceneNode, self).__init__()
+
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = list()
+        self.attributes = dict()
+        self.connections = dict()
+        self.members = list()
+        self.world_matrix = list(IDENTITY_MATRIX)
+
+    def to_dict(self):
+        """
+        Returns a dictionary with the data of the node
+        :return: dict
+        """
+
+        return {
+            'name': self.name, 'type': self.type, 'parent': self.parent, 'attributes': self.attributes,
+            'connections': self.connections, 'members': self.members, 'world_matrix': self.world_matrix}
+
+    @classmethod
+    def from_dict(cls, node_dict):
+        """
+        Creates a new node from the given dictionary
+        :param node_dict: dict
+        :return: SceneNode
+        """
+
+        node = cls(node_dict['name'], node_type=node_dict.get('type', NodeTypes.TRANSFORM))
+        node.parent = node_dict.get('parent', None)
+        node.attributes = dict(node_dict.get('attributes', dict()))
+        node.connections = dict(node_dict.get('connections', dict()))
+        node.members = list(node_dict.get('members', list()))
+        node.world_matrix = list(node_dict.get('world_matrix', IDENTITY_MATRIX))
+
+        return node
+
+
+class NullProgressBar(object):
+    """
+    Class that implements DCC progress bar interface without showing anything
+    """
+
+    def __init__(self, title='', count=None, begin=True):
+        self._title = title
+        self._count = count
+        self._current = 0
+
+    def inc(self, inc=1):
+        self._current += inc
+
+    def status(self, status_str):
+        pass
+
+    def end(self):
+        pass
+
+    def break_signaled(self):
+        return False
+
+
+class NullDcc(object):
+    """
+    Class that implements the DCC functions used by RigBuilder against an in-memory scene graph
+    Nodes are identified by their short names, full paths (|parent|child) are also accepted. As in DCCs, creating a
+    node with an existing name appends a number to the name of the new node
+    """
+
+    NAME = 'null'
+    EXTENSION = '.json'
+
+    def __init__(self):
+        super(NullDcc, self).__init__()
+
+        self._nodes = dict()
+        self._selection = list()
+        self._scene_name = ''
+        self._change_count = 0
+
+    # ================================================================================================
+    # ======================== GENERAL
+    # ================================================================================================
+
+    def get_name(self):
+        return self.NAME
+
+    def get_version(self):
+        return 0
+
+    def get_extensions(self):
+        return [self.EXTENSION]
+
+    def get_main_window(self):
+        return None
+
+    def get_progress_bar_class(self):
+        return NullProgressBar
+
+    def get_color_of_side(self, side='C', sub_color=False):
+        side = (side or 'C')[0].upper()
+        if side == 'L':
+            return (0.0, 0.0, 1.0) if not sub_color else (0.0, 0.5, 1.0)
+        elif side == 'R':
+            return (1.0, 0.0, 0.0) if not sub_color else (1.0, 0.5, 0.5)
+
+        return (1.0, 1.0, 0.0) if not sub_color else (1.0, 1.0, 0.5)
+
+    def get_mirror_name(self, name, left_side='l', right_side='r'):
+        for source, target in [(left_side, right_side), (right_side, left_side)]:
+            for pattern, replace in [
+                    (r'^{}_'.format(source), '{}_'.format(target)),
+                    (r'_{}_'.format(source), '_{}_'.format(target)),
+                    (r'_{}$'.format(source), '_{}'.format(target))]:
+                mirror_name = re.sub(pattern, replace, name)
+                if mirror_name != name:
+                    return mirror_name
+
+        return name
+
+    def is_batch(self):
+        return True
+
+    def warning(self, message):
+        LOGGER.warning(message)
+
+    def refresh_viewport(self):
+        pass
+
+    def fit_view(self, animation=True):
+        pass
+
+    def enable_undo(self):
+        pass
+
+    def disable_undo(self):
+        pass
+
+    def execute_commands(self, commands):
+        """
+        Executes a batch of buffered DCC commands
+        :param commands: list(dcccommands.DccCommand)
+        """
+
+        for command in commands:
+            getattr(self, command.name)(*command.args, **command.kwargs)
+
+    # ================================================================================================
+    # ======================== SCENE
+    # ================================================================================================
+
+    def new_scene(self, force=True, do_save=True):
+        self._change_count += 1
+        self._nodes.clear()
+        self._selection = list()
+        self._scene_name = ''
+
+    def new_file(self, force=True):
+        self.new_scene(force=force)
+
+    def scene_name(self):
+        return self._scene_name
+
+    def scene_change_count(self):
+        """
+        Returns a counter that is increased every time nodes or attributes are created or deleted in the scene
+        :return: int
+        """
+
+        return self._change_count
+
+    def save_current_scene(self, force=True, path_to_save=None, name_to_save=None, **kwargs):
+        if path_to_save and name_to_save:
+            file_path = os.path.join(path_to_save, '{}{}'.format(name_to_save, self.EXTENSION))
+        else:
+            file_path = path_to_save or self._scene_name
+        if not file_path:
+            raise RuntimeError('Impossible to save scene because no path is defined!')
+
+        with open(file_path, 'w') as fh:
+            json.dump({'nodes': [node.to_dict() for node in self._nodes.values()]}, fh)
+        self._scene_name = file_path
+
+        return file_path
+
+    def export_scene(self, path_to_save, name_to_save):
+        file_path = os.path.join(path_to_save, '{}{}'.format(name_to_save, self.EXTENSION))
+        with open(file_path, 'w') as fh:
+            json.dump({'nodes': [node.to_dict() for node in self._nodes.values()]}, fh)
+
+        return file_path
+
+    def open_file(self, file_path, force=True):
+        self.new_scene(force=force)
+        self.import_file(file_path, force=force)
+        self._scene_name = file_path
+
+    def import_file(self, file_path, force=True):
+        if not os.path.isfile(file_path):
+            raise RuntimeError('File "{}" does not exist!'.format(file_path))
+
+        with open(file_path, 'r') as fh:
+            scene_data = json.load(fh)
+
+        self._change_count += 1
+        for node_dict in scene_data.get('nodes', list()):
+            node = SceneNode.from_dict(node_dict)
+            self._nodes[node.name] = node
+        for node in self._nodes.values():
+            if node.parent in self._nodes and node.name not in self._nodes[node.parent].children:
+                self._nodes[node.parent].children.append(node.name)
+
+    def get_scene_nodes(self):
+        """
+        Returns all the nodes of the in-memory scene graph
+        :return: dict(str, SceneNode)
+        """
+
+        return self._nodes
+
+    # ================================================================================================
+    # ======================== NODES
+    # ================================================================================================
+
+    def object_exists(self, node):
+        return self._get_name(node) in self._nodes
+
+    def delete_object(self, node):
+        scene_node = self._get_node(node)
+        for child in list(scene_node.children):
+            self.delete_object(child)
+        self._set_parent(scene_node, None)
+        self._nodes.pop(scene_node.name)
+        self._change_count += 1
+        if scene_node.name in self._selection:
+            self._selection.remove(scene_node.name)
+
+    def node_type(self, node):
+        return self._get_node(node).type
+
+    def node_short_name(self, node):
+        return self._get_node(node).name
+
+    def node_parent(self, node, full_path=True):
+        parent = self._get_node(node).parent
+        if not parent:
+            return None
+
+        return self._get_path(parent) if full_path else parent
+
+    def node_is_empty(self, node):
+        return not self._get_node(node).children
+
+    def node_is_joint(self, node):
+        return self.object_exists(node) and self._get_node(node).type == NodeTypes.JOINT
+
+    def list_children(self, node, all_hierarchy=False, full_path=True, children_type=None):
+        children = list()
+        for child in self._get_node(node).children:
+            if self._nodes[child].type in NodeTypes.SHAPES:
+                continue
+            if not children_type or self._nodes[child].type == children_type:
+                children.append(self._get_path(child) if full_path else child)
+            if all_hierarchy:
+                children.extend(self.list_children(
+                    child, all_hierarchy=True, full_path=full_path, children_type=children_type))
+
+        return children
+
+    def list_relatives(self, node, all_hierarchy=False, full_path=True, relative_type=None, shapes=False):
+        relatives = list()
+        for child in self._get_node(node).children:
+            if shapes or self._nodes[child].type not in NodeTypes.SHAPES:
+                if not relative_type or self._nodes[child].type == relative_type:
+                    relatives.append(self._get_path(child) if full_path else child)
+            if all_hierarchy:
+                relatives.extend(self.list_relatives(
+                    child, all_hierarchy=True, full_path=full_path, relative_type=relative_type, shapes=shapes))
+
+        return relatives
+
+    def list_shapes(self, node, full_path=True):
+        return [self._get_path(child) if full_path else child for child in self._get_node(node).children
+                if self._nodes[child].type in NodeTypes.SHAPES]
+
+    def all_scene_objects(self, full_path=True):
+        return [self._get_path(name) if full_path else name for name in self._nodes]
+
+    def selected_nodes(self, full_path=True):
+        return [self._get_path(name) if full_path else name for name in self._selection if name in self._nodes]
+
+    def select_object(self, node, replace_selection=True, **kwargs):
+        name = self._get_node(node).name
+        if replace_selection:
+            self._selection = list()
+        if name not in self._selection:
+            self._selection.append(name)
+
+    def clear_selection(self):
+        self._selection = list()
+
+    def hide_node(self, node):
+        self._get_node(node).attributes['visibility'] = False
+
+    def set_parent(self, node, parent, **kwargs):
+        self._set_parent(self._get_node(node), self._get_node(parent) if parent else None)
+
+    def group_node(self, node, group_name, parent=None):
+        scene_node = self._get_node(node)
+        group = self._create_node(group_name, parent=parent or scene_node.parent)
+        self._set_parent(scene_node, self._nodes[group])
+
+        return group
+
+    def create_empty_group(self, name, parent=None):
+        return self._create_node(name, parent=parent)
+
+    def create_joint(self, joint_name='', **kwargs):
+        joint = self._create_node(joint_name or 'joint', node_type=NodeTypes.JOINT)
+        self._nodes[joint].attributes['radius'] = kwargs.get('radius', 1.0)
+
+        return joint
+
+    def create_locator(self, name='locator'):
+        return self._create_node_with_shape(name, NodeTypes.LOCATOR)
+
+    def create_empty_mesh(self, mesh_name='mesh'):
+        return self._create_node_with_shape(mesh_name, NodeTypes.MESH)
+
+    def create_nurbs_sphere(self, name='nurbsSphere', **kwargs):
+        return self._create_node_with_shape(name, NodeTypes.NURBS_SURFACE)
+
+    def create_nurbs_cylinder(self, name='nurbsCylinder', **kwargs):
+        return self._create_node_with_shape(name, NodeTypes.NURBS_SURFACE)
+
+    def convert_surface_to_bezier(self, surface, **kwargs):
+        self._get_node(surface)
+
+    def create_cluster(self, objects, cluster_name='cluster', **kwargs):
+        nodes = objects if isinstance(objects, (list, tuple)) else [objects]
+        cluster = self._create_node(cluster_name, node_type=NodeTypes.CLUSTER)
+        self._nodes[cluster].members = [self._get_node(node).name for node in nodes]
+        handle = self._create_node_with_shape('{}Handle'.format(cluster_name), NodeTypes.CLUSTER_HANDLE)
+
+        return cluster, handle
+
+    def create_aim_constraint(self, source, target, **kwargs):
+        target_node = self._get_node(target)
+        constraint = self._create_node(
+            '{}_aimConstraint1'.format(target_node.name), node_type=NodeTypes.AIM_CONSTRAINT, parent=target_node.name)
+        self._nodes[constraint].members = [self._get_node(source).name]
+
+        return constraint
+
+    def create_surface_shader(self, shader_name, **kwargs):
+        shader = self._create_node(shader_name, node_type=NodeTypes.SURFACE_SHADER)
+        self._create_node('{}SG'.format(shader), node_type=NodeTypes.OBJECT_SET)
+
+        return shader
+
+    def apply_shader(self, shader, node):
+        shader_name = self._get_name(shader)
+        shading_group = shader_name if shader_name.endswith('SG') else '{}SG'.format(shader_name)
+        if shading_group not in self._nodes:
+            self._create_node(shading_group, node_type=NodeTypes.OBJECT_SET)
+        self._add_members(shading_group, [node])
+
+    def create_selection_group(self, name, empty=True):
+        return self._create_node(name, node_type=NodeTypes.OBJECT_SET)
+
+    def add_node_to_selection_group(self, node, selection_group_name):
+        self._add_members(selection_group_name, [node])
+
+    def list_selection_group_members(self, selection_group_name):
+        return list(self._get_node(selection_group_name).members)
+
+    # ================================================================================================
+    # ======================== TRANSFORMS
+    # ================================================================================================
+
+    def node_world_matrix(self, node):
+        return list(self._get_node(node).world_matrix)
+
+    def set_node_world_matrix(self, node, world_matrix):
+        self._get_node(node).world_matrix = list(world_matrix)
+
+    def translate_node_in_world_space(self, node, translation_list, relative=False):
+        self._transform_node(node, 'translate', translation_list, relative)
+
+    def translate_node_in_object_space(self, node, translation_list, relative=False):
+        self._transform_node(node, 'translate', translation_list, relative)
+
+    def rotate_node_in_world_space(self, node, rotation_list, relative=False):
+        self._transform_node(node, 'rotate', rotation_list, relative)
+
+    def scale_node_in_object_space(self, node, scale_list, relative=False):
+        self._transform_node(node, 'scale', scale_list, relative, default=1.0)
+
+    def move_pivot_to_zero(self, node):
+        self._get_node(node)
+
+    def freeze_transforms(self, node, **kwargs):
+        self.reset_transform_attributes(node)
+
+    def reset_transform_attributes(self, node):
+        attributes = self._get_node(node).attributes
+        for axis in 'XYZ':
+            attributes['translate{}'.format(axis)] = 0.0
+            attributes['rotate{}'.format(axis)] = 0.0
+            attributes['scale{}'.format(axis)] = 1.0
+
+    # ================================================================================================
+    # ======================== ATTRIBUTES
+    # ================================================================================================
+
+    def attribute_exists(self, node, attribute_name):
+        return self.object_exists(node) and attribute_name in self._get_node(node).attributes
+
+    def list_nodes_with_attribute(self, attribute_name, full_path=True):
+        return [self._get_path(name) if full_path else name
+                for name, scene_node in self._nodes.items() if attribute_name in scene_node.attributes]
+
+    def get_attribute_value(self, node, attribute_name):
+        attributes = self._get_node(node).attributes
+        if attribute_name not in attributes:
+            raise RuntimeError('Attribute "{}.{}" does not exist!'.format(node, attribute_name))
+
+        return attributes[attribute_name]
+
+    def set_attribute_value(self, node, attribute_name, attribute_value, **kwargs):
+        self._get_node(node).attributes[attribute_name] = attribute_value
+
+    def add_bool_attribute(self, node, attribute_name, default_value=False, **kwargs):
+        self._add_attribute(node, attribute_name, bool(default_value), **kwargs)
+
+    def add_float_attribute(self, node, attribute_name, default_value=0.0, **kwargs):
+        self._add_attribute(node, attribute_name, float(default_value), **kwargs)
+
+    def add_string_attribute(self, node, attribute_name, default_value='', **kwargs):
+        self._add_attribute(node, attribute_name, default_value, **kwargs)
+
+    def lock_attribute(self, node, attribute_name):
+        self._get_node(node)
+
+    def unkeyable_attribute(self, node, attribute_name):
+        self._get_node(node)
+
+    def hide_attribute(self, node, attribute_name):
+        self._get_node(node)
+
+    def set_attribute_state(self, node, attribute_name, state):
+        self._get_node(node)
+
+    def connect_attribute(self, source_node, source_attribute, target_node, target_attribute, **kwargs):
+        source = '{}.{}'.format(self._get_node(source_node).name, source_attribute)
+        self._get_node(target_node).connections[target_attribute] = source
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _get_name(self, node):
+        """
+        Internal function that returns the short name of the given node
+        Components (node.cv[0]) and full paths (|parent|node) are resolved to the name of their node
+        :param node: str
+        :return: str
+        """
+
+        return str(node).split('.')[0].split('|')[-1]
+
+    def _get_node(self, node):
+        """
+        Internal function that returns the scene node with the given name
+        :param node: str
+        :return: SceneNode
+        """
+
+        name = self._get_name(node)
+        if name not in self._nodes:
+            raise RuntimeError('Node "{}" does not exist!'.format(node))
+
+        return self._nodes[name]
+
+    def _get_path(self, name):
+        """
+        Internal function that returns the full path of the node with the given name
+        :param name: str
+        :return: str
+        """
+
+        path = list()
+        while name:
+            path.append(name)
+            name = self._nodes[name].parent
+
+        return '|' + '|'.join(reversed(path))
+
+    def _create_node(self, name, node_type=NodeTypes.TRANSFORM, parent=None):
+        """
+        Internal function that creates a new node in the scene graph
+        If a node with the same name already exists, a number is appended to the name of the new node
+        :param name: str
+        :param node_type: str
+        :param parent: str or None
+        :return: str, name of the new node
+        """
+
+        unique_name = name
+        index = 1
+        while unique_name in self._nodes:
+            unique_name = '{}{}'.format(re.sub(r'\d+$', '', name), index)
+            index += 1
+
+        scene_node = SceneNode(unique_name, node_type=node_type)
+        self._nodes[unique_name] = scene_node
+        self._change_count += 1
+        if parent:
+            self._set_parent(scene_node, self._get_node(parent))
+
+        return unique_name
+
+    def _create_node_with_shape(self, name, shape_type):
+        """
+        Internal function that creates a new transform node with a shape node of the given type
+        :param name: str
+        :param shape_type: str
+        :return: str, name of the new transform node
+        """
+
+        transform = self._create_node(name)
+        self._create_node('{}Shape'.format(transform), node_type=shape_type, parent=transform)
+
+        return transform
+
+    def _set_parent(self, scene_node, parent_node):
+        """
+        Internal function that sets the parent of the given node
+        :param scene_node: SceneNode
+        :param parent_node: SceneNode or None
+        """
+
+        if scene_node.parent in self._nodes:
+            siblings = self._nodes[scene_node.parent].children
+            if scene_node.name in siblings:
+                siblings.remove(scene_node.name)
+
+        scene_node.parent = parent_node.name if parent_node else None
+        if parent_node:
+            parent_node.children.append(scene_node.name)
+
+    def _add_members(self, selection_group_name, nodes):
+        """
+        Internal function that adds given nodes into a selection group
+        :param selection_group_name: str
+        :param nodes: list(str)
+        """
+
+        members = self._get_node(selection_group_name).members
+        for node in nodes:
+            name = self._get_node(node).name
+            if name not in members:
+                members.append(name)
+
+    def _add_attribute(self, node, attribute_name, default_value, **kwargs):
+        """
+        Internal function that adds a new attribute to the given node
+        :param node: str
+        :param attribute_name: str
+        :param default_value: object
+        """
+
+        attributes = self._get_node(node).attributes
+        if attribute_name in attributes:
+            raise RuntimeError('Attribute "{}.{}" already exists!'.format(node, attribute_name))
+        attributes[attribute_name] = default_value
+        self._change_count += 1
+
+    def _transform_node(self, node, attribute_name, values, relative, default=0.0):
+        """
+        Internal function that updates the transform attributes of the given node
+        :param node: str
+        :param attribute_name: str, translate, rotate or scale
+        :param values: list(float)
+        :param relative: bool
+        :param default: float, value of the attribute when it is not set yet
+        """
+
+        attributes = self._get_node(node).attributes
+        for axis, value in zip('XYZ', values):
+            axis_attribute = '{}{}'.format(attribute_name, axis)
+            if relative:
+                if attribute_name == 'scale':
+                    value = attributes.get(axis_attribute, default) * value
+                else:
+                    value = attributes.get(axis_attribute, default) + value
+            attributes[axis_attribute] = value
+
+
+class DccRecorder(object):
+    """
+    Class that wraps a DCC and records the number of calls and the time spent in each one of its functions
+    DCC functions that are not implemented by the wrapped DCC are recorded as missing and do nothing, so dry-run
+    builds can report all the DCC functions they need
+    """
+
+    def __init__(self, dcc):
+        super(DccRecorder, self).__init__()
+
+        self._dcc = dcc
+        self._calls = dict()
+        self._missing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def dcc(self):
+        return self._dcc
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        fn = getattr(self._dcc, name, None)
+        if fn is None or not callable(fn):
+            with self._lock:
+                self._missing.add(name)
+            fn = None
+
+        def _recorded(*args, **kwargs):
+            start_time = time.time()
+            try:
+                return fn(*args, **kwargs) if fn else None
+            finally:
+                self._record(name, time.time() - start_time)
+
+        return _recorded
+
+    def execute_commands(self, commands):
+        """
+        Executes a batch of buffered DCC commands
+        If the wrapped DCC executes batches, the batch is recorded as a single call and the commands it contains are
+        only counted. Otherwise, commands are executed and recorded one by one
+        :param commands: list(dcccommands.DccCommand)
+        """
+
+        from tpRigToolkit.tools.rigbuilder.core import dcccommands
+
+        execute_commands = getattr(self._dcc, 'execute_commands', None)
+        if not execute_commands:
+            with dcccommands.undo_chunk('rigbuilder_commands'):
+                for command in commands:
+                    dcccommands.execute_command(command, dcc=self)
+            return
+
+        start_time = time.time()
+        try:
+            execute_commands(commands)
+        finally:
+            self._record('execute_commands', time.time() - start_time)
+            with self._lock:
+                for command in commands:
+                    call = self._calls.setdefault(command.name, {'count': 0, 'time': 0.0})
+                    call['count'] += 1
+
+    def get_stats(self):
+        """
+        Returns the number of calls and total time of each DCC function, sorted from the most expensive to the
+        cheapest one
+        :return: list(dict)
+        """
+
+        with self._lock:
+            stats = [dict(name=name, **call) for name, call in self._calls.items()]
+            missing = self._missing
+        for stat in stats:
+            stat['missing'] = stat['name'] in missing
+
+        return sorted(stats, key=lambda stat: stat['time'], reverse=True)
+
+    def get_missing(self):
+        """
+        Returns the names of the called functions that are not implemented by the wrapped DCC
+        :return: list(str)
+        """
+
+        with self._lock:
+            return sorted(self._missing)
+
+    def format_stats(self, limit=None):
+        """
+        Returns a table with the recorded DCC calls
+        :param limit: int or None, maximum number of functions to include
+        :return: str
+        """
+
+        stats = self.get_stats()
+        name_width = max([len(stat['name']) for stat in stats] + [8])
+        lines = ['{}  {:>10}  {:>10}  {:>12}'.format('function'.ljust(name_width), 'calls', 'seconds', 'usec/call')]
+        for stat in stats[:limit]:
+            lines.append('{}  {:>10}  {:>10.3f}  {:>12.2f}{}'.format(
+                stat['name'].ljust(name_width), stat['count'], stat['time'],
+                stat['time'] / stat['count'] * 1000000.0, '  (missing)' if stat['missing'] else ''))
+
+        return '\n'.join(lines)
+
+    def reset(self):
+        """
+        Clears recorded calls
+        """
+
+        with self._lock:
+            self._calls.clear()
+            self._missing.clear()
+
+    def _record(self, name, duration):
+        """
+        Internal function that records a call to a DCC function
+        :param name: str
+        :param duration: float
+        """
+
+        with self._lock:
+            call = self._calls.get(name, None)
+            if not call:
+                call = self._calls[name] = {'count': 0, 'time': 0.0}
+            call['count'] += 1
+            call['time'] += duration
+
+
+def is_null_dcc(dcc=None):
+    """
+    Returns whether or not the given DCC is a null DCC (or a recorder that wraps one)
+    :param dcc: object or None, DCC to check. If not given, current DCC is checked
+    :return: bool
+    """
+
+    dcc = tp.Dcc if dcc is None else dcc
+    if isinstance(dcc, DccRecorder):
+        dcc = dcc.dcc
+
+    return isinstance(dcc, NullDcc)
+
+
+def is_maya():
+    """
+    Returns whether or not Maya is the DCC used by RigBuilder. Returns False while a null DCC replaces it, so Maya
+    commands are not executed during dry-run builds
+    :return: bool
+    """
+
+    return tp.is_maya() and not is_null_dcc()
+
+
+@contextlib.contextmanager
+def use_dcc(dcc=None):
+    """
+    Context manager that replaces the DCC used by RigBuilder while it is active
+    :param dcc: DccRecorder, NullDcc or None. If not given, a new recorded null DCC is used
+    :return: DccRecorder
+    """
+
+    if dcc is None:
+        dcc = DccRecorder(NullDcc())
+    elif not isinstance(dcc, DccRecorder):
+        dcc = DccRecorder(dcc)
+
+    orig_dcc = getattr(tp, 'Dcc', None)
+    tp.Dcc = dcc
+    try:
+        yield dcc
+    finally:
+        tp.Dcc = orig_dcc
@@ -0,0 +1,411 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains option store implementation for tpRigToolkit.tools.rigbuilder
+Options files are loaded once and their values are served from memory. While an option session is active (for
+example, during a build) writes are kept in memory and they are flushed to disk when the session finishes
+Cached files are evicted when the project or the rig changes, so the cache only holds the files of the current rig
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import json
+import logging
+import tempfile
+import threading
+import contextlib
+from collections import OrderedDict
+
+from tpDcc.libs.python import settings
+
+from tpRigToolkit.tools.rigbuilder.core import ownwrites
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+_REMOVED = object()
+
+_lock = threading.RLock()
+_files = dict()
+_session_depth = [0]
+
+
+class OptionFile(object):
+    """
+    Class that stores in memory the contents of an options file
+    Changed keys are tracked, so when the file is flushed only those keys are applied over the contents of the file
+    in disk, keeping the changes other processes did to the rest of keys
+    """
+
+    def __init__(self, file_path):
+        super(OptionFile, self).__init__()
+
+        self._file_path = file_path
+        self._mtime = None
+        self.evicted = False
+        self.data = OrderedDict()
+        self.order = list()
+        self.dirty = OrderedDict()
+
+    @property
+    def file_path(self):
+        return self._file_path
+
+    def load(self):
+        """
+        Loads the contents of the file. If the file does not exist, it is created
+        """
+
+        if not os.path.isfile(self._file_path):
+            self._write(OrderedDict())
+        data = self._read()
+
+        self.data.clear()
+        self.data.update(data)
+        self.order[:] = list(data.keys())
+        self.dirty.clear()
+        self._mtime = self._get_mtime()
+
+    def is_stale(self):
+        """
+        Returns whether or not the file changed in disk since it was loaded
+        Files with changes that are not flushed yet are never stale
+        :return: bool
+        """
+
+        return not self.dirty and self._mtime != self._get_mtime()
+
+    def set(self, name, value):
+        """
+        Sets the value of the given key
+        :param name: str
+        :param value: object
+        """
+
+        self.data[name] = value
+        if name not in self.order:
+            self.order.append(name)
+        self.dirty[name] = value
+
+    def clear(self):
+        """
+        Removes all keys of the file
+        """
+
+        for name in self.order:
+            self.dirty[name] = _REMOVED
+        self.data.clear()
+        self.order[:] = list()
+
+    def flush(self):
+        """
+        Writes the changed keys into the file in disk. The file is replaced atomically
+        :return: bool, True if the file was written; False otherwise
+        """
+
+        if not self.dirty:
+            return False
+
+        data = self._read() if os.path.isfile(self._file_path) else OrderedDict()
+        for name, value in self.dirty.items():
+            if value is _REMOVED:
+                data.pop(name, None)
+            else:
+                data[name] = value
+        self._write(data)
+
+        self.dirty.clear()
+        self._mtime = self._get_mtime()
+
+        return True
+
+    def _get_mtime(self):
+        """
+        Internal function that returns the modification time of the file
+        :return: float or None
+        """
+
+        try:
+            return os.stat(self._file_path).st_mtime
+        except OSError:
+            return None
+
+    def _read(self):
+        """
+        Internal function that returns the contents of the file in disk
+        :return: OrderedDict
+        """
+
+        try:
+            with open(self._file_path, 'r') as fh:
+                return json.load(fh, object_pairs_hook=OrderedDict) or OrderedDict()
+        except (IOError, OSError, ValueError) as exc:
+            LOGGER.warning('Impossible to read options file "{}": {}'.format(self._file_path, exc))
+            return OrderedDict()
+
+    def _write(self, data):
+        """
+        Internal function that writes given data into a temporary file that replaces the file in disk
+        The write is recorded as done by the tool, so file watchers do not refresh the UI because of it
+        :param data: dict
+        """
+
+        directory = os.path.dirname(self._file_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        file_handle, temp_path = tempfile.mkstemp(dir=directory or None, suffix='.tmp')
+        try:
+            with os.fdopen(file_handle, 'w') as fh:
+                json.dump(data, fh, indent=4)
+            replace = getattr(os, 'replace', None)
+            if replace:
+                replace(temp_path, self._file_path)
+            else:
+                if os.path.isfile(self._file_path):
+                    os.remove(self._file_path)
+                os.rename(temp_path, self._file_path)
+        except Exception:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
+
+        ownwrites.record(self._file_path)
+
+
+class OptionStore(settings.JSONSettings, object):
+    """
+    Class that replaces JSONSettings for options files
+    All the stores that point to the same file share the same in memory contents
+    """
+
+    def __init__(self):
+        super(OptionStore, self).__init__()
+
+        self._option_file = None
+
+    def set_directory(self, directory, filename='options.json'):
+        """
+        Sets the options file of the store
+        :param directory: str
+        :param filename: str
+        """
+
+        self.directory = directory
+        self.filename = filename
+        self.file_path = os.path.join(directory, filename).replace('\\', '/')
+        self._set_option_file(get_option_file(self.file_path))
+
+    def get_file(self):
+        return self.file_path
+
+    def has_settings(self):
+        option_file = self._get_option_file()
+        return bool(option_file and option_file.data)
+
+    def has_setting(self, name):
+        option_file = self._get_option_file()
+        return bool(option_file) and name in option_file.data
+
+    def get(self, name, default_value=None):
+        option_file = self._get_option_file()
+        if not option_file:
+            return default_value
+
+        return option_file.data.get(name, default_value)
+
+    def get_settings(self):
+        option_file = self._get_option_file()
+        if not option_file:
+            return list()
+
+        return [(name, option_file.data[name]) for name in option_file.order]
+
+    def set(self, name, value):
+        option_file = self._get_option_file()
+        if not option_file:
+            return
+
+        with _lock:
+            option_file.set(name, value)
+            if not is_session_active():
+                option_file.flush()
+
+    def clear(self):
+        option_file = self._get_option_file()
+        if not option_file:
+            return
+
+        with _lock:
+            option_file.clear()
+            if not is_session_active():
+                option_file.flush()
+
+    def reload(self):
+        """
+        Loads again the contents of the options file from disk. Changes not flushed yet are lost
+        """
+
+        option_file = self._get_option_file()
+        if not option_file:
+            return
+
+        with _lock:
+            option_file.load()
+
+    def flush(self):
+        """
+        Writes the changes of the options file into disk
+        :return: bool, True if the file was written; False otherwise
+        """
+
+        option_file = self._get_option_file()
+        if not option_file:
+            return False
+
+        with _lock:
+            return option_file.flush()
+
+    def _get_option_file(self):
+        """
+        Internal function that returns the options file of the store
+        If the file was evicted from the cache, the store is linked to the cached contents of the file again
+        :return: OptionFile or None
+        """
+
+        if self._option_file is not None and self._option_file.evicted:
+            self._set_option_file(get_option_file(self.file_path))
+
+        return self._option_file
+
+    def _set_option_file(self, option_file):
+        """
+        Internal function that links the store to the given options file
+        :param option_file: OptionFile
+        """
+
+        self._option_file = option_file
+        self.settings_dict = option_file.data
+        self.settings_order = option_file.order
+
+
+def get_option_file(file_path):
+    """
+    Returns the in memory contents of the given options file, loading them if necessary
+    Outside of option sessions files are loaded again if they changed in disk
+    :param file_path: str
+    :return: OptionFile
+    """
+
+    with _lock:
+        option_file = _files.get(file_path, None)
+        if option_file is None:
+            option_file = _files[file_path] = OptionFile(file_path)
+            option_file.load()
+        elif not is_session_active() and option_file.is_stale():
+            option_file.load()
+
+    return option_file
+
+
+def is_session_active():
+    """
+    Returns whether or not an option session is active
+    :return: bool
+    """
+
+    return _session_depth[0] > 0
+
+
+@contextlib.contextmanager
+def session():
+    """
+    Context manager that keeps the options files written while active in memory and flushes them on exit
+    When the outermost session starts, cached files that changed in disk are loaded again. While active, options files
+    are loaded only once, even if they change in disk
+    """
+
+    with _lock:
+        if not _session_depth[0]:
+            for option_file in list(_files.values()):
+                if option_file.is_stale():
+                    option_file.load()
+        _session_depth[0] += 1
+    try:
+        yield
+    finally:
+        with _lock:
+            _session_depth[0] -= 1
+            if not _session_depth[0]:
+                flush()
+
+
+def flush():
+    """
+    Writes all the options files with changes into disk
+    :return: int, number of written files
+    """
+
+    written = 0
+    with _lock:
+        for option_file in list(_files.values()):
+            try:
+                written += int(option_file.flush())
+            except Exception as exc:
+                LOGGER.error('Impossible to write options file "{}": {}'.format(option_file.file_path, exc))
+
+    return written
+
+
+def invalidate(file_path=None):
+    """
+    Loads again the given options file from disk, discarding the changes that were not flushed
+    Used when options files are edited outside of option stores (for example, by the options UI)
+    :param file_path: str or None, if not given, all the options files are loaded again
+    """
+
+    with _lock:
+        if file_path is None:
+            option_files = list(_files.values())
+        else:
+            option_files = [_files.get(file_path.replace('\\', '/'), None)]
+        for option_file in option_files:
+            if option_file:
+                option_file.load()
+
+
+def evict(directory=None):
+    """
+    Removes from the cache the options files that are not located in the given directory
+    Changes not flushed yet are written into disk before removing the files. Files are not evicted while an option
+    session is active
+    :param directory: str or None, directory whose files are kept in the cache. If not given, all files are removed
+    :return: int, number of evicted files
+    """
+
+    if directory:
+        directory = directory.replace('\\', '/').rstrip('/') + '/'
+
+    evicted = 0
+    with _lock:
+        if is_session_active():
+            return evicted
+        for file_path, option_file in list(_files.items()):
+            if directory and file_path.startswith(directory):
+                continue
+            try:
+                option_file.flush()
+            except Exception as exc:
+                LOGGER.error('Impossible to write options file "{}": {}'.format(file_path, exc))
+                continue
+            option_file.evicted = True
+            _files.pop(file_path)
+            evicted += 1
+
+    return evicted
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that keeps track of the files written by tpRigToolkit.tools.rigbuilder
+File watchers use it to ignore the changes done by the tool itself (for example, when manifest states are toggled or
+when options files are flushed), so only changes done by other users or processes refresh the UI
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import threading
+
+_lock = threading.Lock()
+_writes = dict()
+
+
+def record(file_path):
+    """
+    Stores the current state of the given file as written by the tool
+    Must be called after the file is written
+    :param file_path: str
+    """
+
+    try:
+        file_stat = os.lstat(file_path)
+    except (OSError, TypeError):
+        return
+
+    with _lock:
+        _writes[_clean_path(file_path)] = (file_stat.st_ino, file_stat.st_mtime, file_stat.st_size)
+
+
+def is_own_write(file_path, inode, mtime, size):
+    """
+    Returns whether or not the given state of the file is the one the tool left after writing it
+    If the file is written again by other process, its state changes and the write is not considered an own one
+    :param file_path: str
+    :param inode: int
+    :param mtime: float
+    :param size: int
+    :return: bool
+    """
+
+    with _lock:
+        return _writes.get(_clean_path(file_path), None) == (inode, mtime, size)
+
+
+def clear():
+    """
+    Forgets all the writes done by the tool
+    """
+
+    with _lock:
+        _writes.clear()
+
+
+def _clean_path(file_path):
+    """
+    Internal function that returns given path with forward slashes
+    :param file_path: str
+    :return: str
+    """
+
+    return file_path.replace('\\', '/')
@@ -4,6 +4,7 @@ from tpDcc.libs.python import yamlio
 from tpDcc.libs.qt.widgets import project
 from tpDcc.libs.nameit.core import namelib
 
+from tpRigToolkit.tools.rigbuilder.core import rigindex
 from tpRigToolkit.tools.rigbuilder.objects import helpers
 
 
@@ -16,6 +17,9 @@ class RigBuilderProject(project.Project, object):
         self._naming_lib = namelib.NameLib(naming_file=naming_file)
         self._naming_lib.init_naming_data()
 
+        # Registers the rig index of the project, so rigs located inside the project are found using it
+        self.get_rig_index()
+
     @property
     def naming_lib(self):
 
@@ -57,25 +61,31 @@ class RigBuilderProject(project.Project, object):
         :return: list(Rig)
         """
 
-        all_rig_paths = helpers.RigHelpers.find_rigs(self.full_path, as_full_path=True)
+        all_rig_paths = self.get_rig_index().find_rigs(self.full_path)
         all_rigs = [helpers.RigHelpers.get_rig(rig_path) for rig_path in all_rig_paths]
 
         return all_rigs
 
     def find_rig(self, rig_name):
         """
-        Tries to find a rig inside current project
+        Tries to find a rig located directly under current project folder
         :param rig_name: str
         :return: Rig
         """
 
-        all_rigs = helpers.RigHelpers.find_rigs(self.full_path, as_full_path=True)
-        for rig_path in all_rigs:
-            if os.path.basename(rig_path) == rig_name:
-                rig = helpers.RigHelpers.get_rig(rig_path)
-                return rig
+        rig_path = self.get_rig_index().find_rig(rig_name)
+        if not rig_path:
+            return None
+
+        return helpers.RigHelpers.get_rig(rig_path)
+
+    def get_rig_index(self):
+        """
+        Returns the index of the rigs located inside current project
+        :return: RigIndex
+        """
 
-        return None
+        return rigindex.RigIndex.get(self.full_path)
 
     def _create_default_naming(self):
         naming_file = self.get_naming_file()
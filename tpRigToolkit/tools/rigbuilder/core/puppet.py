@@ -8,6 +8,8 @@ Module that contains core puppet implementation for RigBuilder
 from __future__ import print_function, division, absolute_import
 
 import os
+import logging
+from collections import OrderedDict
 
 import tpDcc as tp
 from tpDcc.libs.python import yamlio, path as path_utils
@@ -15,9 +17,11 @@ from tpDcc.libs.qt.core import qtutils
 
 from tpRigToolkit.tools.rigbuilder import __version__
 from tpRigToolkit.tools.rigbuilder import puppeteer
-from tpRigToolkit.tools.rigbuilder.core import consts
+from tpRigToolkit.tools.rigbuilder.core import consts, dcccommands, nulldcc
 from tpRigToolkit.libs.controlrig.core import controllib
 
+LOGGER = logging.getLogger('tpRigToolkit')
+
 
 class Puppet(object):
     def __init__(self, name='puppet'):
@@ -54,12 +58,10 @@ class Puppet(object):
 
         self._exists = True
 
-        all_scene_nodes = tp.Dcc.all_scene_objects()
-        for node in all_scene_nodes:
-            if tp.Dcc.attribute_exists(node, consts.PUPPET_NODE_TYPE_ATTR):
-                if tp.Dcc.get_attribute_value(node, consts.PUPPET_NODE_TYPE_ATTR) == consts.PUPPET_TYPE:
-                    self._name = tp.Dcc.get_attribute_value(node, consts.PUPPET_NAME_ATTR)
-                    break
+        for node, node_type in get_scene_index().get_nodes(consts.PUPPET_NODE_TYPE_ATTR).items():
+            if node_type == consts.PUPPET_TYPE:
+                self._name = tp.Dcc.get_attribute_value(node, consts.PUPPET_NAME_ATTR)
+                break
 
         parts_folder = tp.Dcc.list_relatives(consts.PUPPET_PARTS_GROUP, all_hierarchy=True) or list()
         for module_folder in parts_folder:
@@ -70,31 +72,34 @@ class Puppet(object):
         Creates current puppet in DCC scene
         """
 
-        root_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_MAIN_GROUP)
-        tp.Dcc.add_string_attribute(root_grp, consts.PUPPET_NODE_TYPE_ATTR, consts.PUPPET_RIG_TYPE_ATTR)
-        tp.Dcc.add_string_attribute(root_grp, consts.PUPPET_NAME_ATTR, self._name)
-        tp.Dcc.add_string_attribute(root_grp, consts.PUPPET_VERSION_ATTR, str(__version__.__version__), lock=True)
-        tp.Dcc.add_float_attribute(root_grp, consts.PUPPET_RIG_GUIDES_SIZE_ATTR, lock=True)
-        tp.Dcc.add_float_attribute(root_grp, consts.PUPPET_RIG_JOINTS_SIZE_ATTR, lock=True)
-
-        rig_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_RIG_GROUP, parent=root_grp)
-        geo_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_GEO_GROUP, parent=rig_grp)
-        parts_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_PARTS_GROUP, parent=rig_grp)
-        skeleton_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_SKELETON_GROUP, parent=rig_grp)
-        tp.Dcc.set_attribute_value(skeleton_grp, 'overrideEnabled', True)
-        tp.Dcc.set_attribute_value(skeleton_grp, 'overrideColor', 29)
-        tp.Dcc.set_attribute_value(skeleton_grp, 'template', True)
-        twists_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_TWISTS_GROUP, parent=rig_grp)
-
-        tp.Dcc.clear_selection()
-
-        tp.Dcc.create_selection_group(consts.PUPPET_CONTROL_SET)
-        tp.Dcc.create_selection_group(consts.PUPPET_MAIN_SET)
-        tp.Dcc.create_selection_group(consts.PUPPET_SKIN_JOINTS_SETS)
-        tp.Dcc.create_selection_group(consts.PUPPET_MODULES_SET)
-        tp.Dcc.add_node_to_selection_group(consts.PUPPET_SKIN_JOINTS_SETS, consts.PUPPET_MAIN_SET)
-        tp.Dcc.add_node_to_selection_group(consts.PUPPET_MODULES_SET, consts.PUPPET_MAIN_SET)
-
+        with dcccommands.batch('create_puppet') as commands:
+            root_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_MAIN_GROUP)
+            commands.add_string_attribute(root_grp, consts.PUPPET_NODE_TYPE_ATTR, consts.PUPPET_RIG_TYPE_ATTR)
+            commands.add_string_attribute(root_grp, consts.PUPPET_NAME_ATTR, self._name)
+            commands.add_string_attribute(
+                root_grp, consts.PUPPET_VERSION_ATTR, str(__version__.__version__), lock=True)
+            commands.add_float_attribute(root_grp, consts.PUPPET_RIG_GUIDES_SIZE_ATTR, lock=True)
+            commands.add_float_attribute(root_grp, consts.PUPPET_RIG_JOINTS_SIZE_ATTR, lock=True)
+
+            rig_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_RIG_GROUP, parent=root_grp)
+            geo_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_GEO_GROUP, parent=rig_grp)
+            parts_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_PARTS_GROUP, parent=rig_grp)
+            skeleton_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_SKELETON_GROUP, parent=rig_grp)
+            commands.set_attribute_value(skeleton_grp, 'overrideEnabled', True)
+            commands.set_attribute_value(skeleton_grp, 'overrideColor', 29)
+            commands.set_attribute_value(skeleton_grp, 'template', True)
+            twists_grp = tp.Dcc.create_empty_group(name=consts.PUPPET_TWISTS_GROUP, parent=rig_grp)
+
+            tp.Dcc.clear_selection()
+
+            tp.Dcc.create_selection_group(consts.PUPPET_CONTROL_SET)
+            tp.Dcc.create_selection_group(consts.PUPPET_MAIN_SET)
+            tp.Dcc.create_selection_group(consts.PUPPET_SKIN_JOINTS_SETS)
+            tp.Dcc.create_selection_group(consts.PUPPET_MODULES_SET)
+            commands.add_node_to_selection_group(consts.PUPPET_SKIN_JOINTS_SETS, consts.PUPPET_MAIN_SET)
+            commands.add_node_to_selection_group(consts.PUPPET_MODULES_SET, consts.PUPPET_MAIN_SET)
+
+        get_scene_index().invalidate()
         self._exists = True
 
     def delete(self):
@@ -106,15 +111,17 @@ class Puppet(object):
             part = self._parts[part_name]
             part.delete()
 
+        part_nodes = list(get_scene_index().get_nodes(consts.PUPPET_PART_NAME_ATTR).keys())
         tp.Dcc.delete_object(consts.PUPPET_MAIN_GROUP)
-        all_scene_nodes = tp.Dcc.all_scene_objects()
-        for node in all_scene_nodes:
-            if tp.Dcc.attribute_exists(node, consts.PUPPET_PART_NAME_ATTR):
+        for node in part_nodes:
+            if tp.Dcc.object_exists(node):
                 tp.Dcc.delete_object(node)
 
         if tp.Dcc.object_exists(consts.PUPPET_MAIN_SET):
             tp.Dcc.delete_object(consts.PUPPET_MAIN_SET)
 
+        get_scene_index().invalidate()
+
         self._exists = False
         self._part_names = list()
         self._parts = dict()
@@ -157,6 +164,183 @@ class PuppetPart(object):
             options = dict()
 
 
+class PuppetSceneIndex(object):
+    """
+    Class that locates the puppet nodes of the current DCC scene without iterating all the nodes of the scene
+    Puppet nodes are tagged with attributes (node type, part name, ...). Tagged nodes are found with a DCC query and
+    through the puppet selection sets in DCCs that cannot query them (the whole scene is checked if no tagged node is
+    found in those sets). Results are cached until the scene changes: Maya scene callbacks (new, open, import,
+    references and created or deleted nodes) or the scene change counter of the DCC are used to detect changes. If
+    the DCC cannot notify changes, nodes are not cached. Puppet functions invalidate the index every time they tag
+    existing nodes
+    """
+
+    MAYA_SCENE_MESSAGES = (
+        'kAfterNew', 'kAfterOpen', 'kAfterImport', 'kAfterCreateReference', 'kAfterLoadReference',
+        'kAfterRemoveReference', 'kAfterUnloadReference')
+
+    def __init__(self):
+        super(PuppetSceneIndex, self).__init__()
+
+        self._scene_version = None
+        self._maya_changes = 0
+        self._maya_callbacks = None
+        self._nodes = dict()
+
+    def get_nodes(self, attribute_name):
+        """
+        Returns the nodes of the current scene tagged with the given attribute
+        :param attribute_name: str
+        :return: OrderedDict(str, object), tagged nodes and the value of the attribute in each one of them
+        """
+
+        scene_version = self._get_scene_version()
+        if scene_version is None or scene_version != self._scene_version:
+            self._scene_version = scene_version
+            self._nodes.clear()
+
+        nodes = self._nodes.get(attribute_name, None)
+        if nodes is not None and not all(tp.Dcc.object_exists(node) for node in nodes):
+            nodes = None
+        if nodes is None:
+            nodes = OrderedDict(
+                (node, tp.Dcc.get_attribute_value(node, attribute_name))
+                for node in self._find_tagged_nodes(attribute_name))
+            self._nodes[attribute_name] = nodes
+
+        return nodes
+
+    def invalidate(self):
+        """
+        Clears cached nodes. Must be called every time puppet nodes are created, tagged or deleted
+        """
+
+        self._nodes.clear()
+
+    def remove_callbacks(self):
+        """
+        Removes the Maya callbacks used to detect scene changes
+        """
+
+        if not self._maya_callbacks:
+            self._maya_callbacks = None
+            return
+
+        import maya.api.OpenMaya as OpenMaya
+        for callback_id in self._maya_callbacks:
+            try:
+                OpenMaya.MMessage.removeCallback(callback_id)
+            except Exception:
+                pass
+        self._maya_callbacks = None
+        self._scene_version = None
+        self._nodes.clear()
+
+    def _get_scene_version(self):
+        """
+        Internal function that returns a value that changes every time the current scene changes
+        :return: object or None, None if the current DCC cannot notify scene changes
+        """
+
+        if nulldcc.is_maya():
+            if self._maya_callbacks is None:
+                self._add_maya_callbacks()
+            return self._maya_changes if self._maya_callbacks else None
+
+        scene_change_count = getattr(tp.Dcc, 'scene_change_count', None)
+
+        return scene_change_count() if scene_change_count else None
+
+    def _add_maya_callbacks(self):
+        """
+        Internal function that registers the Maya callbacks that notify scene changes to the index
+        """
+
+        self._maya_callbacks = list()
+        try:
+            import maya.api.OpenMaya as OpenMaya
+            for message in self.MAYA_SCENE_MESSAGES:
+                message_type = getattr(OpenMaya.MSceneMessage, message)
+                self._maya_callbacks.append(OpenMaya.MSceneMessage.addCallback(message_type, self._on_scene_changed))
+            self._maya_callbacks.append(OpenMaya.MDGMessage.addNodeAddedCallback(self._on_scene_changed))
+            self._maya_callbacks.append(OpenMaya.MDGMessage.addNodeRemovedCallback(self._on_scene_changed))
+        except Exception as exc:
+            LOGGER.warning('Impossible to register puppet scene callbacks: {}'.format(exc))
+            self.remove_callbacks()
+            self._maya_callbacks = list()
+
+    def _find_tagged_nodes(self, attribute_name):
+        """
+        Internal function that returns the nodes of the current scene that have the given attribute
+        :param attribute_name: str
+        :return: list(str)
+        """
+
+        list_nodes = getattr(tp.Dcc, 'list_nodes_with_attribute', None)
+        nodes = list_nodes(attribute_name, full_path=True) if list_nodes else None
+        if nodes is not None:
+            return nodes
+
+        if nulldcc.is_maya():
+            import tpDcc.dccs.maya as maya
+            return maya.cmds.ls(
+                '*.{}'.format(attribute_name), objectsOnly=True, recursive=True, long=True) or list()
+
+        if tp.Dcc.object_exists(consts.PUPPET_MAIN_SET):
+            candidates = self._get_selection_group_nodes(consts.PUPPET_MAIN_SET)
+            if candidates is not None:
+                if tp.Dcc.object_exists(consts.PUPPET_MAIN_GROUP):
+                    candidates.insert(0, consts.PUPPET_MAIN_GROUP)
+                nodes = [node for node in candidates if tp.Dcc.attribute_exists(node, attribute_name)]
+                if nodes:
+                    return nodes
+
+        # Current DCC cannot query selection groups or tagged nodes (for example, part nodes) are not members of the
+        # puppet sets, so the whole scene is checked
+        return [node for node in tp.Dcc.all_scene_objects() if tp.Dcc.attribute_exists(node, attribute_name)]
+
+    def _get_selection_group_nodes(self, selection_group_name):
+        """
+        Internal function that returns the members of the given selection group and of its nested selection groups
+        :param selection_group_name: str
+        :return: list(str) or None, None if current DCC cannot query the members of selection groups
+        """
+
+        list_members = getattr(tp.Dcc, 'list_selection_group_members', None)
+        members = list_members(selection_group_name) if list_members else None
+        if members is None:
+            return None
+
+        nodes = list()
+        for member in members:
+            nodes.append(member)
+            nested_nodes = None
+            if tp.Dcc.node_type(member) == 'objectSet':
+                nested_nodes = self._get_selection_group_nodes(member)
+            nodes.extend(nested_nodes or list())
+
+        return nodes
+
+    def _on_scene_changed(self, *args):
+        """
+        Internal callback function that is called by Maya when the current scene changes
+        """
+
+        self._maya_changes += 1
+
+
+_scene_index = PuppetSceneIndex()
+
+
+def get_scene_index():
+    """
+    Returns the index used to locate puppet nodes in the current DCC scene
+    :return: PuppetSceneIndex
+    """
+
+    return _scene_index
+
+
 def get_parts_path():
     """
     Returns path where parts are located
@@ -281,24 +465,28 @@ def create_main_guide_control(control_name=consts.PUPPET_MAIN_GUIDE, parent=None
     Function that creates main control for guides
     """
 
-    main_guide = controllib.ControlLib().create_control_by_name(
-        'cube', name=control_name, size=0.15, parent=parent)[0][0]
-    main_guide_shape = tp.Dcc.list_shapes(main_guide)[0]
-    tp.Dcc.set_attribute_value(main_guide_shape, 'overrideEnabled', True)
-    tp.Dcc.set_attribute_value(main_guide_shape, 'overrideColor', 10)
-    main_cluster, main_handle = tp.Dcc.create_cluster(
-        main_guide, cluster_name=consts.PUPPET_MAIN_GUIDE_CLUSTER, relative=True)
-    tp.Dcc.add_float_attribute(main_guide, consts.PUPPET_GUIDE_SIZE_ATTR, default_value=1.0, min_value=0.0)
-    for axis in 'XYZ':
-        tp.Dcc.connect_attribute(main_guide, 'size', main_handle, 'scale{}'.format(axis))
-    tp.Dcc.hide_node(main_handle)
-    tp.Dcc.set_parent(main_handle, main_guide)
-    for axis in 'YZ':
-        scale_axis_attr = 'scale{}'.format(axis)
-        tp.Dcc.connect_attribute(main_guide, 'scaleX', main_guide, scale_axis_attr)
-        tp.Dcc.unkeyable_attribute(main_guide, scale_axis_attr)
-        tp.Dcc.hide_attribute(main_guide, scale_axis_attr)
-        tp.Dcc.lock_attribute(main_guide, scale_axis_attr)
+    with dcccommands.batch('create_main_guide_control') as commands:
+        main_guide = controllib.ControlLib().create_control_by_name(
+            'cube', name=control_name, size=0.15, parent=parent)[0][0]
+        main_guide_shape = tp.Dcc.list_shapes(main_guide)[0]
+        commands.set_attribute_value(main_guide_shape, 'overrideEnabled', True)
+        commands.set_attribute_value(main_guide_shape, 'overrideColor', 10)
+        commands.flush()
+        main_cluster, main_handle = tp.Dcc.create_cluster(
+            main_guide, cluster_name=consts.PUPPET_MAIN_GUIDE_CLUSTER, relative=True)
+        commands.add_float_attribute(main_guide, consts.PUPPET_GUIDE_SIZE_ATTR, default_value=1.0, min_value=0.0)
+        for axis in 'XYZ':
+            commands.connect_attribute(main_guide, 'size', main_handle, 'scale{}'.format(axis))
+        commands.hide_node(main_handle)
+        commands.set_parent(main_handle, main_guide)
+        for axis in 'YZ':
+            scale_axis_attr = 'scale{}'.format(axis)
+            commands.connect_attribute(main_guide, 'scaleX', main_guide, scale_axis_attr)
+            commands.unkeyable_attribute(main_guide, scale_axis_attr)
+            commands.hide_attribute(main_guide, scale_axis_attr)
+            commands.lock_attribute(main_guide, scale_axis_attr)
+
+    get_scene_index().invalidate()
 
     return main_guide
 
@@ -373,97 +561,110 @@ def create_guide(guide_name=consts.PUPPET_ROOT_GUIDE, guide_parent=None, gizmo_s
     :return: str
     """
 
-    shaders = create_puppet_shaders()
-
-    tp.Dcc.clear_selection()
-
-    # Create main sphere gizmo
-    new_guide = tp.Dcc.create_nurbs_sphere(name=guide_name, radius=0.115, construction_history=False)
-    root_guide_shape = tp.Dcc.list_shapes(new_guide)[0]
-    gizmo_shader = gizmo_shader if gizmo_shader and gizmo_shader in shaders else 'yellow'
-    tp.Dcc.apply_shader(shaders[gizmo_shader], new_guide)
-    tp.Dcc.add_float_attribute(new_guide, consts.PUPPET_GUIDE_SIZE_ATTR, default_value=1.0, min_value=0.0)
-    tp.Dcc.add_bool_attribute(new_guide, consts.PUPPET_GUIDE_AXISES_ATTR, default_value=True, keyable=False)
-    for axis in 'XYZ':
-        scale_axis_attr = 'scale{}'.format(axis)
-        tp.Dcc.unkeyable_attribute(new_guide, scale_axis_attr)
-        tp.Dcc.hide_attribute(new_guide, scale_axis_attr)
-        tp.Dcc.lock_attribute(new_guide, scale_axis_attr)
-    tp.Dcc.unkeyable_attribute(new_guide, 'visibility')
-    tp.Dcc.hide_attribute(new_guide,  'visibility')
-    tp.Dcc.lock_attribute(new_guide,  'visibility')
-
-    # Create axis
-    axises = list()
-    axises_shapes = list()
-    for axis, color_name in zip(('x', 'y', 'z'), ('red', 'green', 'blue')):
-        guide_axis_name = '{}_{}'.format(guide_name, axis)
-        main_axis = tp.Dcc.create_nurbs_sphere(name=guide_axis_name, radius=0.2, construction_history=False)
-        tp.Dcc.connect_attribute(new_guide, 'axises', main_axis, 'visibility')
-        for sec_axis in 'XZ':
-            tp.Dcc.set_attribute_value(main_axis, 'scale{}'.format(sec_axis), 0.23)
-        tp.Dcc.set_attribute_value(main_axis, 'scaleY', 0.9)
-        tp.Dcc.translate_node_in_object_space('{}.cv[4][0:7]'.format(guide_axis_name), (0, 0.02, 0.0), relative=True)
-        tp.Dcc.translate_node_in_object_space('{}.cv[2][0:7]'.format(guide_axis_name), (0, -0.02, 0.0), relative=True)
-        tp.Dcc.scale_node_in_object_space('{}.cv[4][0:7]'.format(guide_axis_name), (1.07, 1.07, 1.07), relative=True)
-        tp.Dcc.scale_node_in_object_space('{}.cv[2][0:7]'.format(guide_axis_name), (1.07, 1.07, 1.07), relative=True)
-        tp.Dcc.scale_node_in_object_space('{}.cv[3][0:7]'.format(guide_axis_name), (0.85, 0.85, 0.85), relative=True)
-        tp.Dcc.scale_node_in_object_space('{}.cv[4:6][0:7]'.format(guide_axis_name), (0.5, 0.5, 0.5), relative=True)
-        if axis == 'x':
-            tp.Dcc.rotate_node_in_world_space(main_axis, (0, 0, -90), relative=True)
-            tp.Dcc.translate_node_in_world_space(guide_axis_name, (0.32, 0, 0), relative=True)
-        elif axis == 'y':
-            tp.Dcc.translate_node_in_world_space(guide_axis_name, (0, 0.32, 0), relative=True)
-        elif axis == 'z':
-            tp.Dcc.rotate_node_in_world_space(main_axis, (90, 0, 0), relative=True)
-            tp.Dcc.translate_node_in_world_space(guide_axis_name, (0, 0, 0.32), relative=True)
-        tp.Dcc.apply_shader('{}_guide_matSG'.format(color_name), main_axis)
-        tp.Dcc.move_pivot_to_zero(main_axis)
-        tp.Dcc.set_attribute_value(main_axis, 'overrideEnabled', True)
-        tp.Dcc.set_attribute_value(main_axis, 'overrideDisplayType', 2)
-        axises.append(main_axis)
-        axises_shapes.append(tp.Dcc.list_shapes(main_axis)[0])
-
-    # Create orient locator
-    root_orient_loc = tp.Dcc.create_locator(name='{}_orient'.format(guide_name))
-    root_orient_shape = tp.Dcc.list_shapes(root_orient_loc)[0]
-    for axis in 'XYZ':
-        tp.Dcc.set_attribute_value(root_orient_loc, 'localScale{}'.format(axis), 0.1)
-    tp.Dcc.set_attribute_value(root_orient_shape, 'visibility', False)
-    tp.Dcc.set_parent(root_orient_loc, new_guide)
+    with dcccommands.batch('create_guide') as commands:
+        shaders = create_puppet_shaders()
 
-    # Create init locator
-    root_init_loc = tp.Dcc.create_locator(name='{}_initLoc'.format(guide_name))
-    for axis in 'XYZ':
-        tp.Dcc.set_attribute_value(root_init_loc, 'localScale{}'.format(axis), 0.1)
-    tp.Dcc.hide_node(root_init_loc)
-    tp.Dcc.set_parent(root_init_loc, root_orient_loc)
-
-    # Create catcher mesh
-    # Create empty geometry
-    catcher_xform = tp.Dcc.create_empty_mesh(mesh_name='{}_catcher'.format(guide_name))
-    catcher_mesh = tp.Dcc.list_shapes(catcher_xform)[0]
-    root_cluster, root_handle = tp.Dcc.create_cluster(
-        [root_guide_shape, catcher_mesh] + axises_shapes,
-        cluster_name='{}_cluster'.format(guide_name), relative=True)
-    tp.Dcc.hide_node(catcher_xform)
-    tp.Dcc.set_parent(catcher_xform, new_guide)
-    tp.Dcc.set_attribute_value(root_cluster, 'relative', True)
-    tp.Dcc.hide_node(root_handle)
-    tp.Dcc.move_pivot_to_zero(root_handle)
-    for axis in 'XYZ':
-        shape = tp.Dcc.list_shapes(root_handle)[0]
-        tp.Dcc.set_attribute_value(shape, 'origin{}'.format(axis), 0)
-        tp.Dcc.connect_attribute(new_guide, consts.PUPPET_GUIDE_SIZE_ATTR, root_handle, 'scale{}'.format(axis))
-    tp.Dcc.set_parent(root_handle, new_guide)
-
-    for axis in axises:
-        tp.Dcc.set_parent(axis, root_orient_loc)
-
-    tp.Dcc.select_object(new_guide)
+        tp.Dcc.clear_selection()
 
-    if guide_parent and tp.Dcc.object_exists(guide_parent):
-        tp.Dcc.set_parent(new_guide, guide_parent)
+        # Create main sphere gizmo
+        new_guide = tp.Dcc.create_nurbs_sphere(name=guide_name, radius=0.115, construction_history=False)
+        root_guide_shape = tp.Dcc.list_shapes(new_guide)[0]
+        gizmo_shader = gizmo_shader if gizmo_shader and gizmo_shader in shaders else 'yellow'
+        commands.apply_shader(shaders[gizmo_shader], new_guide)
+        commands.add_float_attribute(new_guide, consts.PUPPET_GUIDE_SIZE_ATTR, default_value=1.0, min_value=0.0)
+        commands.add_bool_attribute(new_guide, consts.PUPPET_GUIDE_AXISES_ATTR, default_value=True, keyable=False)
+        for axis in 'XYZ':
+            scale_axis_attr = 'scale{}'.format(axis)
+            commands.unkeyable_attribute(new_guide, scale_axis_attr)
+            commands.hide_attribute(new_guide, scale_axis_attr)
+            commands.lock_attribute(new_guide, scale_axis_attr)
+        commands.unkeyable_attribute(new_guide, 'visibility')
+        commands.hide_attribute(new_guide,  'visibility')
+        commands.lock_attribute(new_guide,  'visibility')
+
+        # Create axis
+        axises = list()
+        axises_shapes = list()
+        for axis, color_name in zip(('x', 'y', 'z'), ('red', 'green', 'blue')):
+            guide_axis_name = '{}_{}'.format(guide_name, axis)
+            main_axis = tp.Dcc.create_nurbs_sphere(name=guide_axis_name, radius=0.2, construction_history=False)
+            commands.connect_attribute(new_guide, 'axises', main_axis, 'visibility')
+            for sec_axis in 'XZ':
+                commands.set_attribute_value(main_axis, 'scale{}'.format(sec_axis), 0.23)
+            commands.set_attribute_value(main_axis, 'scaleY', 0.9)
+            # Transform calls are executed immediately, so buffered commands must be sent to the DCC before them
+            commands.flush()
+            tp.Dcc.translate_node_in_object_space(
+                '{}.cv[4][0:7]'.format(guide_axis_name), (0, 0.02, 0.0), relative=True)
+            tp.Dcc.translate_node_in_object_space(
+                '{}.cv[2][0:7]'.format(guide_axis_name), (0, -0.02, 0.0), relative=True)
+            tp.Dcc.scale_node_in_object_space(
+                '{}.cv[4][0:7]'.format(guide_axis_name), (1.07, 1.07, 1.07), relative=True)
+            tp.Dcc.scale_node_in_object_space(
+                '{}.cv[2][0:7]'.format(guide_axis_name), (1.07, 1.07, 1.07), relative=True)
+            tp.Dcc.scale_node_in_object_space(
+                '{}.cv[3][0:7]'.format(guide_axis_name), (0.85, 0.85, 0.85), relative=True)
+            tp.Dcc.scale_node_in_object_space('{}.cv[4:6][0:7]'.format(guide_axis_name), (0.5, 0.5, 0.5), relative=True)
+            if axis == 'x':
+                tp.Dcc.rotate_node_in_world_space(main_axis, (0, 0, -90), relative=True)
+                tp.Dcc.translate_node_in_world_space(guide_axis_name, (0.32, 0, 0), relative=True)
+            elif axis == 'y':
+                tp.Dcc.translate_node_in_world_space(guide_axis_name, (0, 0.32, 0), relative=True)
+            elif axis == 'z':
+                tp.Dcc.rotate_node_in_world_space(main_axis, (90, 0, 0), relative=True)
+                tp.Dcc.translate_node_in_world_space(guide_axis_name, (0, 0, 0.32), relative=True)
+            commands.apply_shader('{}_guide_matSG'.format(color_name), main_axis)
+            commands.flush()
+            tp.Dcc.move_pivot_to_zero(main_axis)
+            commands.set_attribute_value(main_axis, 'overrideEnabled', True)
+            commands.set_attribute_value(main_axis, 'overrideDisplayType', 2)
+            axises.append(main_axis)
+            axises_shapes.append(tp.Dcc.list_shapes(main_axis)[0])
+
+        # Create orient locator
+        root_orient_loc = tp.Dcc.create_locator(name='{}_orient'.format(guide_name))
+        root_orient_shape = tp.Dcc.list_shapes(root_orient_loc)[0]
+        for axis in 'XYZ':
+            commands.set_attribute_value(root_orient_loc, 'localScale{}'.format(axis), 0.1)
+        commands.set_attribute_value(root_orient_shape, 'visibility', False)
+        commands.set_parent(root_orient_loc, new_guide)
+
+        # Create init locator
+        root_init_loc = tp.Dcc.create_locator(name='{}_initLoc'.format(guide_name))
+        for axis in 'XYZ':
+            commands.set_attribute_value(root_init_loc, 'localScale{}'.format(axis), 0.1)
+        commands.hide_node(root_init_loc)
+        commands.set_parent(root_init_loc, root_orient_loc)
+        commands.flush()
+
+        # Create catcher mesh
+        # Create empty geometry
+        catcher_xform = tp.Dcc.create_empty_mesh(mesh_name='{}_catcher'.format(guide_name))
+        catcher_mesh = tp.Dcc.list_shapes(catcher_xform)[0]
+        root_cluster, root_handle = tp.Dcc.create_cluster(
+            [root_guide_shape, catcher_mesh] + axises_shapes,
+            cluster_name='{}_cluster'.format(guide_name), relative=True)
+        commands.hide_node(catcher_xform)
+        commands.set_parent(catcher_xform, new_guide)
+        commands.set_attribute_value(root_cluster, 'relative', True)
+        commands.hide_node(root_handle)
+        commands.flush()
+        tp.Dcc.move_pivot_to_zero(root_handle)
+        for axis in 'XYZ':
+            shape = tp.Dcc.list_shapes(root_handle)[0]
+            commands.set_attribute_value(shape, 'origin{}'.format(axis), 0)
+            commands.connect_attribute(new_guide, consts.PUPPET_GUIDE_SIZE_ATTR, root_handle, 'scale{}'.format(axis))
+        commands.set_parent(root_handle, new_guide)
+
+        for axis in axises:
+            commands.set_parent(axis, root_orient_loc)
+
+        tp.Dcc.select_object(new_guide)
+
+        if guide_parent and tp.Dcc.object_exists(guide_parent):
+            commands.set_parent(new_guide, guide_parent)
+
+    get_scene_index().invalidate()
 
     return new_guide
 
@@ -505,6 +706,8 @@ def create_part():
 
     tp.Dcc.select_object(main_guide)
 
+    get_scene_index().invalidate()
+
     return main_guide
 
 
@@ -518,7 +721,7 @@ def create_connector(name='connector'):
     tp.Dcc.move_pivot_to_zero(cylinder)
     tp.Dcc.freeze_transforms(cylinder)
     tp.Dcc.convert_surface_to_bezier(cylinder, spans_u=1, degree_u=1, degree_v=3, construction_history=False)
-    if tp.is_maya():
+    if nulldcc.is_maya():
         import tpDcc.dccs.maya as maya
         maya.cmds.select('{}.cv[0][0:12]'.format(cylinder), replace=True)
         maya.cmds.move(-0.000750343, 0, 0, r=True, os=True, wd=True)
@@ -558,18 +761,19 @@ def connect_guides(source=None, target=None, name=''):
             return
         source, target = sel
 
-    lines_group_name = '{}lines_group'.format(name)
-    if not tp.Dcc.object_exists(lines_group_name):
-        tp.Dcc.create_empty_group(lines_group_name)
-        tp.Dcc.set_parent(lines_group_name, 'main_guide')
-
-    connector_name = source.replace('guide', 'connector')
-    new_connector, start_grp, end_grp = create_connector(name=connector_name)
-    tp.Dcc.set_parent(new_connector, lines_group_name)
-    tp.Dcc.set_parent(start_grp, source)
-    tp.Dcc.set_parent(end_grp, target)
-    tp.Dcc.reset_transform_attributes(start_grp)
-    tp.Dcc.reset_transform_attributes(end_grp)
+    with dcccommands.batch('connect_guides') as commands:
+        lines_group_name = '{}lines_group'.format(name)
+        if not tp.Dcc.object_exists(lines_group_name):
+            tp.Dcc.create_empty_group(lines_group_name)
+            commands.set_parent(lines_group_name, 'main_guide')
+
+        connector_name = source.replace('guide', 'connector')
+        new_connector, start_grp, end_grp = create_connector(name=connector_name)
+        commands.set_parent(new_connector, lines_group_name)
+        commands.set_parent(start_grp, source)
+        commands.set_parent(end_grp, target)
+        commands.reset_transform_attributes(start_grp)
+        commands.reset_transform_attributes(end_grp)
 
 
 
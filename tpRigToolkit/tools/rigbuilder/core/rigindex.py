@@ -0,0 +1,506 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains persistent rig index implementation for tpRigToolkit.tools.rigbuilder
+The index stores the folders of a project (rig paths, names, enabled state and parent/child relations) in a SQLite
+database located in the cache folder of the user, so rigs can be found without walking the project folder
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+from tpRigToolkit.tools.rigbuilder.core import consts
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+
+class RigIndexEntry(object):
+    """
+    Class that stores the indexed information of a folder
+    """
+
+    __slots__ = ('path', 'parent', 'name', 'mtime', 'is_rig', 'enabled', 'children')
+
+    def __init__(self, path, parent=None, mtime=None, is_rig=False, enabled=False):
+        self.path = path
+        self.parent = parent
+        self.name = path.rsplit('/', 1)[-1]
+        self.mtime = mtime
+        self.is_rig = is_rig
+        self.enabled = enabled
+        self.children = list()
+
+
+class RigIndex(object):
+    """
+    Class that indexes all the folders of a project
+    Folders are only listed again when their modification time changes and the index is stored in disk, so opening
+    a project only needs to check the modification time of its folders. Checks are done at most once every
+    REFRESH_INTERVAL seconds; changes done through rigbuilder mark the changed folders so they are updated right away
+    """
+
+    CACHE_PATH = os.path.join(os.path.expanduser('~'), 'tpRigToolkit', 'cache', 'rigindex')
+    VERSION = 1
+    REFRESH_INTERVAL = 2.0
+
+    _indices = dict()
+    _indices_lock = threading.Lock()
+
+    def __init__(self, root_path, index_file=None):
+        super(RigIndex, self).__init__()
+
+        self._root_path = _clean_path(root_path)
+        self._index_file = index_file or self.get_index_file(self._root_path)
+        self._lock = threading.RLock()
+        self._entries = dict()
+        self._dirty = set()
+        self._removed = set()
+        self._modified = set()
+        self._last_refresh = None
+        self._connection = None
+
+    @classmethod
+    def get(cls, root_path):
+        """
+        Returns index of the given project folder, creating it if necessary
+        :param root_path: str
+        :return: RigIndex
+        """
+
+        root_path = _clean_path(root_path)
+        with cls._indices_lock:
+            index = cls._indices.get(root_path, None)
+            if not index:
+                index = cls._indices[root_path] = cls(root_path)
+
+        return index
+
+    @classmethod
+    def get_index_file(cls, root_path):
+        """
+        Returns the database file where the index of the given project folder is stored
+        Databases are stored in the cache folder of the user, so projects shared by several users are never written
+        :param root_path: str
+        :return: str
+        """
+
+        root_path = _clean_path(root_path)
+        path_hash = hashlib.md5(root_path.encode('utf-8')).hexdigest()[:16]
+        file_name = '{}_{}.db'.format(root_path.rsplit('/', 1)[-1] or 'root', path_hash)
+
+        return _clean_path(os.path.join(cls.CACHE_PATH, file_name))
+
+    @classmethod
+    def find(cls, path):
+        """
+        Returns the index that contains the given folder
+        :param path: str
+        :return: RigIndex or None, None if the given folder is not located inside an indexed project
+        """
+
+        path = _clean_path(path)
+        with cls._indices_lock:
+            indices = list(cls._indices.values())
+        for index in indices:
+            if path == index.root_path or path.startswith('{}/'.format(index.root_path)):
+                return index
+
+        return None
+
+    @property
+    def root_path(self):
+        return self._root_path
+
+    @property
+    def index_file(self):
+        return self._index_file
+
+    def refresh(self, force=False):
+        """
+        Updates the index with the folders that changed since the last time they were indexed
+        :param force: bool, if True, the modification time of all the folders is checked even if the index was
+            refreshed less than REFRESH_INTERVAL seconds ago
+        """
+
+        with self._lock:
+            if not self._entries:
+                self._load()
+                if not self._entries:
+                    self._scan(self._root_path, None)
+                    self._last_refresh = time.time()
+                    self._save()
+                    return
+
+            now = time.time()
+            check_all = force or self._last_refresh is None or now - self._last_refresh >= self.REFRESH_INTERVAL
+            paths = list(self._entries.keys()) if check_all else list(self._dirty)
+            for path in paths:
+                entry = self._entries.get(path, None)
+                if not entry:
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    self._remove(path)
+                    continue
+                if path in self._dirty or mtime != entry.mtime:
+                    self._rescan(entry, mtime)
+
+            self._dirty.clear()
+            if check_all:
+                self._last_refresh = now
+            self._save()
+
+    def mark_dirty(self, path):
+        """
+        Forces the update of the given folder and its parent folder next time the index is accessed
+        Used when rigs are created, renamed, deleted, enabled or disabled
+        :param path: str
+        """
+
+        path = _clean_path(path)
+        with self._lock:
+            while path not in self._entries and path.startswith('{}/'.format(self._root_path)):
+                path = path.rpartition('/')[0]
+            entry = self._entries.get(path, None)
+            if not entry:
+                return
+            self._dirty.add(path)
+            if entry.parent:
+                self._dirty.add(entry.parent)
+
+    def invalidate(self):
+        """
+        Forces a full walk of the project folder next time the index is accessed
+        """
+
+        with self._lock:
+            self._removed.update(self._entries.keys())
+            self._entries.clear()
+            self._dirty.clear()
+            self._modified.clear()
+            self._save()
+
+    def find_rigs(self, directory=None, return_also_non_objects_list=False):
+        """
+        Returns the rigs located directly under the given folder
+        :param directory: str or None, if not given, the project folder is used
+        :param return_also_non_objects_list: bool, whether to return also the folders that are not rigs
+        :return: list(str) or tuple(list(str), list(str)), full paths of the rigs and of the non rig folders
+        """
+
+        self.refresh()
+
+        rigs = list()
+        non_rigs = list()
+        with self._lock:
+            entry = self._entries.get(_clean_path(directory or self._root_path), None)
+            for child_path in entry.children if entry else list():
+                child = self._entries.get(child_path, None)
+                if not child:
+                    continue
+                if child.is_rig:
+                    rigs.append(child_path)
+                elif child.name != 'Trash':
+                    non_rigs.append(child_path)
+
+        if not return_also_non_objects_list:
+            return rigs
+
+        return rigs, non_rigs
+
+    def find_rig(self, rig_name):
+        """
+        Returns the path of the rig with the given name located directly under the project folder
+        :param rig_name: str
+        :return: str or None
+        """
+
+        self.refresh()
+
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    'SELECT path FROM folders WHERE name = ? AND parent = ? AND is_rig = 1 ORDER BY path LIMIT 1',
+                    (rig_name, self._root_path)).fetchone()
+            except sqlite3.Error as exc:
+                LOGGER.warning('Impossible to query rig index "{}": {}'.format(self._index_file, exc))
+                return None
+
+        return row[0] if row else None
+
+    def is_rig(self, path):
+        """
+        Returns whether or not the given folder is a rig
+        :param path: str
+        :return: bool
+        """
+
+        self.refresh()
+
+        with self._lock:
+            entry = self._entries.get(_clean_path(path), None)
+            return bool(entry and entry.is_rig)
+
+    def is_enabled(self, path):
+        """
+        Returns whether or not the given rig is enabled
+        :param path: str
+        :return: bool
+        """
+
+        self.refresh()
+
+        with self._lock:
+            entry = self._entries.get(_clean_path(path), None)
+            return bool(entry and entry.enabled)
+
+    def has_sub_rigs(self, path):
+        """
+        Returns whether or not there are rigs located directly under the given folder
+        :param path: str
+        :return: bool
+        """
+
+        return bool(self.find_rigs(path))
+
+    def _scan(self, path, parent):
+        """
+        Internal function that indexes the given folder and all its sub folders
+        :param path: str
+        :param parent: str or None
+        """
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+
+        entry = self._entries[path] = RigIndexEntry(path, parent=parent, mtime=mtime)
+        self._modified.add(path)
+        self._removed.discard(path)
+        for child_path in self._update_entry(entry):
+            self._scan(child_path, path)
+
+    def _rescan(self, entry, mtime):
+        """
+        Internal function that updates the given folder and its direct children
+        New sub folders are indexed and removed ones are removed from the index
+        :param entry: RigIndexEntry
+        :param mtime: float
+        """
+
+        old_children = set(entry.children)
+        entry.mtime = mtime
+        self._modified.add(entry.path)
+        new_children = self._update_entry(entry)
+        for child_path in old_children - set(new_children):
+            self._remove(child_path, update_parent=False)
+        for child_path in new_children:
+            if child_path not in old_children:
+                self._scan(child_path, entry.path)
+
+    def _update_entry(self, entry):
+        """
+        Internal function that lists the given folder and updates its rig state and its children
+        :param entry: RigIndexEntry
+        :return: list(str), paths of the indexed children of the folder
+        """
+
+        try:
+            folder_names, file_names = _list_folder(entry.path)
+        except OSError:
+            folder_names, file_names = list(), list()
+
+        entry.is_rig = consts.CODE_FOLDER in folder_names
+        entry.enabled = consts.ENABLE_FILE in file_names
+        entry.children = ['{}/{}'.format(entry.path, name) for name in sorted(folder_names) if not (
+            name.startswith(consts.FOLDERS_PREFIX) and name.endswith(consts.FOLDERS_SUFFIX))]
+
+        return entry.children
+
+    def _remove(self, path, update_parent=True):
+        """
+        Internal function that removes the given folder and all its sub folders from the index
+        :param path: str
+        :param update_parent: bool
+        """
+
+        entry = self._entries.pop(path, None)
+        if not entry:
+            return
+        self._removed.add(path)
+        self._modified.discard(path)
+        for child_path in entry.children:
+            self._remove(child_path, update_parent=False)
+        if update_parent:
+            parent = self._entries.get(entry.parent, None)
+            if parent and path in parent.children:
+                parent.children.remove(path)
+
+    def _connect(self):
+        """
+        Internal function that returns the connection to the index database
+        If the database cannot be opened (for example, if the cache folder is read only), the index is kept only
+        in memory
+        :return: sqlite3.Connection
+        """
+
+        if self._connection:
+            return self._connection
+
+        try:
+            index_dir = os.path.dirname(self._index_file)
+            if index_dir and not os.path.isdir(index_dir):
+                os.makedirs(index_dir)
+            self._connection = sqlite3.connect(self._index_file, check_same_thread=False)
+            self._create_tables(self._connection)
+        except (OSError, sqlite3.Error) as exc:
+            LOGGER.warning('Impossible to open rig index "{}", index is not stored: {}'.format(self._index_file, exc))
+            self._connection = sqlite3.connect(':memory:', check_same_thread=False)
+            self._create_tables(self._connection)
+
+        return self._connection
+
+    def _create_tables(self, connection):
+        """
+        Internal function that creates the tables of the index database. Databases of other versions are cleared
+        :param connection: sqlite3.Connection
+        """
+
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != self.VERSION:
+            connection.execute('DROP TABLE IF EXISTS folders')
+            connection.execute('PRAGMA user_version = {}'.format(int(self.VERSION)))
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS folders ('
+            'path TEXT PRIMARY KEY, parent TEXT, name TEXT, mtime REAL, is_rig INTEGER, enabled INTEGER)')
+        connection.execute('CREATE INDEX IF NOT EXISTS folders_name ON folders (name)')
+        connection.commit()
+
+    def _load(self):
+        """
+        Internal function that loads the index stored in disk
+        """
+
+        try:
+            rows = self._connect().execute(
+                'SELECT path, parent, mtime, is_rig, enabled FROM folders ORDER BY path').fetchall()
+        except sqlite3.Error as exc:
+            LOGGER.warning('Impossible to load rig index "{}": {}'.format(self._index_file, exc))
+            return
+
+        for path, parent, mtime, is_rig, enabled in rows:
+            self._entries[path] = RigIndexEntry(
+                path, parent=parent, mtime=mtime, is_rig=bool(is_rig), enabled=bool(enabled))
+        for path in sorted(self._entries.keys()):
+            parent = self._entries.get(self._entries[path].parent, None)
+            if parent:
+                parent.children.append(path)
+
+        if self._root_path not in self._entries:
+            self._entries.clear()
+
+    def _save(self):
+        """
+        Internal function that stores in disk the folders that changed since the index was stored
+        """
+
+        if not self._modified and not self._removed:
+            return
+
+        rows = list()
+        for path in self._modified:
+            entry = self._entries.get(path, None)
+            if entry:
+                rows.append((entry.path, entry.parent, entry.name, entry.mtime, int(entry.is_rig), int(entry.enabled)))
+        try:
+            connection = self._connect()
+            with connection:
+                connection.executemany('DELETE FROM folders WHERE path = ?', [(path, ) for path in self._removed])
+                connection.executemany('INSERT OR REPLACE INTO folders VALUES (?, ?, ?, ?, ?, ?)', rows)
+        except sqlite3.Error as exc:
+            LOGGER.warning('Impossible to store rig index "{}": {}'.format(self._index_file, exc))
+
+        self._modified.clear()
+        self._removed.clear()
+
+
+def get_index(path):
+    """
+    Returns the index of the project that contains the given folder
+    :param path: str
+    :return: RigIndex or None
+    """
+
+    if not path:
+        return None
+
+    return RigIndex.find(path)
+
+
+def mark_dirty(path):
+    """
+    Forces the update of the given folder in the index of the project that contains it
+    :param path: str
+    """
+
+    index = get_index(path)
+    if index:
+        index.mark_dirty(path)
+
+
+def _clean_path(path):
+    """
+    Internal function that returns given path with forward slashes and without trailing slashes
+    :param path: str
+    :return: str
+    """
+
+    path = path.replace('\\', '/')
+
+    return path.rstrip('/') or path
+
+
+def _list_folder(path):
+    """
+    Internal function that returns the names of the folders and files located directly under the given folder
+    :param path: str
+    :return: tuple(list(str), list(str))
+    """
+
+    folder_names, file_names = list(), list()
+    if scandir:
+        for entry in scandir(path):
+            if entry.is_dir():
+                folder_names.append(entry.name)
+            else:
+                file_names.append(entry.name)
+    else:
+        for name in os.listdir(path):
+            if os.path.isdir(os.path.join(path, name)):
+                folder_names.append(name)
+            else:
+                file_names.append(name)
+
+    return folder_names, file_names
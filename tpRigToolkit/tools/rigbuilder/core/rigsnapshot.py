@@ -0,0 +1,198 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains rig snapshot implementation for tpRigToolkit.tools.rigbuilder
+A snapshot loads the manifest, the node infos and the code folders layout of a rig in a single traversal, so builds
+do not access the disk for each node separately. Options and settings files are cached by the option store instead
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import copy
+import logging
+
+try:
+    import yaml
+    YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+except ImportError:
+    yaml = None
+    YamlLoader = None
+
+from tpDcc.libs.python import yamlio
+
+from tpRigToolkit.tools.rigbuilder.core import consts
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+OPTIONS_FILE = '{}.{}'.format(consts.OPTIONS_FILE_NAME, consts.OPTIONS_FILE_EXTENSION)
+
+
+def read_yaml_file(file_path):
+    """
+    Returns the contents of the given YAML file
+    The C YAML loader is used if it is available
+    :param file_path: str
+    :return: dict
+    """
+
+    if not yaml:
+        return yamlio.read_file(file_path) or dict()
+
+    with open(file_path, 'r') as fh:
+        return yaml.load(fh, Loader=YamlLoader) or dict()
+
+
+class RigSnapshot(object):
+    """
+    Class that stores the state of a rig in disk at the moment it was loaded
+    Snapshots are immutable: functions return copies of the stored data, so the files read by a build do not change
+    while the build is running even if they are edited in disk
+    """
+
+    def __init__(self, path, code_path, scripts=None, states=None, folders=None):
+        super(RigSnapshot, self).__init__()
+
+        self._path = path
+        self._code_path = code_path
+        self._scripts = tuple(scripts or list())
+        self._states = tuple(states or list())
+        self._folders = folders or dict()
+
+    @classmethod
+    def load(cls, rig_object):
+        """
+        Loads the snapshot of the given rig
+        :param rig_object: RigObject
+        :return: RigSnapshot
+        """
+
+        rig_path = rig_object.get_path()
+        code_path = rig_object.get_code_path()
+        scripts, states = rig_object.get_scripts_manifest()
+
+        folders = dict()
+        if code_path and os.path.isdir(code_path):
+            for root, dirs, files in os.walk(code_path):
+                dirs[:] = [d for d in dirs if not (
+                    d.startswith(consts.FOLDERS_PREFIX) and d.endswith(consts.FOLDERS_SUFFIX))]
+                folder_name = os.path.relpath(root, code_path).replace('\\', '/')
+                if folder_name == '.':
+                    continue
+                folders[folder_name] = cls._load_folder(root, folder_name, files, rig_object.SCRIPT_EXTENSION)
+
+        return cls(rig_path, code_path, scripts=scripts, states=states, folders=folders)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def code_path(self):
+        return self._code_path
+
+    def get_scripts_manifest(self):
+        """
+        Returns the scripts and states of the manifest of the rig
+        :return: tuple(list(str), list(bool)) or tuple(None, None) if the manifest is empty
+        """
+
+        if not self._scripts:
+            return None, None
+
+        return list(self._scripts), list(self._states)
+
+    def get_code_folders(self):
+        """
+        Returns the names of all code folders of the rig
+        :return: list(str)
+        """
+
+        return sorted(self._folders.keys())
+
+    def has_code_folder(self, code_name):
+        """
+        Returns whether or not the given code folder exists
+        :param code_name: str
+        :return: bool
+        """
+
+        return code_name in self._folders
+
+    def get_code_folder(self, code_name):
+        """
+        Returns path of the given code folder
+        :param code_name: str
+        :return: str or None
+        """
+
+        if code_name not in self._folders:
+            return None
+
+        return '{}/{}'.format(self._code_path, code_name)
+
+    def get_code_file(self, code_name):
+        """
+        Returns path of the code file of the given code folder
+        :param code_name: str
+        :return: str or None
+        """
+
+        folder = self._folders.get(code_name, None)
+        if not folder or not folder['code_file']:
+            return None
+
+        return '{}/{}/{}'.format(self._code_path, code_name, folder['code_file'])
+
+    def has_file(self, code_name, file_name):
+        """
+        Returns whether or not the given file exists in the given code folder
+        :param code_name: str
+        :param file_name: str
+        :return: bool
+        """
+
+        folder = self._folders.get(code_name, None)
+
+        return bool(folder) and file_name in folder['files']
+
+    def get_node_info(self, code_name):
+        """
+        Returns the info of the build node stored in the given code folder
+        :param code_name: str
+        :return: dict
+        """
+
+        folder = self._folders.get(code_name, None)
+
+        return copy.deepcopy(folder['info']) if folder else dict()
+
+    @staticmethod
+    def _load_folder(folder_path, folder_name, files, extension):
+        """
+        Internal function that loads the files of the given code folder
+        :param folder_path: str
+        :param folder_name: str
+        :param files: list(str), names of the files located in the folder
+        :param extension: str, extension of the code file of the folder
+        :return: dict
+        """
+
+        code_file = '{}.{}'.format(folder_name.split('/')[-1], extension.lstrip('.'))
+        if code_file not in files:
+            code_file = None
+
+        info = dict()
+        if code_file and extension.lstrip('.') == 'yml':
+            try:
+                info = read_yaml_file(os.path.join(folder_path, code_file))
+            except Exception as exc:
+                LOGGER.warning('Impossible to read node info "{}": {}'.format(folder_name, exc))
+
+        return {'files': frozenset(files), 'code_file': code_file, 'info': info}
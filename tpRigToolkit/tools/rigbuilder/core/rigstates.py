@@ -0,0 +1,237 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains rig states loader implementation for tpRigToolkit.tools.rigbuilder
+The states of the rigs shown in the UI (enable state and whether they have sub rigs or not) are resolved in worker
+threads and they are delivered in batches to the UI thread, so big projects can be shown without blocking the UI
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import logging
+import threading
+import multiprocessing
+from collections import namedtuple, OrderedDict
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+from Qt.QtCore import *
+
+from tpDcc.libs.python import path as path_utils
+
+from tpRigToolkit.tools.rigbuilder.objects import helpers, rig
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+# Enable state is None when it could not be resolved
+RigState = namedtuple('RigState', ['path', 'enabled', 'has_parts'])
+
+
+def resolve_rig_state(directory, name):
+    """
+    Returns the state of the given rig
+    This function is called from worker threads, so it must not access the UI
+    :param directory: str, directory where the rig is located
+    :param name: str, name of the rig (relative to the directory)
+    :return: RigState
+    """
+
+    rig_inst = rig.RigObject(name=name)
+    rig_inst.set_directory(directory)
+    rig_path = path_utils.join_path(directory, name)
+
+    enabled = bool(rig_inst.get_setting('enable'))
+    rigs, folders = helpers.RigHelpers.find_rigs(rig_path, return_also_non_objects_list=True)
+
+    return RigState(rig_path, enabled, bool(rigs or folders))
+
+
+class RigStatesLoader(QObject, object):
+    """
+    Class that resolves the state of rigs in a pool of worker threads
+    Requests are resolved in the order they are requested, but they can be prioritized (for example, the rigs that are
+    visible in the UI). Resolved states are emitted in batches in the thread the loader lives in (UI thread)
+    If the state of a rig cannot be resolved, a state with unknown enable state and without sub rigs is emitted, so
+    the requests of the rig are always answered
+    """
+
+    BATCH_SIZE = 100
+    DELIVER_INTERVAL = 30
+
+    resolved = Signal(object)
+
+    def __init__(self, resolve_fn=None, max_workers=None, parent=None):
+        super(RigStatesLoader, self).__init__(parent)
+
+        self._resolve_fn = resolve_fn or resolve_rig_state
+        self._max_workers = max_workers or min(4, multiprocessing.cpu_count())
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()
+        self._results = queue.Queue()
+        self._generation = 0
+        self._running = 0
+        self._workers = list()
+        self._stopped = False
+
+        self._deliver_timer = QTimer(self)
+        self._deliver_timer.setInterval(self.DELIVER_INTERVAL)
+        self._deliver_timer.timeout.connect(self.deliver)
+
+    # ================================================================================================
+    # ======================== BASE
+    # ================================================================================================
+
+    def is_busy(self):
+        """
+        Returns whether or not there are requests not resolved or not delivered yet
+        :return: bool
+        """
+
+        with self._condition:
+            return bool(self._pending or self._running or not self._results.empty())
+
+    def request(self, directory, names):
+        """
+        Requests the states of the given rigs
+        :param directory: str, directory where the rigs are located
+        :param names: list(str), names of the rigs (relative to the directory)
+        """
+
+        if not names:
+            return
+
+        with self._condition:
+            if self._stopped:
+                return
+            for name in names:
+                self._pending[path_utils.join_path(directory, name)] = (directory, name)
+            self._start_workers()
+            self._condition.notify_all()
+
+        if not self._deliver_timer.isActive():
+            self._deliver_timer.start()
+
+    def prioritize(self, paths):
+        """
+        Moves the requests of the given rigs to the front of the queue. Given order is kept
+        :param paths: list(str), paths of the rigs
+        """
+
+        with self._condition:
+            prioritized = OrderedDict()
+            for path in paths:
+                if path in self._pending:
+                    prioritized[path] = self._pending.pop(path)
+            prioritized.update(self._pending)
+            self._pending = prioritized
+
+    def cancel(self):
+        """
+        Cancels all the requests. States that are being resolved are discarded when they finish
+        """
+
+        with self._condition:
+            self._generation += 1
+            self._pending.clear()
+
+        while True:
+            try:
+                self._results.get_nowait()
+            except queue.Empty:
+                break
+
+    def shutdown(self, timeout=None):
+        """
+        Cancels all the requests and stops the worker threads. Once stopped, new requests are ignored
+        Must be called when the loader is not needed anymore (for example, when the widget that uses it is destroyed)
+        :param timeout: float or None, seconds to wait for each worker thread to finish. If not given, workers that are
+            resolving a state are not waited
+        """
+
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self.cancel()
+        self._deliver_timer.stop()
+
+        if timeout is not None:
+            for worker in self._workers:
+                worker.join(timeout)
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+
+    def deliver(self):
+        """
+        Emits the states that are already resolved
+        States are emitted in batches, so the UI thread is not blocked when lots of states are resolved at once
+        :return: list(RigState)
+        """
+
+        states = list()
+        while len(states) < self.BATCH_SIZE:
+            try:
+                generation, state = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._generation:
+                states.append(state)
+
+        if not self.is_busy():
+            self._deliver_timer.stop()
+
+        if states:
+            self.resolved.emit(states)
+
+        return states
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _start_workers(self):
+        """
+        Internal function that starts the worker threads that are not started yet
+        Workers wait for new requests when the queue is empty, so they are started only once
+        """
+
+        while len(self._workers) < self._max_workers:
+            worker = threading.Thread(target=self._work, name='RigStatesLoader')
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def _work(self):
+        """
+        Internal function executed by worker threads that resolves the pending requests
+        """
+
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                path, (directory, name) = self._pending.popitem(last=False)
+                generation = self._generation
+                self._running += 1
+
+            try:
+                state = self._resolve_fn(directory, name)
+            except Exception as exc:
+                LOGGER.warning('Impossible to resolve state of rig "{}": {}'.format(path, exc))
+                state = None
+            if state is None:
+                state = RigState(path, None, False)
+
+            with self._condition:
+                self._running -= 1
+                if generation == self._generation:
+                    self._results.put((generation, state))
@@ -0,0 +1,224 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains build scheduler implementation for tpRigToolkit.tools.rigbuilder
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import sys
+import heapq
+import logging
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+
+import six
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+
+class BuildTask(object):
+    """
+    Class that defines a task executed by the build scheduler
+    """
+
+    def __init__(self, name, index, dependencies=None, dcc_free=False):
+        super(BuildTask, self).__init__()
+
+        self.name = name
+        self.index = index
+        self.dependencies = set(dependencies or list())
+        self.dcc_free = dcc_free
+
+
+class BuildScheduler(object):
+    """
+    Class that executes build tasks following the dependency graph defined by their declared inputs and outputs
+    Tasks that do not declare inputs nor outputs depend on all the tasks added before them and all the tasks added
+    after them depend on them, so if no task declares its inputs/outputs tasks are executed in the order they were
+    added. DCC free tasks are executed in a pool of worker threads, the rest of tasks are executed in the thread
+    that runs the scheduler
+    """
+
+    def __init__(self, max_workers=None):
+        super(BuildScheduler, self).__init__()
+
+        self._max_workers = max_workers
+        self._tasks = list()
+        self._tasks_dict = dict()
+        self._last_barrier = None
+        self._since_barrier = list()
+        self._producers = dict()
+        self._consumers = dict()
+
+    def add_task(self, name, parent=None, inputs=None, outputs=None, dcc_free=False):
+        """
+        Adds a new task into the scheduler
+        :param name: str, unique name of the task
+        :param parent: str or None, name of the parent task. Tasks are always executed after their parent task
+        :param inputs: list(str) or None, names of the data the task reads
+        :param outputs: list(str) or None, names of the data the task writes
+        :param dcc_free: bool, whether the task can be executed outside the main thread
+        :return: BuildTask
+        """
+
+        dependencies = set()
+        if self._last_barrier is not None:
+            dependencies.add(self._last_barrier)
+
+        if inputs is None and outputs is None:
+            dependencies.update(self._since_barrier)
+            self._last_barrier = name
+            self._since_barrier = list()
+            self._producers.clear()
+            self._consumers.clear()
+        else:
+            if parent in self._tasks_dict:
+                dependencies.add(parent)
+            for input_name in inputs or list():
+                if input_name in self._producers:
+                    dependencies.add(self._producers[input_name])
+                self._consumers.setdefault(input_name, list()).append(name)
+            for output_name in outputs or list():
+                if output_name in self._producers:
+                    dependencies.add(self._producers[output_name])
+                dependencies.update(self._consumers.pop(output_name, list()))
+                self._producers[output_name] = name
+            self._since_barrier.append(name)
+
+        dependencies.discard(name)
+        task = BuildTask(name, len(self._tasks), dependencies=dependencies, dcc_free=dcc_free)
+        self._tasks.append(task)
+        self._tasks_dict[name] = task
+
+        return task
+
+    def get_task(self, name):
+        """
+        Returns task with the given name
+        :param name: str
+        :return: BuildTask or None
+        """
+
+        return self._tasks_dict.get(name, None)
+
+    def get_tasks(self):
+        """
+        Returns all tasks added to the scheduler in the order they were added
+        :return: list(BuildTask)
+        """
+
+        return list(self._tasks)
+
+    def run(self, run_fn, finished_fn=None, stop_fn=None):
+        """
+        Executes all the tasks of the scheduler
+        If a task fails (raises an exception) or finished_fn raises an exception, no more tasks are started and the
+        exception is raised once all running tasks finish
+        :param run_fn: fn, function called with the name of the task to execute it. Its return value is the result
+        :param finished_fn: fn or None, function called in the scheduler thread with the name and the result of
+            each task once it finishes
+        :param stop_fn: fn or None, function called before starting each task. If it returns True no more tasks
+            are started
+        :return: dict, dictionary containing the result of each one of the executed tasks
+        """
+
+        results = dict()
+        remaining = dict()
+        dependants = dict()
+        ready = list()
+        for task in self._tasks:
+            remaining[task.name] = len(task.dependencies)
+            for dependency in task.dependencies:
+                dependants.setdefault(dependency, list()).append(task)
+            if not task.dependencies:
+                heapq.heappush(ready, task.index)
+
+        finished_queue = queue.Queue()
+        pool = None
+        running = 0
+        stopped = False
+
+        try:
+            while ready or running:
+                if not stopped and ready and stop_fn and stop_fn():
+                    stopped = True
+                if stopped:
+                    ready = list()
+                    if not running:
+                        break
+
+                main_tasks = list()
+                while ready:
+                    task = self._tasks[heapq.heappop(ready)]
+                    if not task.dcc_free:
+                        main_tasks.append(task.index)
+                        continue
+                    if pool is None:
+                        pool = ThreadPool(self._max_workers or multiprocessing.cpu_count())
+                    pool.apply_async(self._run_task, (run_fn, task.name, finished_queue))
+                    running += 1
+                for task_index in main_tasks:
+                    heapq.heappush(ready, task_index)
+
+                if ready:
+                    task = self._tasks[heapq.heappop(ready)]
+                    result = run_fn(task.name)
+                else:
+                    task_name, result, exc_info = finished_queue.get()
+                    running -= 1
+                    if exc_info:
+                        stopped = True
+                        self._reraise(exc_info)
+                    task = self._tasks_dict[task_name]
+
+                results[task.name] = result
+                if finished_fn:
+                    finished_fn(task.name, result)
+
+                for dependant in dependants.get(task.name, list()):
+                    remaining[dependant.name] -= 1
+                    if not remaining[dependant.name]:
+                        heapq.heappush(ready, dependant.index)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        return results
+
+    def _run_task(self, run_fn, task_name, finished_queue):
+        """
+        Internal function that executes given task in a worker thread and stores its result in the given queue
+        :param run_fn: fn
+        :param task_name: str
+        :param finished_queue: Queue
+        """
+
+        try:
+            result = run_fn(task_name)
+        except Exception:
+            finished_queue.put((task_name, None, sys.exc_info()))
+        else:
+            finished_queue.put((task_name, result, None))
+
+    def _reraise(self, exc_info):
+        """
+        Internal function that raises the exception of the given exception info in the scheduler thread
+        The traceback of the worker thread is kept, so errors point to the code that raised them
+        :param exc_info: tuple
+        """
+
+        LOGGER.error('Build task failed in worker thread', exc_info=exc_info)
+        six.reraise(*exc_info)
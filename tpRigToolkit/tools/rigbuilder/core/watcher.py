@@ -0,0 +1,556 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains file system watcher implementation for tpRigToolkit.tools.rigbuilder
+Watchers notify the changes done in disk (also the ones done by other users or processes) as a list of add, remove,
+rename and modify events, so widgets can update only the items that changed instead of rebuilding their contents
+Changes done by the tool itself (recorded with ownwrites module) are not notified
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import os
+import stat
+import fnmatch
+import logging
+from collections import namedtuple, OrderedDict
+
+from Qt.QtCore import *
+
+from tpRigToolkit.tools.rigbuilder.core import ownwrites
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+POLLING_ENV = 'RIGBUILDER_WATCHER_POLLING'
+
+ADDED = 'added'
+REMOVED = 'removed'
+RENAMED = 'renamed'
+MODIFIED = 'modified'
+
+DEFAULT_IGNORE = ('.*', '*~', '*.tmp', '*.pyc')
+
+WatchEvent = namedtuple('WatchEvent', ['type', 'path', 'new_path', 'is_dir'])
+
+# Snapshot of a file or folder: whether it is a folder, inode, modification time and size
+_Entry = namedtuple('_Entry', ['is_dir', 'inode', 'mtime', 'size'])
+
+
+def is_polling_forced():
+    """
+    Returns whether or not watchers must poll the file system instead of using native notifications
+    Polling can be forced with RIGBUILDER_WATCHER_POLLING environment variable (for example, for network drives
+    where native notifications are not available)
+    :return: bool
+    """
+
+    return os.environ.get(POLLING_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+class FileWatcher(QObject, object):
+    """
+    Class that watches folders and files and emits the changes done in them
+    Native notifications (inotify in Linux) are used when available. Paths that cannot be watched natively are polled
+    Changes are debounced: all changes done in a short interval are emitted together in a single list
+    """
+
+    DEBOUNCE_INTERVAL = 300
+    POLL_INTERVAL = 2000
+
+    changed = Signal(object)
+
+    def __init__(self, use_polling=None, parent=None):
+        super(FileWatcher, self).__init__(parent)
+
+        self._use_polling = is_polling_forced() if use_polling is None else use_polling
+        self._roots = OrderedDict()
+        self._directories = dict()
+        self._files = dict()
+        self._snapshots = dict()
+        self._mtimes = dict()
+        self._polled = set()
+        self._changed_directories = set()
+        self._changed_files = set()
+
+        self._native = None
+        if not self._use_polling:
+            self._native = QFileSystemWatcher(self)
+            self._native.directoryChanged.connect(self._on_directory_changed)
+            self._native.fileChanged.connect(self._on_file_changed)
+
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_INTERVAL)
+        self._debounce_timer.timeout.connect(self.flush)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL)
+        self._poll_timer.timeout.connect(self.poll)
+
+    # ================================================================================================
+    # ======================== BASE
+    # ================================================================================================
+
+    def is_polling(self):
+        """
+        Returns whether or not the watcher polls all its paths
+        :return: bool
+        """
+
+        return self._native is None
+
+    def roots(self):
+        """
+        Returns the paths watched by the watcher
+        :return: list(str)
+        """
+
+        return list(self._roots.keys())
+
+    def is_watching(self, path):
+        """
+        Returns whether or not the given folder or file is watched
+        :param path: str
+        :return: bool
+        """
+
+        path = _clean_path(path)
+
+        return path in self._directories or path in self._files
+
+    def add_root(self, path, recursive=False, watch_files=False, ignore=None):
+        """
+        Starts watching the given folder or file
+        :param path: str
+        :param recursive: bool, whether to watch also the sub folders of the folder (including new ones)
+        :param watch_files: bool or callable, whether to watch the contents of the files of the folders. If False, only
+            files that are added, removed or renamed are notified. If a callable is given, it receives the path of each
+            file and only the contents of the files for which it returns True are watched
+        :param ignore: list(str) or None, name patterns of the files and folders to ignore
+        :return: bool, True if the path is watched; False otherwise
+        """
+
+        if not path:
+            return False
+
+        path = _clean_path(path)
+        if path in self._roots:
+            return True
+
+        self._roots[path] = {
+            'recursive': recursive, 'watch_files': watch_files,
+            'ignore': tuple(DEFAULT_IGNORE if ignore is None else ignore)}
+
+        if os.path.isfile(path):
+            self._watch_file(path, path)
+        elif os.path.isdir(path):
+            self._watch_directory(path, path)
+        else:
+            self._roots.pop(path)
+            return False
+
+        return True
+
+    def remove_root(self, path):
+        """
+        Stops watching the given folder or file and all the paths that are watched because of it
+        :param path: str
+        """
+
+        path = _clean_path(path)
+        if self._roots.pop(path, None) is None:
+            return
+
+        for directory in [d for d, root in self._directories.items() if root == path]:
+            self._unwatch(directory)
+        for file_path in [f for f, (root, _) in self._files.items() if root == path]:
+            self._unwatch(file_path)
+
+    def clear(self):
+        """
+        Stops watching all paths and discards the changes that are not emitted yet
+        """
+
+        for path in list(self._roots.keys()):
+            self.remove_root(path)
+        self._changed_directories.clear()
+        self._changed_files.clear()
+        self._debounce_timer.stop()
+
+    def poll(self):
+        """
+        Checks the paths that are not watched natively for changes
+        """
+
+        for path in list(self._polled):
+            if path in self._directories:
+                if _get_mtime(path) != self._mtimes.get(path, None):
+                    self._changed_directories.add(path)
+            elif path in self._files:
+                if _get_entry(path) != self._files[path][1]:
+                    self._changed_files.add(path)
+
+        if self._changed_directories or self._changed_files:
+            self._debounce_timer.start()
+
+    def flush(self):
+        """
+        Emits all the changes detected since the last time changes were emitted
+        :return: list(WatchEvent)
+        """
+
+        self._debounce_timer.stop()
+        changed_directories = sorted(self._changed_directories)
+        changed_files = sorted(self._changed_files)
+        self._changed_directories.clear()
+        self._changed_files.clear()
+
+        added = list()
+        removed = list()
+        modified = OrderedDict()
+        for directory in changed_directories:
+            if directory not in self._directories:
+                continue
+            old_entries = self._snapshots.get(directory, dict())
+            new_entries = self._list_directory(directory)
+            if new_entries is None:
+                # The folder was removed, removal is notified by the parent folder if it is watched
+                if directory in self._roots and not self._is_parent_watched(directory):
+                    removed.append((directory, _Entry(True, 0, None, None)))
+                self._unwatch_tree(directory)
+                continue
+            self._snapshots[directory] = new_entries
+            self._mtimes[directory] = _get_mtime(directory)
+            for name, entry in old_entries.items():
+                path = '{}/{}'.format(directory, name)
+                new_entry = new_entries.get(name, None)
+                if new_entry is None or new_entry.is_dir != entry.is_dir:
+                    removed.append((path, entry))
+                elif not entry.is_dir and new_entry != entry:
+                    modified[path] = new_entry
+                    if path in self._files:
+                        self._files[path] = (self._files[path][0], new_entry)
+            for name, entry in new_entries.items():
+                old_entry = old_entries.get(name, None)
+                if old_entry is None or old_entry.is_dir != entry.is_dir:
+                    added.append(('{}/{}'.format(directory, name), entry))
+
+        for file_path in changed_files:
+            if file_path not in self._files:
+                continue
+            root, old_entry = self._files[file_path]
+            new_entry = _get_entry(file_path)
+            if new_entry is None:
+                if not self._is_parent_watched(file_path):
+                    removed.append((file_path, old_entry))
+                self._unwatch(file_path)
+            elif new_entry != old_entry:
+                modified[file_path] = new_entry
+                self._files[file_path] = (root, new_entry)
+                # Files replaced atomically are not watched natively anymore
+                if self._native is not None and file_path not in self._polled and \
+                        file_path not in self._native.files():
+                    self._add_native_path(file_path)
+
+        entries = dict(added)
+        entries.update(modified)
+        events = [event for event in self._get_events(added, removed, modified)
+                  if not self._is_own_write(event, entries.get(event.path, None))]
+        if events:
+            self.changed.emit(events)
+
+        return events
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _get_events(self, added, removed, modified):
+        """
+        Internal function that converts the detected changes into events
+        Files and folders that are removed and added with the same inode are notified as renamed
+        :param added: list(tuple(str, _Entry))
+        :param removed: list(tuple(str, _Entry))
+        :param modified: dict(str, _Entry)
+        :return: list(WatchEvent)
+        """
+
+        removed_inodes = dict()
+        for path, entry in removed:
+            if entry.inode:
+                removed_inodes[(entry.inode, entry.is_dir)] = path
+
+        renamed = list()
+        new_paths = list()
+        for path, entry in added:
+            old_path = removed_inodes.pop((entry.inode, entry.is_dir), None) if entry.inode else None
+            if old_path:
+                renamed.append(WatchEvent(RENAMED, old_path, path, entry.is_dir))
+            else:
+                new_paths.append(WatchEvent(ADDED, path, None, entry.is_dir))
+
+        renamed_paths = set(event.path for event in renamed)
+        events = [WatchEvent(REMOVED, path, None, entry.is_dir) for path, entry in removed
+                  if path not in renamed_paths]
+        events.extend(renamed)
+        events.extend(new_paths)
+        events.extend(WatchEvent(MODIFIED, path, None, False) for path in modified)
+
+        for event in events:
+            if event.type == REMOVED and event.is_dir:
+                self._unwatch_tree(event.path)
+            elif event.type == RENAMED and event.is_dir:
+                root = self._get_root(event.path)
+                self._unwatch_tree(event.path)
+                if root and self._roots.get(root, dict()).get('recursive', False):
+                    self._watch_directory(event.new_path, root)
+            elif event.type == RENAMED:
+                root = self._files.get(event.path, (None, None))[0]
+                self._unwatch(event.path)
+                if root != event.path:
+                    root = self._get_root(event.new_path)
+                    if not self._is_file_watched(event.new_path, root):
+                        root = None
+                if root:
+                    self._watch_file(event.new_path, root)
+            elif event.type == ADDED:
+                root = self._get_root(event.path)
+                options = self._roots.get(root, dict())
+                if event.is_dir and options.get('recursive', False):
+                    self._watch_directory(event.path, root)
+                elif not event.is_dir and self._is_file_watched(event.path, root):
+                    self._watch_file(event.path, root)
+
+        return events
+
+    def _is_own_write(self, event, entry):
+        """
+        Internal function that returns whether or not the given event was caused by a write done by the tool itself
+        :param event: WatchEvent
+        :param entry: _Entry or None, snapshot of the file after the change
+        :return: bool
+        """
+
+        if event.is_dir or event.type not in (ADDED, MODIFIED) or entry is None:
+            return False
+
+        return ownwrites.is_own_write(event.path, entry.inode, entry.mtime, entry.size)
+
+    def _is_file_watched(self, file_path, root):
+        """
+        Internal function that returns whether or not the contents of the given file must be watched
+        :param file_path: str
+        :param root: str or None
+        :return: bool
+        """
+
+        watch_files = self._roots.get(root, dict()).get('watch_files', False)
+        if callable(watch_files):
+            return bool(watch_files(file_path))
+
+        return bool(watch_files)
+
+    def _get_root(self, path):
+        """
+        Internal function that returns the root that makes the given path to be watched
+        :param path: str
+        :return: str or None
+        """
+
+        parent = path.rpartition('/')[0]
+
+        return self._directories.get(path, None) or self._directories.get(parent, None)
+
+    def _is_parent_watched(self, path):
+        """
+        Internal function that returns whether or not the folder that contains the given path is watched
+        :param path: str
+        :return: bool
+        """
+
+        return path.rpartition('/')[0] in self._directories
+
+    def _watch_directory(self, directory, root):
+        """
+        Internal function that starts watching the given folder and, if the root is recursive, its sub folders
+        :param directory: str
+        :param root: str
+        """
+
+        options = self._roots[root]
+        pending = [directory]
+        while pending:
+            path = pending.pop()
+            entries = self._list_directory(path, options['ignore'])
+            if entries is None:
+                continue
+            self._directories[path] = root
+            self._snapshots[path] = entries
+            self._mtimes[path] = _get_mtime(path)
+            self._add_native_path(path)
+            for name, entry in entries.items():
+                child_path = '{}/{}'.format(path, name)
+                if entry.is_dir and options['recursive']:
+                    pending.append(child_path)
+                elif not entry.is_dir and self._is_file_watched(child_path, root):
+                    self._watch_file(child_path, root, entry)
+
+    def _watch_file(self, file_path, root, entry=None):
+        """
+        Internal function that starts watching the contents of the given file
+        :param file_path: str
+        :param root: str
+        :param entry: _Entry or None
+        """
+
+        self._files[file_path] = (root, entry or _get_entry(file_path))
+        self._add_native_path(file_path)
+
+    def _add_native_path(self, path):
+        """
+        Internal function that adds the given path to the native watcher. If it is not possible, the path is polled
+        :param path: str
+        """
+
+        if self._native is not None:
+            try:
+                added = self._native.addPath(path)
+            except Exception as exc:
+                LOGGER.debug('Impossible to watch "{}" natively: {}'.format(path, exc))
+                added = False
+            # Some Qt bindings return None, in that case we check the paths that are watched
+            if added is None:
+                added = path in self._native.directories() or path in self._native.files()
+            if added:
+                return
+
+        self._polled.add(path)
+        if not self._poll_timer.isActive():
+            self._poll_timer.start()
+
+    def _unwatch(self, path):
+        """
+        Internal function that stops watching the given folder or file
+        :param path: str
+        """
+
+        self._directories.pop(path, None)
+        self._files.pop(path, None)
+        self._snapshots.pop(path, None)
+        self._mtimes.pop(path, None)
+        if path in self._polled:
+            self._polled.discard(path)
+            if not self._polled:
+                self._poll_timer.stop()
+        elif self._native is not None:
+            self._native.removePath(path)
+
+    def _unwatch_tree(self, directory):
+        """
+        Internal function that stops watching the given folder and all the folders and files located inside it
+        :param directory: str
+        """
+
+        prefix = '{}/'.format(directory)
+        paths = [directory] + [p for p in list(self._directories.keys()) + list(self._files.keys())
+                               if p.startswith(prefix)]
+        for path in paths:
+            self._unwatch(path)
+
+    def _list_directory(self, directory, ignore=None):
+        """
+        Internal function that returns the snapshot of the files and folders located directly under given folder
+        :param directory: str
+        :param ignore: list(str) or None, name patterns to ignore. If not given, root ones are used
+        :return: dict(str, _Entry) or None if the folder does not exist
+        """
+
+        if ignore is None:
+            root = self._directories.get(directory, None)
+            ignore = self._roots[root]['ignore'] if root in self._roots else DEFAULT_IGNORE
+
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return None
+
+        entries = dict()
+        for name in names:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in ignore):
+                continue
+            entry = _get_entry('{}/{}'.format(directory, name))
+            if entry:
+                entries[name] = entry
+
+        return entries
+
+    # ================================================================================================
+    # ======================== CALLBACKS
+    # ================================================================================================
+
+    def _on_directory_changed(self, path):
+        """
+        Internal callback function that is called when the native watcher detects a change in a folder
+        :param path: str
+        """
+
+        self._changed_directories.add(_clean_path(path))
+        self._debounce_timer.start()
+
+    def _on_file_changed(self, path):
+        """
+        Internal callback function that is called when the native watcher detects a change in a file
+        :param path: str
+        """
+
+        self._changed_files.add(_clean_path(path))
+        self._debounce_timer.start()
+
+
+def _clean_path(path):
+    """
+    Internal function that returns given path with forward slashes and without trailing slashes
+    :param path: str
+    :return: str
+    """
+
+    path = path.replace('\\', '/')
+
+    return path.rstrip('/') or path
+
+
+def _get_mtime(path):
+    """
+    Internal function that returns the modification time of the given path
+    :param path: str
+    :return: float or None
+    """
+
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _get_entry(path):
+    """
+    Internal function that returns the snapshot of the given file or folder
+    :param path: str
+    :return: _Entry or None if the path does not exist
+    """
+
+    try:
+        path_stat = os.lstat(path)
+    except OSError:
+        return None
+
+    if stat.S_ISDIR(path_stat.st_mode):
+        return _Entry(True, path_stat.st_ino, None, None)
+
+    return _Entry(False, path_stat.st_ino, path_stat.st_mtime, path_stat.st_size)
@@ -7,6 +7,8 @@ Module that contains base tree item implementation
 
 from __future__ import print_function, division, absolute_import
 
+import contextlib
+
 from Qt.QtCore import *
 from Qt.QtWidgets import *
 from Qt.QtGui import *
@@ -15,20 +17,120 @@ import tpDcc as tp
 from tpDcc.libs.python import decorators, fileio, path as path_utils
 from tpDcc.libs.qt.widgets import treewidgets
 
+# Icons and context menus are shared by all items, so they are only created once
+_icons = dict()
+_fill_icons = dict()
+_context_menus = dict()
+_dcc_version = list()
+
+
+def get_icon(name):
+    """
+    Returns the icon with the given name. Icons are loaded only once and they are shared by all items
+    :param name: str
+    :return: QIcon
+    """
+
+    icon = _icons.get(name, None)
+    if icon is None:
+        icon = _icons[name] = tp.ResourcesMgr().icon(name)
+
+    return icon
+
+
+def get_fill_icon(shape, r, g, b):
+    """
+    Returns an icon filled with the given color. Icons are drawn only once and they are shared by all items
+    :param shape: str, 'square', 'circle' or 'radial'
+    :param r: float
+    :param g: float
+    :param b: float
+    :return: QIcon
+    """
+
+    key = (shape, r, g, b)
+    icon = _fill_icons.get(key, None)
+    if icon is not None:
+        return icon
+
+    alpha = 1
+    if r == 0 and g == 0 and b == 0:
+        alpha = 0
+
+    pixmap = QPixmap(20, 20)
+    pixmap.fill(Qt.transparent)
+    painter = QPainter(pixmap)
+    if shape == 'circle':
+        painter.setBrush(QColor.fromRgbF(r, g, b, alpha))
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(0, 0, 20, 20)
+    elif shape == 'radial':
+        gradient = QRadialGradient(10, 10, 10)
+        gradient.setColorAt(0, QColor.fromRgbF(r, g, b, alpha))
+        gradient.setColorAt(1, QColor.fromRgbF(0, 0, 0, 0))
+        painter.fillRect(0, 0, 100, 100, gradient)
+    else:
+        painter.fillRect(0, 0, 100, 100, QColor.fromRgbF(r, g, b, alpha))
+    painter.end()
+
+    icon = _fill_icons[key] = QIcon(pixmap)
+
+    return icon
+
+
+def get_dcc_version():
+    """
+    Returns the version of the current DCC. Version is only queried once
+    :return: int
+    """
+
+    if not _dcc_version:
+        _dcc_version.append(tp.Dcc.get_version())
+
+    return _dcc_version[0]
+
+
+def get_state_icon(state):
+    """
+    Returns the icon used to show the given run state
+    :param state: int, -1 (not run), 0 (error), 1 (success), 2 (warning), 3 (skipped) or 4 (running)
+    :return: QIcon or None
+    """
+
+    if state == 0:
+        return get_icon('error')
+    if state == 1:
+        return get_icon('ok')
+    if state == 2:
+        return get_icon('warning')
+    if state == 4:
+        return get_icon('wait')
+    if state not in (-1, 3):
+        return None
+
+    shape = 'radial'
+    if tp.is_maya():
+        maya_version = get_dcc_version()
+        if maya_version > 2015 or maya_version == 0:
+            shape = 'circle'
+    if state == -1:
+        return get_fill_icon(shape, 0, 0, 0) if shape == 'circle' else get_fill_icon(shape, 0.6, 0.6, 0.6)
+
+    return get_fill_icon(shape, .65, .7, .225)
+
 
 class BaseItem(treewidgets.TreeWidgetItem, object):
+
+    # Item whose context menu is being shown
+    context_item = None
+
     def __init__(self, parent=None):
 
         self._log = ''
         self._object = None
         self._run_state = -1
-        self._context_menu = None
         self._handle_manifest = False
-
-        self.ok_icon = tp.ResourcesMgr().icon('ok')
-        self.warning_icon = tp.ResourcesMgr().icon('warning')
-        self.error_icon = tp.ResourcesMgr().icon('error')
-        self.wait_icon = tp.ResourcesMgr().icon('wait')
+        self._reindexing = False
 
         super(BaseItem, self).__init__(parent)
 
@@ -36,18 +138,32 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         self.setCheckState(0, Qt.Unchecked)
 
         if tp.is_maya():
-            maya_version = tp.Dcc.get_version()
+            maya_version = get_dcc_version()
             if maya_version > 2015 or maya_version == 0:
                 self._circle_fill_icon(0, 0, 0)
             if maya_version < 2016 and maya_version != 0:
                 self._radial_fill_icon(0, 0, 0)
 
-        self._create_context_menu()
-
     # ================================================================================================
-    # ======================== OVERRIDES
+    # ======================== PROPERTIES
     # ================================================================================================
 
+    @property
+    def ok_icon(self):
+        return get_icon('ok')
+
+    @property
+    def warning_icon(self):
+        return get_icon('warning')
+
+    @property
+    def error_icon(self):
+        return get_icon('error')
+
+    @property
+    def wait_icon(self):
+        return get_icon('wait')
+
     @property
     def handle_manifest(self):
         return self._handle_manifest
@@ -87,7 +203,11 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         :param value: variant
         """
 
-        super(BaseItem, self).setData(column, role, value)
+        if column == 0 and role in (Qt.DisplayRole, Qt.EditRole):
+            with self._reindex():
+                super(BaseItem, self).setData(column, role, value)
+        else:
+            super(BaseItem, self).setData(column, role, value)
 
         if value == 0 or value is False:
             check_state = Qt.Unchecked
@@ -136,7 +256,8 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         """
 
         text = '   ' + text
-        super(BaseItem, self).setText(0, text)
+        with self._reindex():
+            super(BaseItem, self).setText(0, text)
 
     def get_name(self, keep_extension=False):
         """
@@ -223,7 +344,7 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         """
 
         if tp.is_maya():
-            maya_version = tp.Dcc.get_version()
+            maya_version = get_dcc_version()
             if maya_version < 2016 and maya_version != 0:
                 if state == 0:
                     self._error_icon()
@@ -278,10 +399,16 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
     def get_context_menu(self):
         """
         Returns context menu of the item
+        The context menu is shared by all the items of the same class, it is created the first time it is requested
         :return: QMenu
         """
 
-        return self._context_menu
+        context_menu = _context_menus.get(self.__class__, None)
+        if context_menu is None:
+            context_menu = _context_menus[self.__class__] = self._create_context_menu()
+        BaseItem.context_item = self
+
+        return context_menu
 
     def matches(self, item):
         """
@@ -302,12 +429,36 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
     # ======================== INTERNAL
     # ================================================================================================
 
-    def _create_context_menu(self):
+    @classmethod
+    def _create_context_menu(cls):
         """
-        Creates context menu for this item
+        Creates the context menu shared by all the items of this class
+        Actions must act over the item stored in context_item
+        :return: QMenu
         """
 
-        self._context_menu = QMenu()
+        return QMenu()
+
+    @contextlib.contextmanager
+    def _reindex(self):
+        """
+        Context manager used while the text of the item changes
+        Items are indexed by path in the tree, so the item and its children are removed from the index before the
+        change and added back with their new path after it
+        """
+
+        index_tree = self.treeWidget()
+        if self._reindexing or not hasattr(index_tree, '_unindex_items'):
+            yield
+            return
+
+        self._reindexing = True
+        index_tree._unindex_items(self)
+        try:
+            yield
+        finally:
+            self._reindexing = False
+            index_tree._index_items(self)
 
     def _square_fill_icon(self, r, g, b):
         """
@@ -317,18 +468,7 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         :param b: float
         """
 
-        alpha = 1
-        if r == 0 and g == 0 and b == 0:
-            alpha = 0
-
-        pixmap = QPixmap(20, 20)
-        pixmap.fill(QColor.fromRgbF(r, g, b, alpha))
-        painter = QPainter(pixmap)
-        painter.fillRect(0, 0, 100, 100, QColor.fromRgbF(r, g, b, alpha))
-        painter.end()
-
-        icon = QIcon(pixmap)
-        self.setIcon(0, icon)
+        self.setIcon(0, get_fill_icon('square', r, g, b))
 
     def _circle_fill_icon(self, r, g, b):
         """
@@ -338,23 +478,7 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         :param b: float
         """
 
-        alpha = 1
-        if r == 0 and g == 0 and b == 0:
-            alpha = 0
-
-        pixmap = QPixmap(20, 20)
-        pixmap.fill(Qt.transparent)
-        # pixmap.fill(qt.QColor.fromRgbF(r, g, b, alpha))
-
-        painter = QPainter(pixmap)
-        painter.setBrush(QColor.fromRgbF(r, g, b, alpha))
-        painter.setPen(Qt.NoPen)
-        painter.drawEllipse(0, 0, 20, 20)
-        # painter.fillRect(0, 0, 100, 100, qt.QColor.fromRgbF(r, g, b, alpha))
-        painter.end()
-
-        icon = QIcon(pixmap)
-        self.setIcon(0, icon)
+        self.setIcon(0, get_fill_icon('circle', r, g, b))
 
     def _radial_fill_icon(self, r, g, b):
         """
@@ -363,23 +487,8 @@ class BaseItem(treewidgets.TreeWidgetItem, object):
         :param g: float
         :param b: float
         """
-        alpha = 1
-        if r == 0 and g == 0 and b == 0:
-            alpha = 0
-
-        pixmap = QPixmap(20, 20)
-        pixmap.fill(Qt.transparent)
-        gradient = QRadialGradient(10, 10, 10)
-        gradient.setColorAt(0, QColor.fromRgbF(r, g, b, alpha))
-        gradient.setColorAt(1, QColor.fromRgbF(0, 0, 0, 0))
-
-        painter = QPainter(pixmap)
-        painter.fillRect(0, 0, 100, 100, gradient)
-        painter.end()
-
-        icon = QIcon(pixmap)
 
-        self.setIcon(0, icon)
+        self.setIcon(0, get_fill_icon('radial', r, g, b))
 
     def _ok_icon(self):
         """
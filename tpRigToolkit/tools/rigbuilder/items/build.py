@@ -207,6 +207,9 @@ class BuildItem(base.BaseItem, object):
 
     buildSignals = BuildItemSignals()
 
+    # Actions added by the node of the last item that requested the shared context menu
+    _node_actions = list()
+
     def __init__(self, parent=None):
         super(BuildItem, self).__init__(parent=parent)
 
@@ -274,61 +277,84 @@ class BuildItem(base.BaseItem, object):
         text = '                ' + text
         super(BuildItem, self).setText(0, text)
 
-    def _create_context_menu(self):
+    def get_context_menu(self):
+        """
+        Overrides base BaseItem get_context_menu function
+        Context menu is shared by all build items, so the custom actions of the previous node are replaced by the
+        custom actions of the node of this item
+        :return: QMenu
+        """
+
+        context_menu = super(BuildItem, self).get_context_menu()
+
+        for node_action in BuildItem._node_actions:
+            context_menu.removeAction(node_action)
+            node_action.deleteLater()
+        default_actions = context_menu.actions()
+        if self._node:
+            self._node.setup_context_menu(context_menu)
+        BuildItem._node_actions = [action for action in context_menu.actions() if action not in default_actions]
+
+        return context_menu
+
+    @classmethod
+    def _create_context_menu(cls):
         """
         Overrides base BuildItem create_context_menu function
-        Creates context menu for this item
+        Creates context menu shared by all build items
         :return: QMenu
         """
 
-        self._context_menu = QMenu()
-
-        play_icon = tpDcc.ResourcesMgr().icon('play')
-        add_icon = tpDcc.ResourcesMgr().icon('add')
-        rename_icon = tpDcc.ResourcesMgr().icon('rename')
-        duplicate_icon = tpDcc.ResourcesMgr().icon('clone')
-        delete_icon = tpDcc.ResourcesMgr().icon('delete')
-        color_icon = tpDcc.ResourcesMgr().icon('fill_color')
-        reset_icon = tpDcc.ResourcesMgr().icon('reset')
-        browse_icon = tpDcc.ResourcesMgr().icon('open')
-        cancel_icon = tpDcc.ResourcesMgr().icon('cancel')
-        start_icon = tpDcc.ResourcesMgr().icon('start')
-        flag_icon = tpDcc.ResourcesMgr().icon('finish_flag')
-
-        build_action = self._context_menu.addAction(play_icon, 'Build')
-        build_block_action = self._context_menu.addAction(play_icon, 'Build Block')
-        self._context_menu.addSeparator()
-        add_action = self._context_menu.addAction(add_icon, 'Add Builder Node')
-        self._context_menu.addSeparator()
-        rename_action = self._context_menu.addAction(rename_icon, 'Rename')
-        duplicate_action = self._context_menu.addAction(duplicate_icon, 'Duplicate')
-        delete_action = self._context_menu.addAction(delete_icon, 'Delete')
-        self._context_menu.addSeparator()
-        bg_color_action = self._context_menu.addAction(color_icon, 'Change Background Color')
-        reset_color_action = self._context_menu.addAction(reset_icon, 'Reset Background Color')
-        self._context_menu.addSeparator()
-        set_start_point_action = self._context_menu.addAction(start_icon, 'Set Start Point')
-        cancel_start_point_action = self._context_menu.addAction(cancel_icon, 'Cancel Start Point')
-        self._context_menu.addSeparator()
-        set_break_point_action = self._context_menu.addAction(flag_icon, 'Set Break Point')
-        cancel_break_point_action = self._context_menu.addAction(cancel_icon, 'Cancel Break Point')
-        self._context_menu.addSeparator()
-        browse_action = self._context_menu.addAction(browse_icon, 'Browse')
-        self._context_menu.addSeparator()
-
-        build_action.triggered.connect(self.buildSignals.runNode.emit)
-        build_block_action.triggered.connect(self.buildSignals.runBlock.emit)
-        add_action.triggered.connect(self.buildSignals.addNode.emit)
-        rename_action.triggered.connect(self.buildSignals.renameNode.emit)
-        duplicate_action.triggered.connect(self.buildSignals.duplicateNode.emit)
-        delete_action.triggered.connect(self.buildSignals.deleteNode.emit)
-        bg_color_action.triggered.connect(self.buildSignals.changeBackgroundColor.emit)
-        reset_color_action.triggered.connect(self.buildSignals.resetBackgroundColor.emit)
-        set_start_point_action.triggered.connect(self.buildSignals.setStartPoint)
-        cancel_start_point_action.triggered.connect(self.buildSignals.cancelStartPoint)
-        set_break_point_action.triggered.connect(self.buildSignals.setBreakPoint)
-        cancel_break_point_action.triggered.connect(self.buildSignals.cancelBreakPoint)
-        browse_action.triggered.connect(self.buildSignals.browseNode.emit)
+        context_menu = QMenu()
+
+        play_icon = base.get_icon('play')
+        add_icon = base.get_icon('add')
+        rename_icon = base.get_icon('rename')
+        duplicate_icon = base.get_icon('clone')
+        delete_icon = base.get_icon('delete')
+        color_icon = base.get_icon('fill_color')
+        reset_icon = base.get_icon('reset')
+        browse_icon = base.get_icon('open')
+        cancel_icon = base.get_icon('cancel')
+        start_icon = base.get_icon('start')
+        flag_icon = base.get_icon('finish_flag')
+
+        build_action = context_menu.addAction(play_icon, 'Build')
+        build_block_action = context_menu.addAction(play_icon, 'Build Block')
+        context_menu.addSeparator()
+        add_action = context_menu.addAction(add_icon, 'Add Builder Node')
+        context_menu.addSeparator()
+        rename_action = context_menu.addAction(rename_icon, 'Rename')
+        duplicate_action = context_menu.addAction(duplicate_icon, 'Duplicate')
+        delete_action = context_menu.addAction(delete_icon, 'Delete')
+        context_menu.addSeparator()
+        bg_color_action = context_menu.addAction(color_icon, 'Change Background Color')
+        reset_color_action = context_menu.addAction(reset_icon, 'Reset Background Color')
+        context_menu.addSeparator()
+        set_start_point_action = context_menu.addAction(start_icon, 'Set Start Point')
+        cancel_start_point_action = context_menu.addAction(cancel_icon, 'Cancel Start Point')
+        context_menu.addSeparator()
+        set_break_point_action = context_menu.addAction(flag_icon, 'Set Break Point')
+        cancel_break_point_action = context_menu.addAction(cancel_icon, 'Cancel Break Point')
+        context_menu.addSeparator()
+        browse_action = context_menu.addAction(browse_icon, 'Browse')
+        context_menu.addSeparator()
+
+        build_action.triggered.connect(cls.buildSignals.runNode.emit)
+        build_block_action.triggered.connect(cls.buildSignals.runBlock.emit)
+        add_action.triggered.connect(cls.buildSignals.addNode.emit)
+        rename_action.triggered.connect(cls.buildSignals.renameNode.emit)
+        duplicate_action.triggered.connect(cls.buildSignals.duplicateNode.emit)
+        delete_action.triggered.connect(cls.buildSignals.deleteNode.emit)
+        bg_color_action.triggered.connect(cls.buildSignals.changeBackgroundColor.emit)
+        reset_color_action.triggered.connect(cls.buildSignals.resetBackgroundColor.emit)
+        set_start_point_action.triggered.connect(cls.buildSignals.setStartPoint)
+        cancel_start_point_action.triggered.connect(cls.buildSignals.cancelStartPoint)
+        set_break_point_action.triggered.connect(cls.buildSignals.setBreakPoint)
+        cancel_break_point_action.triggered.connect(cls.buildSignals.cancelBreakPoint)
+        browse_action.triggered.connect(cls.buildSignals.browseNode.emit)
+
+        return context_menu
 
     # ================================================================================================
     # ======================== NODE
@@ -339,8 +365,6 @@ class BuildItem(base.BaseItem, object):
         item_name = self.get_name()
         builder_node = rig_object.get_build_node_instance(item_name)
         self._node = builder_node
-        if self._node:
-            self._node.setup_context_menu(self._context_menu)
 
     def rename_node(self, new_name):
         rig_object = self.get_object()
@@ -12,7 +12,6 @@ import os
 from Qt.QtCore import *
 from Qt.QtWidgets import *
 
-import tpDcc
 from tpDcc.libs.python import fileio, path as path_utils
 
 import tpRigToolkit
@@ -46,62 +45,65 @@ class ScriptItem(base.BaseItem, object):
     # ======================== OVERRIDES
     # ================================================================================================
 
-    def _create_context_menu(self):
+    @classmethod
+    def _create_context_menu(cls):
         """
         Overrides base BuildItem create_context_menu function
-        Creates context menu for this item
+        Creates context menu shared by all script items
         :return: QMenu
         """
 
-        self._context_menu = QMenu()
-
-        python_icon = tpDcc.ResourcesMgr().icon('python')
-        import_icon = tpDcc.ResourcesMgr().icon('import')
-        play_icon = tpDcc.ResourcesMgr().icon('play')
-        rename_icon = tpDcc.ResourcesMgr().icon('rename')
-        duplicate_icon = tpDcc.ResourcesMgr().icon('clone')
-        delete_icon = tpDcc.ResourcesMgr().icon('delete')
-        browse_icon = tpDcc.ResourcesMgr().icon('open')
-        external_icon = tpDcc.ResourcesMgr().icon('external')
-        new_window_icon = tpDcc.ResourcesMgr().icon('new_window')
-        cancel_icon = tpDcc.ResourcesMgr().icon('cancel')
-        start_icon = tpDcc.ResourcesMgr().icon('start')
-        flag_icon = tpDcc.ResourcesMgr().icon('finish_flag')
-
-        new_python_action = self._context_menu.addAction(python_icon, 'New Python Code')
-        new_data_import_action = self._context_menu.addAction(import_icon, 'New Data Import')
-        self._context_menu.addSeparator()
-        run_action = self._context_menu.addAction(play_icon, 'Run')
-        run_group_action = self._context_menu.addAction(play_icon, 'Run Group')
-        self._context_menu.addSeparator()
-        rename_action = self._context_menu.addAction(rename_icon, 'Rename')
-        duplicate_action = self._context_menu.addAction(duplicate_icon, 'Duplicate')
-        delete_action = self._context_menu.addAction(delete_icon, 'Delete')
-        self._context_menu.addSeparator()
-        set_start_point_action = self._context_menu.addAction(start_icon, 'Set Start Point')
-        cancel_start_point_action = self._context_menu.addAction(cancel_icon, 'Cancel Start Point')
-        self._context_menu.addSeparator()
-        set_break_point_action = self._context_menu.addAction(flag_icon, 'Set Break Point')
-        cancel_break_point_action = self._context_menu.addAction(cancel_icon, 'Cancel Break Point')
-        self._context_menu.addSeparator()
-        browse_action = self._context_menu.addAction(browse_icon, 'Browse')
-        external_window_action = self._context_menu.addAction(external_icon, 'Open in External')
-        new_window_action = self._context_menu.addAction(new_window_icon, 'Open in New Window')
-
-        new_python_action.triggered.connect(self.scriptSignals.createPythonCode.emit)
-        new_data_import_action.triggered.connect(self.scriptSignals.createDataImport.emit)
-        run_action.triggered.connect(self.scriptSignals.runCode.emit)
-        run_group_action.triggered.connect(self.scriptSignals.runCodeGroup.emit)
-        rename_action.triggered.connect(self.scriptSignals.renameCode.emit)
-        duplicate_action.triggered.connect(self.scriptSignals.duplicateCode.emit)
-        delete_action.triggered.connect(self.scriptSignals.deleteCode.emit)
-        set_start_point_action.triggered.connect(self.scriptSignals.setStartPoint.emit)
-        cancel_start_point_action.triggered.connect(self.scriptSignals.cancelStartPoint.emit)
-        set_break_point_action.triggered.connect(self.scriptSignals.setBreakPoint.emit)
-        cancel_break_point_action.triggered.connect(self.scriptSignals.cancelBreakPoint.emit)
-        browse_action.triggered.connect(self.scriptSignals.browseCode.emit)
-        external_window_action.triggered.connect(self._on_open_in_external)
-        new_window_action.triggered.connect(self._on_open_in_window)
+        context_menu = QMenu()
+
+        python_icon = base.get_icon('python')
+        import_icon = base.get_icon('import')
+        play_icon = base.get_icon('play')
+        rename_icon = base.get_icon('rename')
+        duplicate_icon = base.get_icon('clone')
+        delete_icon = base.get_icon('delete')
+        browse_icon = base.get_icon('open')
+        external_icon = base.get_icon('external')
+        new_window_icon = base.get_icon('new_window')
+        cancel_icon = base.get_icon('cancel')
+        start_icon = base.get_icon('start')
+        flag_icon = base.get_icon('finish_flag')
+
+        new_python_action = context_menu.addAction(python_icon, 'New Python Code')
+        new_data_import_action = context_menu.addAction(import_icon, 'New Data Import')
+        context_menu.addSeparator()
+        run_action = context_menu.addAction(play_icon, 'Run')
+        run_group_action = context_menu.addAction(play_icon, 'Run Group')
+        context_menu.addSeparator()
+        rename_action = context_menu.addAction(rename_icon, 'Rename')
+        duplicate_action = context_menu.addAction(duplicate_icon, 'Duplicate')
+        delete_action = context_menu.addAction(delete_icon, 'Delete')
+        context_menu.addSeparator()
+        set_start_point_action = context_menu.addAction(start_icon, 'Set Start Point')
+        cancel_start_point_action = context_menu.addAction(cancel_icon, 'Cancel Start Point')
+        context_menu.addSeparator()
+        set_break_point_action = context_menu.addAction(flag_icon, 'Set Break Point')
+        cancel_break_point_action = context_menu.addAction(cancel_icon, 'Cancel Break Point')
+        context_menu.addSeparator()
+        browse_action = context_menu.addAction(browse_icon, 'Browse')
+        external_window_action = context_menu.addAction(external_icon, 'Open in External')
+        new_window_action = context_menu.addAction(new_window_icon, 'Open in New Window')
+
+        new_python_action.triggered.connect(cls.scriptSignals.createPythonCode.emit)
+        new_data_import_action.triggered.connect(cls.scriptSignals.createDataImport.emit)
+        run_action.triggered.connect(cls.scriptSignals.runCode.emit)
+        run_group_action.triggered.connect(cls.scriptSignals.runCodeGroup.emit)
+        rename_action.triggered.connect(cls.scriptSignals.renameCode.emit)
+        duplicate_action.triggered.connect(cls.scriptSignals.duplicateCode.emit)
+        delete_action.triggered.connect(cls.scriptSignals.deleteCode.emit)
+        set_start_point_action.triggered.connect(cls.scriptSignals.setStartPoint.emit)
+        cancel_start_point_action.triggered.connect(cls.scriptSignals.cancelStartPoint.emit)
+        set_break_point_action.triggered.connect(cls.scriptSignals.setBreakPoint.emit)
+        cancel_break_point_action.triggered.connect(cls.scriptSignals.cancelBreakPoint.emit)
+        browse_action.triggered.connect(cls.scriptSignals.browseCode.emit)
+        external_window_action.triggered.connect(lambda: base.BaseItem.context_item._on_open_in_external())
+        new_window_action.triggered.connect(lambda: base.BaseItem.context_item._on_open_in_window())
+
+        return context_menu
 
     # ================================================================================================
     # ======================== BASE
@@ -19,7 +19,7 @@ from tpDcc.core import options
 from tpDcc.libs.python import folder, settings, version, path as path_utils
 
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import consts, utils, data
+from tpRigToolkit.tools.rigbuilder.core import consts, utils, data, optionstore
 from tpRigToolkit.tools.rigbuilder.objects import helpers
 
 
@@ -70,12 +70,13 @@ class BaseObject(options.OptionObject):
     def _setup_options(self):
         """
         Internal function that initializes option files
+        Option values are read from an option store, so options files are only parsed again if they change
         """
 
         super(BaseObject, self)._setup_options()
 
-        if not self._option_settings:
-            self._option_settings = settings.JSONSettings()
+        if not isinstance(self._option_settings, optionstore.OptionStore):
+            self._option_settings = optionstore.OptionStore()
 
         self._option_settings.set_directory(
             self._get_override_path(), '{}.{}'.format(self.OPTIONS_FILE_NAME, self.OPTIONS_FILE_EXTENSION))
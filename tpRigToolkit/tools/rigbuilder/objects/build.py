@@ -30,6 +30,13 @@ class BuildObject(script.ScriptObject, object):
     PROPERTIES_FILE_NAME = consts.PROPERTIES_FILE_NAME
     PROPERTIES_FILE_EXTENSION = consts.PROPERTIES_FILE_EXTENSION
 
+    # Build nodes that declare their inputs and outputs (list of data names) can be executed in any order that
+    # respects those dependencies. If DCC_FREE is True, the node is executed in a worker thread, so it must not
+    # access the DCC scene
+    INPUTS = None
+    OUTPUTS = None
+    DCC_FREE = False
+
     def __init__(self, name=None, rig=None):
 
         self._item_icon = None
@@ -56,6 +63,30 @@ class BuildObject(script.ScriptObject, object):
 
         return tpDcc.ResourcesMgr().icon(self.ICON)
 
+    def get_inputs(self):
+        """
+        Returns the names of the data this build node reads during the build
+        :return: list(str) or None, None if the node does not declare its inputs
+        """
+
+        return self.INPUTS
+
+    def get_outputs(self):
+        """
+        Returns the names of the data this build node writes during the build
+        :return: list(str) or None, None if the node does not declare its outputs
+        """
+
+        return self.OUTPUTS
+
+    def is_dcc_free(self):
+        """
+        Returns whether or not this build node can be executed without accessing the DCC
+        :return: bool
+        """
+
+        return self.DCC_FREE
+
     def pre_run(self, *args, **kwargs):
         """
         Function that is executed before calling main build function
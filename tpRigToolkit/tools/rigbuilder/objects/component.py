@@ -8,7 +8,7 @@ Module that contains build node implementation rigbuilder Rig Components
 import os
 import tpDcc as tp
 
-from tpDcc.libs.python import path as path_utils, folder as folder_utils
+from tpDcc.libs.python import path as path_utils
 
 from tpRigToolkit.tools.rigbuilder.core import api
 from tpRigToolkit.tools.rigbuilder.objects import build
@@ -136,16 +136,9 @@ class RigComponent(build.BuildObject, object):
         if not self._rig:
             return children_components
 
-        rig_path = self._rig.get_code_path()
-        current_path = self.get_path()
-        folders = folder_utils.get_folders(current_path)
-        if not folders:
-            return children_components
-
-        for folder_name in folders:
-            child_path = os.path.join(current_path, folder_name)
-            child_component_name = path_utils.clean_path(os.path.relpath(child_path, rig_path))
-            child_component = self._rig.get_build_node_instance(child_component_name)
+        component_graph = self._rig.get_component_graph()
+        for child_component_name in component_graph.get_children(self._get_component_name()):
+            child_component = component_graph.get_instance(child_component_name)
             if child_component:
                 children_components.append(child_component)
 
@@ -159,13 +152,10 @@ class RigComponent(build.BuildObject, object):
         if not self._rig:
             return
 
-        current_path = self.get_path()
-        parent_path = '/'.join(current_path.split('/')[:-1])
-        rig_path = self._rig.get_code_path()
-        parent_component_name = path_utils.clean_path(os.path.relpath(parent_path, rig_path))
-        parent_component = self._rig.get_build_node_instance(parent_component_name)
+        component_graph = self._rig.get_component_graph()
+        parent_component_name = component_graph.get_parent(self._get_component_name())
 
-        return parent_component
+        return component_graph.get_instance(parent_component_name)
 
     def get_main_group(self, get_parent_component=False):
         """
@@ -215,6 +205,14 @@ class RigComponent(build.BuildObject, object):
 
         return setup_grp
 
+    def _get_component_name(self):
+        """
+        Internal function that returns the name of the build node of this component in its rig
+        :return: str
+        """
+
+        return path_utils.clean_path(os.path.relpath(self.get_path(), self._rig.get_code_path()))
+
 
 class ChainComponent(RigComponent, object):
     """
@@ -13,15 +13,15 @@ __maintainer__ = "Tomas Poveda"
 __email__ = "tpovedatd@gmail.com"
 
 import os
+import copy
 import string
 import logging
-import __builtin__      # Not remove because its used to clean rig script builtins
 
 import tpDcc as tp
 from tpDcc.libs.python import osplatform, folder, fileio, yamlio, version, log, path as path_utils
 from tpDcc.core import scripts
 
-from tpRigToolkit.tools.rigbuilder.core import consts, utils
+from tpRigToolkit.tools.rigbuilder.core import consts, utils, rigindex
 
 LOGGER = logging.getLogger('tpRigToolkit')
 
@@ -170,38 +170,61 @@ class ScriptHelpers(ObjectsHelpers, object):
 
         return builtins
 
-    @staticmethod
-    def setup_code_builtins(script_object, **kwargs):
+
+class ScriptContext(object):
+    """
+    Class that stores the variables (node, rig, project, show, cmds, ...) available to the scripts executed by a
+    script object. Variables are injected into the namespace of the script modules instead of being stored in the
+    builtins module, so scripts can be executed at the same time using different contexts
+    """
+
+    def __init__(self, build_object, rig_object=None, project=None, **kwargs):
+        super(ScriptContext, self).__init__()
+
+        self._values = ScriptHelpers.get_code_builtins(
+            build_object, rig_object=rig_object, project=project, **kwargs)
+
+    def get(self, name, default=None):
         """
-        Setup given rig builtins
-        :param script_object: ScriptObject
+        Returns the value of the given context variable
+        :param name: str
+        :param default: variant, value returned if the variable does not exist
+        :return: variant
         """
 
-        builtins = ScriptHelpers.get_code_builtins(script_object, **kwargs)
-        for builtin in builtins:
-            try:
-                exec ('del(__builtin__.%s)' % builtin)
-            except Exception:
-                pass
-            builtin_value = builtins[builtin]
-            exec '__builtin__.%s = builtin_value' % builtin
+        return self._values.get(name, default)
 
-    @staticmethod
-    def reset_code_bultins(script_object, rig_object=None, project=None, **kwargs):
+    def get_values(self):
         """
-        Reset given rig builtins
-        :param script_object: ScriptObject
-        :param rig_object: RigObject
-        :param project: RigBuilderProject
+        Returns a copy of the variables stored in the context
+        :return: dict
         """
 
-        builtins = ScriptHelpers.get_code_builtins(
-            script_object, rig_object=rig_object, project=project, **kwargs)
-        for builtin in builtins:
-            try:
-                exec ('del(__builtin__.{}'.format(builtin))
-            except Exception:
-                pass
+        return dict(self._values)
+
+    def inject(self, namespace):
+        """
+        Adds context variables into the given namespace
+        :param namespace: dict, usually the dictionary of a module
+        :return: dict
+        """
+
+        namespace.update(self._values)
+
+        return namespace
+
+    def copy(self, **kwargs):
+        """
+        Returns a new context with the same variables of this one
+        :param kwargs: dict, variables to override in the new context
+        :return: ScriptContext
+        """
+
+        new_context = copy.copy(self)
+        new_context._values = dict(self._values)
+        new_context._values.update(kwargs)
+
+        return new_context
 
 
 class RigHelpers(ScriptHelpers, object):
@@ -246,6 +269,7 @@ class RigHelpers(ScriptHelpers, object):
         """
         Will try to find the objects in the given directory
         If no directory is given, it will search in teh current working directory
+        If the directory is located inside a project with a rig index, the index is used instead of listing the folder
         :param directory: str, directory to search for objects
         :param return_also_non_objects_list: bool
         :param as_full_path: bool
@@ -255,6 +279,14 @@ class RigHelpers(ScriptHelpers, object):
         if not directory:
             directory = folder.get_current_working_directory()
 
+        index = rigindex.get_index(directory)
+        if index:
+            rigs, non_rigs = index.find_rigs(directory, return_also_non_objects_list=True)
+            if not as_full_path:
+                rigs = [os.path.basename(rig_path) for rig_path in rigs]
+                non_rigs = [os.path.basename(non_rig_path) for non_rig_path in non_rigs]
+            return [rigs, non_rigs] if return_also_non_objects_list else rigs
+
         LOGGER.info('Finding rigs on "{}"'.format(directory))
 
         found = dict()
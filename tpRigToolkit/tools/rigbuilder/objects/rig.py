@@ -13,16 +13,86 @@ __maintainer__ = "Tomas Poveda"
 __email__ = "tpovedatd@gmail.com"
 
 import os
+import threading
 
 from tpDcc.libs.python import folder, fileio, yamlio, path as path_utils
 
 import tpRigToolkit
 from tpRigToolkit.tools import rigbuilder
-from tpRigToolkit.tools.rigbuilder.core import consts, utils, data
+from tpRigToolkit.tools.rigbuilder.core import consts, utils, data, buildcache, rigsnapshot, rigindex
 from tpRigToolkit.tools.rigbuilder.scripts import node
 from tpRigToolkit.tools.rigbuilder.objects import script, helpers, unknown
 
 
+class ComponentGraph(object):
+    """
+    Class that stores the hierarchy of the build nodes of a rig, so the parent and the children of a node can be
+    retrieved without listing folders. Build node instances are created the first time they are requested
+    """
+
+    def __init__(self, rig, node_names):
+        super(ComponentGraph, self).__init__()
+
+        self._rig = rig
+        self._parents = dict()
+        self._children = dict()
+        self._instances = dict()
+
+        for node_name in node_names or list():
+            parent_name = node_name.rpartition('/')[0] or None
+            self._parents[node_name] = parent_name
+            self._children.setdefault(node_name, list())
+            if parent_name:
+                self._children.setdefault(parent_name, list()).append(node_name)
+
+    def has_node(self, node_name):
+        """
+        Returns whether or not given build node exists in the graph
+        :param node_name: str
+        :return: bool
+        """
+
+        return node_name in self._parents
+
+    def get_parent(self, node_name):
+        """
+        Returns the name of the parent build node of the given one
+        :param node_name: str
+        :return: str or None
+        """
+
+        return self._parents.get(node_name, None)
+
+    def get_children(self, node_name):
+        """
+        Returns the names of the children build nodes of the given one
+        :param node_name: str
+        :return: list(str)
+        """
+
+        return list(self._children.get(node_name, list()))
+
+    def get_instance(self, node_name):
+        """
+        Returns the instance of the given build node
+        Instances of the nodes that are being executed by the build are returned if they exist
+        :param node_name: str
+        :return: BuildObject or None
+        """
+
+        if not node_name or node_name not in self._parents:
+            return None
+
+        run_instance = self._rig.get_run_node(node_name)
+        if run_instance:
+            return run_instance
+
+        if node_name not in self._instances:
+            self._instances[node_name] = self._rig.get_build_node_instance(node_name)
+
+        return self._instances[node_name]
+
+
 class RigObject(script.ScriptObject, object):
 
     DESCRIPTION = 'rig'
@@ -34,6 +104,10 @@ class RigObject(script.ScriptObject, object):
     def __init__(self, name=None):
 
         self._run_nodes = dict()
+        self._run_nodes_lock = threading.Lock()
+        self._build_infos = dict()
+        self._snapshot = None
+        self._component_graph = None
 
         super(RigObject, self).__init__(name=name)
 
@@ -41,59 +115,6 @@ class RigObject(script.ScriptObject, object):
     # ======================== OVERRIDES
     # ================================================================================================
 
-    def sync(self):
-        scripts_list, states = self.get_scripts_manifest()
-        synced_scripts = list()
-        synced_states = list()
-
-        script_count = 0
-        if scripts_list:
-            script_count = len(scripts_list)
-        code_folders = self.get_code_folders()
-        if not script_count and not code_folders:
-            return
-
-        extension = self.SCRIPT_EXTENSION
-        if not extension.startswith('.'):
-            extension = '.{}'.format(extension)
-
-        for i in range(script_count):
-            script_name = fileio.remove_extension(scripts_list[i])
-            script_path = self.get_code_file(script_name)
-            if not script_path or not path_utils.exists(script_path) or scripts_list[i] in synced_scripts:
-                continue
-
-            synced_scripts.append(scripts_list[i])
-            synced_states.append(states[i])
-
-            remove_index = None
-            for i in range(len(code_folders)):
-                if code_folders[i] == script_name:
-                    remove_index = i
-                    break
-                if code_folders in synced_scripts:
-                    if not code_folders[i].count('/'):
-                        continue
-                    common_path = path_utils.get_common_path(code_folders[i], script_name)
-                    if common_path:
-                        common_path_name = common_path + extension
-                        if common_path_name in synced_scripts:
-                            code_script = code_folders[i] + extension
-                            synced_scripts.append(code_script)
-                            synced_states.append(False)
-                            remove_index = i
-                            break
-            if remove_index:
-                code_folders.pop(remove_index)
-
-        for code_folder in code_folders:
-            code_folder += extension
-            if code_folder not in synced_scripts:
-                synced_scripts.append(code_folder)
-                synced_states.append(False)
-
-        self.set_scripts_manifest(scripts_to_add=synced_scripts, states=synced_states)
-
     def _source_script(self, script, **kwargs):
         """
         Internal function that source the given script
@@ -113,20 +134,152 @@ class RigObject(script.ScriptObject, object):
             builder_node_inst = self.get_build_node_instance(node_name)
             init_passed = False
             if builder_node_inst:
-                build_level = kwargs.get('build_level', None)
-                if build_level:
-                    if build_level == consts.BuildLevel.PRE:
-                        init_passed = builder_node_inst.pre_run()
-                    elif build_level == consts.BuildLevel.MAIN:
+                context = kwargs.get('context', None)
+                if context:
+                    builder_node_inst.set_script_context(context.copy(node=builder_node_inst, rig=self))
+                try:
+                    build_level = kwargs.get('build_level', None)
+                    if build_level:
+                        if build_level == consts.BuildLevel.PRE:
+                            init_passed = builder_node_inst.pre_run()
+                        elif build_level == consts.BuildLevel.MAIN:
+                            init_passed = builder_node_inst.run()
+                        elif build_level == consts.BuildLevel.POST:
+                            init_passed = builder_node_inst.post_run()
+                    else:
                         init_passed = builder_node_inst.run()
-                    elif build_level == consts.BuildLevel.POST:
-                        init_passed = builder_node_inst.post_run()
-                else:
-                    init_passed = builder_node_inst.run()
-                self._run_nodes[node_name] = builder_node_inst
+                finally:
+                    builder_node_inst.set_script_context(None)
+                # DCC free nodes are executed in worker threads, their instances are only published once they finish
+                with self._run_nodes_lock:
+                    self._run_nodes[node_name] = builder_node_inst
 
             return None, init_passed, init_passed
 
+    def run(self, start_new=False, **kwargs):
+        """
+        Overrides base ScriptObject run function
+        Manifest, node infos and code folders of the rig are loaded once in a snapshot that is used during the whole
+        build instead of accessing the disk for each node
+        """
+
+        if self._snapshot is not None:
+            return super(RigObject, self).run(start_new=start_new, **kwargs)
+
+        self._snapshot = rigsnapshot.RigSnapshot.load(self)
+        self._component_graph = None
+        self._build_infos.clear()
+        try:
+            return super(RigObject, self).run(start_new=start_new, **kwargs)
+        finally:
+            self._snapshot = None
+            self._component_graph = None
+            self._build_infos.clear()
+
+    def get_scripts_manifest(self, manifest_file=None):
+        """
+        Overrides base ScriptObject get_scripts_manifest function
+        While a build is running, the manifest stored in the build snapshot is returned
+        :param manifest_file: str,
+        :return: tuple<list, list>
+        """
+
+        if self._snapshot is not None and not manifest_file:
+            return self._snapshot.get_scripts_manifest()
+
+        return super(RigObject, self).get_scripts_manifest(manifest_file=manifest_file)
+
+    def get_script_state_tree(self, manifest_file=None):
+        """
+        Overrides base ScriptObject get_script_state_tree function
+        While a build is running, the tree is created from the manifest stored in the build snapshot
+        :param manifest_file: variant, str or None
+        :return: ScriptStateTree
+        """
+
+        if self._snapshot is not None and not manifest_file:
+            return script.ScriptStateTree(*self._snapshot.get_scripts_manifest())
+
+        return super(RigObject, self).get_script_state_tree(manifest_file=manifest_file)
+
+    def get_code_file(self, name, basename=False):
+        """
+        Overrides base ScriptObject get_code_file function
+        While a build is running, code files are retrieved from the build snapshot
+        :param name: str, name of the script we want to get
+        :param basename: bool, Whether to return full path of code file or only the code file name
+        :return: str
+        """
+
+        if self._snapshot is not None and self._snapshot.has_code_folder(name):
+            code_file = self._snapshot.get_code_file(name)
+            if code_file and basename:
+                code_file = path_utils.get_basename(code_file)
+            return code_file
+
+        return super(RigObject, self).get_code_file(name, basename=basename)
+
+    def _get_script_build_info(self, script_name):
+        """
+        Overrides base ScriptObject _get_script_build_info function
+        Internal function that returns the build information declared by the build node of the given script
+        Instances of the nodes that access the DCC are kept to execute them. Instances of DCC free nodes are not
+        shared: they are created by the worker thread task that executes them
+        :param script_name: str, name of the script in the manifest
+        :return: tuple(list(str) or None, list(str) or None, bool)
+        """
+
+        if os.path.splitext(script_name)[-1] != '.{}'.format(self.SCRIPT_EXTENSION):
+            return super(RigObject, self)._get_script_build_info(script_name)
+
+        node_name = fileio.remove_extension(script_name)
+        build_info = self._build_infos.get(node_name, None)
+        if build_info is not None:
+            return build_info
+
+        builder_node_inst = self.get_build_node_instance(node_name)
+        if not builder_node_inst:
+            return super(RigObject, self)._get_script_build_info(script_name)
+
+        build_info = (builder_node_inst.get_inputs(), builder_node_inst.get_outputs(), builder_node_inst.is_dcc_free())
+        self._build_infos[node_name] = build_info
+        if not build_info[2]:
+            self._run_nodes[node_name] = builder_node_inst
+
+        return build_info
+
+    def _get_script_fingerprint_files(self, script_name):
+        """
+        Overrides base ScriptObject _get_script_fingerprint_files function
+        Internal function that returns the files whose contents are used to check if the given script changed
+        The files of the rig data folders declared as inputs by the build node of the script are also included
+        :param script_name: str, name of the script in the manifest
+        :return: list(str)
+        """
+
+        file_paths = super(RigObject, self)._get_script_fingerprint_files(script_name)
+        inputs, _, _ = self._get_script_build_info(script_name)
+        for input_name in inputs or list():
+            data_folder = self.get_data_folder(input_name)
+            if data_folder:
+                file_paths.extend(buildcache.get_folder_files(data_folder, recursive=True))
+
+        return file_paths
+
+    def _is_sync_script_valid(self, script_name):
+        """
+        Overrides base ScriptObject _is_sync_script_valid function
+        Internal function that returns whether or not given manifest script should be kept when syncing
+        :param script_name: str, name of the script without extension
+        :return: bool
+        """
+
+        script_path = self.get_code_file(script_name)
+        if not script_path or not path_utils.exists(script_path):
+            return False
+
+        return True
+
     def _reset(self):
         """
         Internal function resets all rig variables
@@ -136,6 +289,9 @@ class RigObject(script.ScriptObject, object):
 
         self._parts = list()
         self._run_nodes.clear()
+        self._build_infos.clear()
+        self._snapshot = None
+        self._component_graph = None
 
     def _get_invalid_code_names(self):
         invalid_folders = super(RigObject, self)._get_invalid_code_names()
@@ -147,6 +303,44 @@ class RigObject(script.ScriptObject, object):
     # ======================== BASE
     # ================================================================================================
 
+    def create(self):
+        """
+        Overrides base BaseObject create function
+        The rig index of the project is updated with the new rig
+        :return: str, path where object is created
+        """
+
+        rig_path = super(RigObject, self).create()
+        rigindex.mark_dirty(self.get_path())
+
+        return rig_path
+
+    def rename(self, new_name):
+        """
+        Overrides base BaseObject rename function
+        The rig index of the project is updated with the renamed rig
+        :param new_name: str, new name for the object
+        :return: bool, Whether the object was renamed or not
+        """
+
+        old_path = self.get_path()
+        renamed = super(RigObject, self).rename(new_name)
+        if renamed:
+            rigindex.mark_dirty(old_path)
+            rigindex.mark_dirty(self.get_path())
+
+        return renamed
+
+    def delete(self):
+        """
+        Overrides base BaseObject delete function
+        The deleted rig is removed from the rig index of the project
+        """
+
+        rig_path = self.get_path()
+        super(RigObject, self).delete()
+        rigindex.mark_dirty(rig_path)
+
     def is_enabled(self):
         """
         Returns whether or not this rig is enabled
@@ -171,6 +365,7 @@ class RigObject(script.ScriptObject, object):
             fileio.create_file(self.ENABLE_FILE, rig_path)
         else:
             fileio.delete_file(self.ENABLE_FILE, rig_path, show_warning=False)
+        rigindex.mark_dirty(rig_path)
 
     def enable_all_scripts(self):
         """
@@ -275,7 +470,7 @@ class RigObject(script.ScriptObject, object):
         """
 
         object_path = self.get_path()
-        found = helpers.RigHelpers.find_rigs(object_path)
+        found = list(helpers.RigHelpers.find_rigs(object_path))
 
         return found
 
@@ -344,6 +539,10 @@ class RigObject(script.ScriptObject, object):
         if not rig_path:
             return False
 
+        index = rigindex.get_index(rig_path)
+        if index:
+            return index.has_sub_rigs(rig_path)
+
         files = folder.get_folders(rig_path)
         if not files:
             return False
@@ -409,6 +608,7 @@ class RigObject(script.ScriptObject, object):
             return
 
         data_inst.create(builder_node)
+        self._mark_code_dirty(name)
 
         # TODO: We should retrieve file path directly from data instance (not through data object)
         file_name = data_inst.get_file()
@@ -424,6 +624,7 @@ class RigObject(script.ScriptObject, object):
         if node_name in self._run_nodes:
             return self._run_nodes[node_name]
 
+        snapshot = self._snapshot
         node_info = self.get_node_info(node_name)
         node_class = node_info.get('class', None)
         if not node_class:
@@ -448,20 +649,28 @@ class RigObject(script.ScriptObject, object):
         else:
             builder_node = builder_node_class(node_name, rig=self)
 
-        code_folder = os.path.dirname(self.get_code_folder(node_name))
+        if snapshot is not None and snapshot.has_code_folder(node_name):
+            code_folder = os.path.dirname(snapshot.get_code_folder(node_name))
+        else:
+            code_folder = os.path.dirname(self.get_code_folder(node_name))
         builder_node.set_directory(code_folder)
         # We force the creation of the options file
-        builder_node.get_option_file()
+        if snapshot is None or not snapshot.has_file(node_name, rigsnapshot.OPTIONS_FILE):
+            builder_node.get_option_file()
 
         return builder_node
 
     def get_node_info(self, node_name):
         """
         Returns builder node info with the given name
+        While a build is running, node info is retrieved from the build snapshot
         :param node_name: str
         :return: dict
         """
 
+        if self._snapshot is not None and self._snapshot.has_code_folder(node_name):
+            return self._snapshot.get_node_info(node_name)
+
         node_info_file = self.get_code_file(node_name)
         if not node_info_file or not os.path.isfile(node_info_file):
             tpRigToolkit.logger.warning('Impossible to retrieve node info for "{}"!'.format(node_info_file))
@@ -469,12 +678,46 @@ class RigObject(script.ScriptObject, object):
 
         return yamlio.read_file(node_info_file)
 
+    def get_run_node(self, node_name):
+        """
+        Returns the instance of the given build node used by the build that is running
+        :param node_name: str
+        :return: BuildObject or None
+        """
+
+        return self._run_nodes.get(node_name, None)
+
+    def get_component_graph(self):
+        """
+        Returns the graph with the hierarchy of the build nodes of the rig
+        The graph is created once per build and it is invalidated when build nodes are created, moved or renamed
+        :return: ComponentGraph
+        """
+
+        if self._component_graph is None:
+            if self._snapshot is not None:
+                node_names = self._snapshot.get_code_folders()
+            else:
+                node_names = self.get_code_folders()
+            self._component_graph = ComponentGraph(self, node_names)
+
+        return self._component_graph
+
+    def get_snapshot(self):
+        """
+        Returns the snapshot of the rig used by the build that is running
+        :return: RigSnapshot or None, None if the rig is not being built
+        """
+
+        return self._snapshot
+
     def rename_build_node(self, node_name, new_name):
         node_info_file = self.get_code_file(node_name)
         info_file_ext = os.path.splitext(node_info_file)[-1]
         if not new_name.endswith(info_file_ext):
             new_name = '{}{}'.format(new_name, info_file_ext)
         fileio.rename_file(os.path.basename(node_info_file), os.path.dirname(node_info_file), new_name)
+        self._component_graph = None
 
         return True
 
@@ -482,6 +725,16 @@ class RigObject(script.ScriptObject, object):
     # ======================== INTERNAL
     # ================================================================================================
 
+    def _mark_code_dirty(self, *code_names):
+        """
+        Overrides base ScriptObject _mark_code_dirty function
+        Internal function that is called each time code folders are created, moved, renamed or deleted
+        :param code_names: list(str), names of the code folders that changed
+        """
+
+        super(RigObject, self)._mark_code_dirty(*code_names)
+        self._component_graph = None
+
     def _get_parent_rig_path(self, from_override=False):
         if not from_override:
             object_path = self.get_path()
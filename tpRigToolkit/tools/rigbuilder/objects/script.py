@@ -12,17 +12,30 @@ __license__ = "MIT"
 __maintainer__ = "Tomas Poveda"
 __email__ = "tpovedatd@gmail.com"
 
+import os
 import sys
+import time
+import types
 import string
+import hashlib
 import traceback
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 import tpDcc as tp
 from tpDcc.core import scripts
 from tpDcc.libs.python import log, osplatform, python, folder, fileio, timers, version
 from tpDcc.libs.python import path as path_utils, name as name_utils
 
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import consts, utils, data
+from tpRigToolkit.tools.rigbuilder.core import consts, utils, data, scheduler, buildcache, buildtrace, nulldcc
+from tpRigToolkit.tools.rigbuilder.core import optionstore, ownwrites
 from tpRigToolkit.tools.rigbuilder.objects import helpers, base
 
 
@@ -32,6 +45,932 @@ class ScriptStatus(object):
     SUCCESS = 'Success'
 
 
+class ScriptManifest(object):
+    """
+    Class that stores the parsed contents of a scripts manifest file in memory
+    The manifest file is only parsed again when its modification time or its size changes
+
+    Manifest files keep the "<script> <True|False>" format, but states are written with a fixed width (version 2):
+        script_a.py True
+        script_a/script_b.py False
+    "True" is padded with a trailing space, so states can be updated in place and new entries can be appended
+    without rewriting the full file, while the file is still readable by older versions of the tool. Manifests
+    without padded states (version 1) are migrated to the current format the first time they are written.
+    """
+
+    # Header used by manifests that stored "<0|1> <script>" entries. They are still readable
+    HEADER = '#manifest'
+    VERSION = 2
+    LEGACY_VERSION = 1
+
+    # Coarsest modification time resolution expected (FAT and some network shares)
+    MTIME_RESOLUTION = 2.0
+
+    def __init__(self, manifest_file):
+        super(ScriptManifest, self).__init__()
+
+        self._file = manifest_file
+        self._stamp = None
+        self._version = None
+        self._ends_with_newline = True
+        self._scripts = list()
+        self._states = list()
+        self._offsets = list()
+        self._indices = dict()
+        self._states_dict = dict()
+        self._state_tree = None
+
+    @property
+    def file(self):
+        return self._file
+
+    @property
+    def version(self):
+        return self._version
+
+    def is_dirty(self):
+        """
+        Returns whether or not manifest file in disk has changed since the last time it was loaded
+        :return: bool
+        """
+
+        return self._stamp is None or self._stamp != self._get_stamp()
+
+    def is_legacy(self):
+        """
+        Returns whether or not manifest file is stored using the legacy format
+        :return: bool
+        """
+
+        self.load()
+        return self._version == self.LEGACY_VERSION
+
+    def load(self, force=False):
+        """
+        Parses manifest file from disk if it has changed since the last time it was loaded
+        :param force: bool, Whether to parse the file even if it did not changed
+        """
+
+        stamp = self._get_stamp()
+        if not force and self._stamp is not None and stamp == self._stamp:
+            return
+
+        file_data = b''
+        if stamp:
+            with open(self._file, 'rb') as fh:
+                file_data = fh.read()
+
+        self._parse(file_data)
+        self._stamp = stamp
+
+    def write(self, scripts, states):
+        """
+        Stores given scripts and states in the manifest file
+        If only states changed, the states are updated in place instead of rewriting the manifest file
+        :param scripts: list(str)
+        :param states: list(bool)
+        """
+
+        states = [bool(state) for state in states]
+
+        self.load()
+        if self._version != self.VERSION or scripts != self._scripts:
+            self._write_all(scripts, states)
+            return
+
+        changed = [i for i in range(len(states)) if states[i] != self._states[i]]
+        if not changed:
+            return
+
+        with open(self._file, 'r+b') as fh:
+            for i in changed:
+                fh.seek(self._offsets[i])
+                fh.write(self._get_state_flag(states[i]))
+
+        for i in changed:
+            self._states[i] = states[i]
+            self._states_dict[self._scripts[i]] = states[i]
+        self._state_tree = None
+        self._update_stamp()
+
+    def append(self, scripts, states):
+        """
+        Appends given scripts and states at the end of the manifest file
+        :param scripts: list(str)
+        :param states: list(bool)
+        """
+
+        states = [bool(state) for state in states]
+
+        self.load()
+        if self._version != self.VERSION:
+            self._write_all(self._scripts + list(scripts), self._states + states)
+            return
+
+        offset = self._stamp[1] if self._stamp else 0
+        with open(self._file, 'ab') as fh:
+            if not self._ends_with_newline:
+                fh.write(b'\n')
+                offset += 1
+            for script_name, state in zip(scripts, states):
+                line = self._to_bytes(self._get_entry_line(script_name, state))
+                fh.write(line)
+                self._add_entry(script_name, state, offset + len(line) - 6)
+                offset += len(line)
+        self._ends_with_newline = True
+        self._update_stamp()
+
+    def set_state(self, script_name, state):
+        """
+        Updates the state of the given script in the manifest file
+        :param script_name: str
+        :param state: bool
+        """
+
+        self.load()
+        if script_name not in self._indices:
+            return
+
+        states = list(self._states)
+        states[self._indices[script_name]] = state
+        self.write(self._scripts, states)
+
+    def invalidate(self):
+        """
+        Forces the parsing of the manifest file next time its data is accessed
+        """
+
+        self._stamp = None
+
+    def get_scripts(self):
+        """
+        Returns a copy of the list of scripts stored in the manifest
+        :return: list(str)
+        """
+
+        self.load()
+        return list(self._scripts)
+
+    def get_states(self):
+        """
+        Returns a copy of the list of states stored in the manifest
+        :return: list(bool)
+        """
+
+        self.load()
+        return list(self._states)
+
+    def get_state(self, script_name, default=False):
+        """
+        Returns the state of the given script
+        :param script_name: str
+        :param default: bool, value returned if the script is not in the manifest
+        :return: bool
+        """
+
+        self.load()
+        return self._states_dict.get(script_name, default)
+
+    def get_index(self, script_name):
+        """
+        Returns the index of the given script in the manifest
+        :param script_name: str
+        :return: int or None
+        """
+
+        self.load()
+        return self._indices.get(script_name, None)
+
+    def has_script(self, script_name):
+        """
+        Returns whether or not given script is stored in the manifest
+        :param script_name: str
+        :return: bool
+        """
+
+        self.load()
+        return script_name in self._indices
+
+    def as_dict(self):
+        """
+        Returns a dictionary that maps each script of the manifest with its state
+        :return: dict
+        """
+
+        self.load()
+        return dict(self._states_dict)
+
+    def get_state_tree(self):
+        """
+        Returns a tree that allows to check the states of the ancestors of the scripts stored in the manifest
+        The tree is built only once and it is cached until the manifest changes
+        :return: ScriptStateTree
+        """
+
+        self.load()
+        if self._state_tree is None:
+            self._state_tree = ScriptStateTree(self._scripts, self._states)
+
+        return self._state_tree
+
+    def _get_stamp(self):
+        """
+        Internal function that returns the values used to check if the manifest file has changed
+        :return: tuple(float, int) or None
+        """
+
+        try:
+            file_stat = os.stat(self._file)
+        except (OSError, TypeError):
+            return None
+
+        return file_stat.st_mtime, file_stat.st_size
+
+    def _update_stamp(self):
+        """
+        Internal function that stores the stamp of the manifest file after writing it
+        The write is recorded as done by the tool, so file watchers do not refresh the UI because of it
+        If the file was written within the same modification time tick and its size did not change (for example,
+        when states are updated in place), the modification time is bumped so other readers detect the change
+        """
+
+        previous_stamp = self._stamp
+        stamp = self._get_stamp()
+        if stamp and previous_stamp and stamp == previous_stamp:
+            mtime = previous_stamp[0] + self.MTIME_RESOLUTION
+            try:
+                os.utime(self._file, (mtime, mtime))
+                stamp = self._get_stamp()
+            except OSError:
+                tpRigToolkit.logger.warning('Impossible to update modification time of manifest: {}'.format(self._file))
+
+        self._stamp = stamp
+        ownwrites.record(self._file)
+
+    def _clear_entries(self):
+        """
+        Internal function that removes all manifest entries and lookup tables
+        """
+
+        self._scripts = list()
+        self._states = list()
+        self._offsets = list()
+        self._indices = dict()
+        self._states_dict = dict()
+        self._state_tree = None
+
+    def _add_entry(self, script_name, state, offset=None):
+        """
+        Internal function that adds a new entry into the manifest and updates lookup tables
+        :param script_name: str
+        :param state: bool
+        :param offset: int or None, position in the file where the state of the entry is stored
+        """
+
+        self._indices.setdefault(script_name, len(self._scripts))
+        self._states_dict[script_name] = state
+        self._scripts.append(script_name)
+        self._states.append(state)
+        self._offsets.append(offset)
+        self._state_tree = None
+
+    def _parse(self, file_data):
+        """
+        Internal function that parses given manifest file contents
+        :param file_data: bytes
+        """
+
+        self._clear_entries()
+        self._version = self.VERSION
+        self._ends_with_newline = not file_data or file_data.endswith(b'\n')
+
+        has_header = False
+        offset = 0
+        for line_data in file_data.split(b'\n'):
+            line_offset = offset
+            offset += len(line_data) + 1
+            line_data = line_data.rstrip(b'\r')
+            line = self._to_str(line_data)
+            if not line.strip():
+                continue
+            if not self._scripts and not has_header and line.startswith(self.HEADER):
+                has_header = True
+                self._version = self.LEGACY_VERSION
+                continue
+
+            if has_header:
+                self._add_entry(line[2:], line[0] == '1')
+                continue
+
+            split_line = line.split()
+            if len(split_line) < 2:
+                self._add_entry(split_line[0], False)
+                self._version = self.LEGACY_VERSION
+                continue
+
+            state_offset = None
+            if line_data.endswith(b' True ') or line_data.endswith(b' False'):
+                state_offset = line_offset + len(line_data) - 5
+            else:
+                self._version = self.LEGACY_VERSION
+            self._add_entry(' '.join(split_line[:-1]), split_line[-1] == 'True', state_offset)
+
+    def _write_all(self, scripts, states):
+        """
+        Internal function that writes the full manifest file using the current manifest format
+        :param scripts: list(str)
+        :param states: list(bool)
+        """
+
+        self._clear_entries()
+        self._version = self.VERSION
+        self._ends_with_newline = True
+
+        offset = 0
+        lines = list()
+        for script_name, state in zip(scripts, states):
+            line = self._to_bytes(self._get_entry_line(script_name, state))
+            lines.append(line)
+            self._add_entry(script_name, state, offset + len(line) - 6)
+            offset += len(line)
+
+        with open(self._file, 'wb') as fh:
+            fh.write(b''.join(lines))
+        self._update_stamp()
+
+    def _get_state_flag(self, state):
+        """
+        Internal function that returns the fixed width flag used to store given state in the manifest file
+        :param state: bool
+        :return: bytes
+        """
+
+        return b'True ' if state else b'False'
+
+    def _get_entry_line(self, script_name, state):
+        """
+        Internal function that returns manifest file line of the given entry
+        :param script_name: str
+        :param state: bool
+        :return: str
+        """
+
+        return '{} {}\n'.format(script_name, self._to_str(self._get_state_flag(state)))
+
+    def _to_str(self, value):
+        """
+        Internal function that converts given file data into a string
+        :param value: bytes
+        :return: str
+        """
+
+        if isinstance(value, str):
+            return value
+
+        return value.decode('utf-8')
+
+    def _to_bytes(self, value):
+        """
+        Internal function that converts given string into file data
+        :param value: str
+        :return: bytes
+        """
+
+        if isinstance(value, bytes):
+            return value
+
+        return value.encode('utf-8')
+
+
+class ScriptStateTree(object):
+    """
+    Class that maps each script of a manifest with its parent script so the states of the ancestors of a script can
+    be checked without looking through all the manifest entries
+    Scripts are matched by their path components, for example, "arm.py" is the parent of "arm/ik.py" but not of
+    "arm_ik.py"
+    """
+
+    def __init__(self, scripts=None, states=None):
+        super(ScriptStateTree, self).__init__()
+
+        self._scripts = dict()
+        self._states = dict()
+
+        scripts = scripts or list()
+        states = states or list()
+        for script_name, state in zip(scripts, states):
+            self.add(script_name, state)
+
+    def add(self, script_name, state):
+        """
+        Adds given script into the tree. If the script is already in the tree its state is updated
+        :param script_name: str
+        :param state: bool
+        """
+
+        key = self._get_key(script_name)
+        self._scripts[key] = script_name
+        self._states[key] = bool(state)
+
+    def get_state(self, script_name, default=False):
+        """
+        Returns the state of the given script
+        :param script_name: str
+        :param default: bool, value returned if the script is not in the tree
+        :return: bool
+        """
+
+        return self._states.get(self._get_key(script_name), default)
+
+    def get_parent(self, script_name):
+        """
+        Returns the nearest script in the tree that is parent of the given one
+        :param script_name: str
+        :return: str or None
+        """
+
+        key = self._get_key(script_name)
+        while key.count('/'):
+            key = key.rpartition('/')[0]
+            if key in self._scripts:
+                return self._scripts[key]
+
+        return None
+
+    def is_child(self, script_name, parent_name):
+        """
+        Returns whether or not given script is a child (at any level) of the given parent script
+        :param script_name: str
+        :param parent_name: str
+        :return: bool
+        """
+
+        return self._get_key(script_name).startswith(self._get_key(parent_name) + '/')
+
+    def get_disabled_ancestor(self, script_name, root=None):
+        """
+        Returns the top most ancestor of the given script that is disabled
+        :param script_name: str
+        :param root: str or None, if given, only the ancestors that are children of this script are checked
+        :return: str or None
+        """
+
+        components = self._get_key(script_name).split('/')
+        start = 1
+        if root:
+            start = len(self._get_key(root).split('/')) + 1
+
+        for i in range(start, len(components)):
+            key = '/'.join(components[:i])
+            if not self._states.get(key, True):
+                return self._scripts[key]
+
+        return None
+
+    def is_ancestor_disabled(self, script_name, root=None):
+        """
+        Returns whether or not any of the ancestors of the given script is disabled
+        :param script_name: str
+        :param root: str or None, if given, only the ancestors that are children of this script are checked
+        :return: bool
+        """
+
+        return self.get_disabled_ancestor(script_name, root=root) is not None
+
+    def _get_key(self, script_name):
+        """
+        Internal function that returns the key used to store given script in the tree (script path without extension)
+        :param script_name: str
+        :return: str
+        """
+
+        script_name = script_name.replace('\\', '/').strip('/')
+        base_name = script_name.rpartition('/')[2]
+        if '.' in base_name:
+            script_name = script_name[:script_name.rfind('.')]
+
+        return script_name
+
+
+class ScriptCodeCache(object):
+    """
+    Class that caches the compiled code of the scripts executed by script objects
+    Script files are compiled again only if their contents change and code snippets (such as option scripts) are
+    only compiled the first time they are executed. Modules are always created from scratch, so each script run
+    gets its own module globals
+    """
+
+    MAX_SNIPPETS = 256
+
+    _scripts = dict()
+    _snippets = dict()
+
+    @classmethod
+    def get_code(cls, script_path):
+        """
+        Returns compiled code of the given script file
+        :param script_path: str
+        :return: code
+        """
+
+        with open(script_path, 'rb') as fh:
+            file_data = fh.read()
+        digest = hashlib.md5(file_data).hexdigest()
+
+        cached = cls._scripts.get(script_path, None)
+        if cached and cached[0] == digest:
+            return cached[1]
+
+        code = compile(file_data, script_path, 'exec', 0, True)
+        cls._scripts[script_path] = (digest, code)
+
+        return code
+
+    @classmethod
+    def get_snippet_code(cls, code_snippet_string):
+        """
+        Returns compiled code of the given code snippet
+        :param code_snippet_string: str
+        :return: code
+        """
+
+        code = cls._snippets.get(code_snippet_string, None)
+        if code is not None:
+            return code
+
+        code = compile(code_snippet_string, '<string>', 'exec')
+        if len(cls._snippets) >= cls.MAX_SNIPPETS:
+            cls._snippets.clear()
+        cls._snippets[code_snippet_string] = code
+
+        return code
+
+    @classmethod
+    def source_module(cls, script_path, namespace=None):
+        """
+        Creates a new module and executes the compiled code of the given script file inside it
+        As when scripts are loaded from source, the module is registered in sys.modules (replacing the module of any
+        previous run) so name lookups, pickling and inspect work inside the script. If the script fails, the module
+        is removed from sys.modules
+        :param script_path: str
+        :param namespace: dict or None, variables added to the module before executing its code
+        :return: module or str, module instance or the traceback string if the script could not be sourced
+        """
+
+        module_name = str(os.path.splitext(os.path.basename(script_path))[0])
+        try:
+            code = cls.get_code(script_path)
+            module = types.ModuleType(module_name)
+            if namespace:
+                module.__dict__.update(namespace)
+            module.__file__ = script_path
+            sys.modules[module_name] = module
+            exec(code, module.__dict__)
+        except Exception:
+            sys.modules.pop(module_name, None)
+            return traceback.format_exc()
+
+        return module
+
+    @classmethod
+    def invalidate(cls, script_path=None):
+        """
+        Removes compiled code from the cache
+        :param script_path: str or None, if not given, all cached code is removed
+        """
+
+        if script_path is None:
+            cls._scripts.clear()
+            cls._snippets.clear()
+        else:
+            cls._scripts.pop(script_path, None)
+
+
+class CodeFolderIndex(object):
+    """
+    Class that indexes all the code folders located inside a code directory
+    Folders are found using a single walk through the directory. Queries check the modification time of the code
+    directory and, at most once every STAT_INTERVAL seconds, the modification times of all the indexed folders, so
+    folders changed outside the tool (by other users, version control, etc) are found even if no file watcher is
+    running. Folders marked as dirty (code folders created, moved or deleted by the tool or changes reported by the
+    file watcher) are updated in the next query
+    """
+
+    STAT_INTERVAL = 2.0
+
+    _indices = dict()
+
+    def __init__(self, directory):
+        super(CodeFolderIndex, self).__init__()
+
+        self._directory = directory
+        self._mtimes = dict()
+        self._dirty = set()
+        self._children = dict()
+        self._folders = None
+        self._folders_set = set()
+        self._stat_time = 0.0
+
+    @classmethod
+    def get(cls, directory):
+        """
+        Returns index of the given code directory, creating it if necessary
+        Indices are shared by all the objects that point to the same code directory
+        :param directory: str
+        :return: CodeFolderIndex
+        """
+
+        index = cls._indices.get(directory, None)
+        if not index:
+            index = cls(directory)
+            cls._indices[directory] = index
+
+        return index
+
+    @classmethod
+    def evict(cls, directory=None):
+        """
+        Removes from memory the indices of the code directories that are not located in the given directory
+        Used when the project or the rig changes, so only the indices of the current rig are kept
+        :param directory: str or None, directory whose indices are kept. If not given, all indices are removed
+        :return: int, number of evicted indices
+        """
+
+        if directory:
+            directory = directory.replace('\\', '/').rstrip('/') + '/'
+
+        evicted = 0
+        for code_directory in list(cls._indices.keys()):
+            if directory and (code_directory.replace('\\', '/').rstrip('/') + '/').startswith(directory):
+                continue
+            cls._indices.pop(code_directory)
+            evicted += 1
+
+        return evicted
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def get_folders(self, code_name=None):
+        """
+        Returns a list with all folder names (relative to the code directory) found in the index
+        :param code_name: str, if given, only folders inside this code folder (relative to it) are returned
+        :return: list(str) or None
+        """
+
+        self.refresh()
+        if self._folders is None:
+            return None
+
+        if not code_name:
+            return list(self._folders)
+
+        code_name = code_name.strip('/')
+        if code_name not in self._children:
+            code_directory = path_utils.join_path(self._directory, code_name)
+            if not os.path.isdir(code_directory):
+                return None
+            return CodeFolderIndex(code_directory).get_folders()
+
+        prefix = '{}/'.format(code_name)
+        prefix_length = len(prefix)
+
+        return [f[prefix_length:] for f in self._folders if f.startswith(prefix)]
+
+    def has_folder(self, code_name):
+        """
+        Returns whether or not given code folder exists in the index
+        :param code_name: str
+        :return: bool
+        """
+
+        self.refresh()
+        return code_name in self._folders_set
+
+    def refresh(self, force=False):
+        """
+        Updates the index with the folders marked as dirty and with the folders whose modification time changed
+        :param force: bool, whether to check the modification times of all the indexed folders even if they were
+            checked less than STAT_INTERVAL seconds ago
+        """
+
+        if not self._mtimes:
+            self._scan_all()
+            return
+
+        try:
+            if os.stat(self._directory).st_mtime != self._mtimes.get('', None):
+                self._dirty.add('')
+        except OSError:
+            self.invalidate()
+            return
+
+        if force or time.time() - self._stat_time >= self.STAT_INTERVAL:
+            self._stat_folders()
+        if not self._dirty:
+            return
+
+        changed = False
+        dirty_folders = sorted(self._dirty, key=lambda folder_name: folder_name.count('/'))
+        self._dirty.clear()
+        for folder_name in dirty_folders:
+            if folder_name not in self._mtimes:
+                continue
+            try:
+                mtime = os.stat(self._get_folder_path(folder_name)).st_mtime
+            except OSError:
+                if not folder_name:
+                    self.invalidate()
+                    return
+                self._remove_folder(folder_name)
+                changed = True
+                continue
+            self._rescan_folder(folder_name, mtime)
+            changed = True
+
+        if changed:
+            self._update_folders()
+
+    def sync(self):
+        """
+        Updates the index checking the modification times of all the indexed folders
+        """
+
+        self.refresh(force=True)
+
+    def mark_dirty(self, code_name):
+        """
+        Forces the update of the folder that contains the given code folder next time the index is accessed
+        Used when code folders are created, moved or deleted, so changes are not missed in file systems with low
+        resolution modification times
+        :param code_name: str
+        """
+
+        parent_name = code_name.strip('/').rpartition('/')[0] if code_name else ''
+        if parent_name in self._mtimes:
+            self._dirty.add(parent_name)
+
+    def invalidate(self):
+        """
+        Forces a full walk of the code directory next time the index is accessed
+        """
+
+        self._mtimes.clear()
+        self._dirty.clear()
+        self._children.clear()
+        self._folders = None
+        self._folders_set = set()
+        self._stat_time = 0.0
+
+    def _get_folder_path(self, folder_name):
+        """
+        Internal function that returns the full path of the given indexed folder
+        :param folder_name: str
+        :return: str
+        """
+
+        if not folder_name:
+            return self._directory
+
+        return path_utils.join_path(self._directory, folder_name)
+
+    def _list_folders(self, directory):
+        """
+        Internal function that returns the names of all valid code folders located directly under given directory
+        Folders that start and end with the rigbuilder internal folders prefix and suffix are skipped. Names are sorted
+        so the order of the folders does not depend on the file system
+        :param directory: str
+        :return: list(str)
+        """
+
+        if scandir:
+            folder_names = [entry.name for entry in scandir(directory) if entry.is_dir()]
+        else:
+            folder_names = [
+                name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name))]
+
+        return sorted(name for name in folder_names if not (
+            name.startswith(consts.FOLDERS_PREFIX) and name.endswith(consts.FOLDERS_SUFFIX)))
+
+    def _stat_folders(self):
+        """
+        Internal function that marks as dirty the indexed folders whose modification time changed
+        Removed folders are marked as dirty too, so they are removed from the index
+        """
+
+        self._stat_time = time.time()
+        for folder_name, mtime in list(self._mtimes.items()):
+            try:
+                if os.stat(self._get_folder_path(folder_name)).st_mtime == mtime:
+                    continue
+            except OSError:
+                pass
+            self._dirty.add(folder_name)
+
+    def _scan_all(self):
+        """
+        Internal function that walks the full code directory and builds the index
+        """
+
+        self.invalidate()
+        if not path_utils.is_dir(self._directory):
+            return
+
+        self._scan_folder('')
+        self._update_folders()
+        self._stat_time = time.time()
+
+    def _scan_folder(self, folder_name):
+        """
+        Internal function that indexes the given folder and all its sub folders
+        :param folder_name: str
+        """
+
+        folder_path = self._get_folder_path(folder_name)
+        try:
+            mtime = os.stat(folder_path).st_mtime
+            children = self._list_folders(folder_path)
+        except OSError:
+            return
+
+        self._mtimes[folder_name] = mtime
+        self._children[folder_name] = children
+        for child in children:
+            self._scan_folder(self._join(folder_name, child))
+
+    def _rescan_folder(self, folder_name, mtime):
+        """
+        Internal function that updates the direct children of the given folder
+        New sub folders are indexed and removed ones are removed from the index
+        :param folder_name: str
+        :param mtime: float
+        """
+
+        try:
+            children = self._list_folders(self._get_folder_path(folder_name))
+        except OSError:
+            self._remove_folder(folder_name)
+            return
+
+        old_children = set(self._children.get(folder_name, list()))
+        new_children = set(children)
+        for child in old_children - new_children:
+            self._remove_folder(self._join(folder_name, child))
+
+        self._mtimes[folder_name] = mtime
+        self._children[folder_name] = children
+        for child in new_children - old_children:
+            self._scan_folder(self._join(folder_name, child))
+
+    def _remove_folder(self, folder_name):
+        """
+        Internal function that removes given folder and all its sub folders from the index
+        :param folder_name: str
+        """
+
+        for child in self._children.get(folder_name, list()):
+            self._remove_folder(self._join(folder_name, child))
+
+        self._mtimes.pop(folder_name, None)
+        self._children.pop(folder_name, None)
+
+    def _update_folders(self):
+        """
+        Internal function that updates the cached list of indexed folders
+        Folders are sorted in depth first order (each folder is followed by its sub folders)
+        """
+
+        if '' not in self._children:
+            self._folders = None
+            self._folders_set = set()
+            return
+
+        folders = list()
+        stack = [self._join('', child) for child in reversed(self._children[''])]
+        while stack:
+            folder_name = stack.pop()
+            folders.append(folder_name)
+            for child in reversed(self._children.get(folder_name, list())):
+                stack.append(self._join(folder_name, child))
+
+        self._folders = folders
+        self._folders_set = set(folders)
+
+    def _join(self, folder_name, child):
+        """
+        Internal function that returns the relative name of a child folder
+        :param folder_name: str
+        :param child: str
+        :return: str
+        """
+
+        if not folder_name:
+            return child
+
+        return '{}/{}'.format(folder_name, child)
+
+
 class ScriptObject(base.BaseObject, object):
 
     CODE_FOLDER = consts.CODE_FOLDER
@@ -40,11 +979,13 @@ class ScriptObject(base.BaseObject, object):
     SCRIPT_EXTENSION = scripts.ScriptPythonData.get_data_extension()
     DESCRIPTION = 'script'
     BUILD_STEPS = [consts.BuildLevel.MAIN]
+    TRACE_SUMMARY_LIMIT = 20
 
     def __init__(self, name=None):
 
         self._external_code_paths = list()
         self._update_options = True
+        self._script_context = None
 
         super(ScriptObject, self).__init__(name=name)
 
@@ -74,6 +1015,11 @@ class ScriptObject(base.BaseObject, object):
 
         self._runtime_values = dict()
         self._runtime_globals = dict()
+        self._manifests = dict()
+        self._build_cache = None
+        self._build_report = list()
+        self._build_trace = None
+        self._dry_run_dcc = None
 
     def _get_invalid_code_names(self):
         """
@@ -110,63 +1056,17 @@ class ScriptObject(base.BaseObject, object):
     def sync(self):
         """
         Syncs scripts manifest file with the scripts that are located in the code folder of the current object in disk
+        Scripts already in the manifest keep their order and state and new code folders are appended disabled
         """
 
+        self.get_code_index().sync()
         scripts_list, states = self.get_scripts_manifest()
-        synced_scripts = list()
-        synced_states = list()
-
-        script_count = 0
-        if scripts_list:
-            script_count = len(scripts_list)
         code_folders = self.get_code_folders()
-        if not script_count and not code_folders:
+        if not scripts_list and not code_folders:
             return
 
-        extension = self.SCRIPT_EXTENSION
-        if not extension.startswith('.'):
-            extension = '.{}'.format(extension)
-
-        if script_count:
-            for i in range(script_count):
-                script_name = fileio.remove_extension(scripts_list[i])
-                script_path = self._get_code_file(script_name)
-                if not path_utils.is_file(script_path):
-                    tpRigToolkit.logger.warning(
-                        'Script "{}" does not exists in proper path: {}'.format(script_name, script_path))
-                    continue
-                if scripts_list[i] in synced_scripts:
-                    tpRigToolkit.logger.warning(
-                        'Script "{}" is already synced. Do you have scripts with duplicates names?'.format(script_name))
-                    continue
-
-                synced_scripts.append(scripts_list[i])
-                synced_states.append(states[i])
-
-                remove_index = None
-                for i in range(len(code_folders)):
-                    if code_folders[i] == script_name:
-                        remove_index = i
-                        break
-                    if code_folders in synced_scripts:
-                        if not code_folders[i].count('/'):
-                            continue
-                        common_path = path_utils.get_common_path(code_folders[i], script_name)
-                        if common_path:
-                            common_path_name = common_path + extension
-                            if common_path_name in synced_scripts:
-                                code_script = code_folders[i] + extension
-                                synced_scripts.append(code_script)
-                                synced_states.append(False)
-                                remove_index = i
-                                break
-                if remove_index:
-                    code_folders.pop(remove_index)
-
-        for code_folder in code_folders:
-            code_folder += extension
-            synced_scripts.append(code_folder)
-            synced_states.append(False)
+        synced_scripts, synced_states = self._get_synced_manifest(
+            scripts_list or list(), states or list(), code_folders or list())
 
         self.set_scripts_manifest(scripts_to_add=synced_scripts, states=synced_states)
 
@@ -233,19 +1133,52 @@ class ScriptObject(base.BaseObject, object):
 
         return self._runtime_values
 
-    def run_script(self, script, hard_error=True, settings=None, **kwargs):
+    def get_script_context(self, rig_object=None, project=None, **kwargs):
+        """
+        Returns context used to execute the scripts of this object
+        If a parent context was set (for example, by the rig that is building this object), a copy of it is returned,
+        otherwise, a new context is created
+        :param rig_object: RigObject
+        :param project: RigBuilderProject
+        :return: helpers.ScriptContext
+        """
+
+        if not self._script_context:
+            return helpers.ScriptContext(self, rig_object=rig_object, project=project, **kwargs)
+
+        context_values = {'node': self}
+        if rig_object is not None:
+            context_values['rig'] = rig_object
+        if project is not None:
+            context_values['project'] = project
+
+        return self._script_context.copy(**context_values)
+
+    def set_script_context(self, context):
+        """
+        Sets the parent context used to execute the scripts of this object
+        :param context: helpers.ScriptContext or None
+        """
+
+        self._script_context = context
+
+    def run_script(self, script, hard_error=True, settings=None, context=None, **kwargs):
         """
         Runs a script in the rig
         :param script: str, name of the script in the rig we want to execute
         :param hard_error: bool, Whether to raise error when an error is encountered
         in the script or to just pass an error string
         :param settings:
+        :param context: ScriptContext or None, context used to execute the script. If not given, a new one is created
         :return: str, status from running the script (including error messages)
         """
 
+        trace = self._build_trace or buildtrace.NULL_TRACE
+        build_level = kwargs.get('build_level', None)
+
         if self._update_options:
-            self._option_settings = None
-            self._setup_options()
+            with trace.span(script, buildtrace.TracePhase.OPTIONS, build_level=build_level):
+                self._setup_options()
 
         tp.Dcc.clear_selection()
         tp.Dcc.refresh_viewport()
@@ -254,9 +1187,11 @@ class ScriptObject(base.BaseObject, object):
         module = None
         orig_script = script
 
-        log.start_temp_log(tpRigToolkit.logger.name)
+        with trace.span(orig_script, buildtrace.TracePhase.LOGGING, build_level=build_level):
+            log.start_temp_log(tpRigToolkit.logger.name)
 
-        self._reset_builtin(**kwargs)
+        if context is None:
+            context = self.get_script_context(**kwargs)
         # tp.Dcc.enable_undo()
         init_passed = False
 
@@ -265,7 +1200,6 @@ class ScriptObject(base.BaseObject, object):
                 script = fileio.remove_extension(script)
                 script = self._get_code_file(script)
             if not path_utils.is_file(script):
-                self._reset_builtin(**kwargs)
                 tpRigToolkit.logger.warning('Could not find script: {}'.format(orig_script))
                 return
             auto_focus = False
@@ -285,7 +1219,8 @@ class ScriptObject(base.BaseObject, object):
             tpRigToolkit.logger.info('\n------------------------------------------------')
             tpRigToolkit.logger.debug('START\t{}\n\n'.format(basename))
 
-            module, init_passed, status = self._source_script(script, **kwargs)
+            with trace.span(orig_script, buildtrace.TracePhase.SOURCE, build_level=build_level):
+                module, init_passed, status = self._source_script(script, context=context, **kwargs)
         except Exception as exc:
             if not hard_error:
                 tpRigToolkit.logger.warning('{} did not source! {}'.format(script, exc))
@@ -296,7 +1231,6 @@ class ScriptObject(base.BaseObject, object):
             init_passed = False
             if hard_error:
                 # tp.Dcc.disable_undo()
-                self._reset_builtin(**kwargs)
                 if module:
                     try:
                         del module
@@ -308,13 +1242,13 @@ class ScriptObject(base.BaseObject, object):
                 if module:
                     try:
                         if hasattr(module, 'main'):
-                            module.main()
+                            with trace.span(orig_script, buildtrace.TracePhase.EXECUTE, build_level=build_level):
+                                module.main()
                             status = ScriptStatus.SUCCESS
                         else:
                             status = ScriptStatus.SUCCESS
                     except Exception:
                         status = traceback.format_exc()
-                        self._reset_builtin(**kwargs)
                         if hard_error:
                             # tp.Dcc.disable_undo()
                             tpRigToolkit.logger.error('{}\n'.format(status))
@@ -324,20 +1258,53 @@ class ScriptObject(base.BaseObject, object):
 
         if module:
             del module
-        self._reset_builtin(**kwargs)
 
         if not status == ScriptStatus.SUCCESS:
             tpRigToolkit.logger.debug('{}\n'.format(status))
 
-        tpRigToolkit.logger.debug('\nEND\t{}\n\n'.format(basename))
-        log.end_temp_log(tpRigToolkit.logger.name)
+        with trace.span(orig_script, buildtrace.TracePhase.LOGGING, build_level=build_level):
+            tpRigToolkit.logger.debug('\nEND\t{}\n\n'.format(basename))
+            log.end_temp_log(tpRigToolkit.logger.name)
 
         return status
 
     def run(self, start_new=False, **kwargs):
         """
         Run all the scripts in the script manifest (taking into account their on/off state)
-        """
+        Supported keyword arguments:
+            incremental (bool): scripts that did not change since the last build are restored from the build cache
+                instead of being executed again
+            start_script (str): script the build starts from. The scene is restored from the nearest checkpoint saved
+                before it, if there is no checkpoint available, the scripts before it are skipped
+            checkpoint_interval (float): seconds of build time between scene checkpoints. If neither an interval nor
+                checkpoint scripts are given, incremental builds save a checkpoint every
+                BuildSession.DEFAULT_CHECKPOINT_INTERVAL seconds and after the last script that modifies the scene
+            checkpoint_scripts (list(str)): scripts after which a scene checkpoint is saved
+            max_workers (int): number of threads used to execute DCC free scripts
+            trace (bool or BuildTrace): records the time spent by each script per build level and per execution phase
+            trace_file (str): file where the build trace is exported in Chrome trace format. Enables build tracing
+            dry_run (bool or NullDcc): scripts are executed against an in-memory null DCC instead of the current one
+        The status and execution time of each script can be retrieved after the build using get_build_report()
+        The build trace can be retrieved after the build using get_build_trace()
+        The DCC calls done during dry-run builds can be retrieved after the build using get_dry_run_dcc()
+        """
+
+        dry_run = kwargs.pop('dry_run', False)
+        if dry_run:
+            with nulldcc.use_dcc(dry_run if dry_run is not True else None) as dry_run_dcc:
+                self._dry_run_dcc = dry_run_dcc
+                status_list = self.run(start_new=start_new, **kwargs)
+            tpRigToolkit.logger.info('\n\nDry-run DCC calls:\n{}\n'.format(dry_run_dcc.format_stats()))
+            missing = dry_run_dcc.get_missing()
+            if missing:
+                tpRigToolkit.logger.warning(
+                    'DCC functions not supported by dry-run builds: {}'.format(', '.join(missing)))
+            return status_list
+
+        if not optionstore.is_session_active():
+            # Options files are loaded once per build and the options written by the scripts are flushed at the end
+            with optionstore.session():
+                return self.run(start_new=start_new, **kwargs)
 
         prev_script = osplatform.get_env_var('RIGBUILDER_CURRENT_SCRIPT')
         osplatform.set_env_var('RIGBUILDER_CURRENT_SCRIPT', self.get_path())
@@ -351,7 +1318,7 @@ class ScriptObject(base.BaseObject, object):
         msg = '\n\n\n\aRunning {} Scripts\t\a\n\n'.format(name)
 
         manage_node_editor_inst = None
-        if tp.is_maya():
+        if nulldcc.is_maya():
             from tpDcc.dccs.maya.core import gui
             manage_node_editor_inst = gui.ManageNodeEditors()
             if start_new:
@@ -366,69 +1333,129 @@ class ScriptObject(base.BaseObject, object):
         tpRigToolkit.logger.debug('Settings Path: {}'.format(self.get_settings_file()))
         tpRigToolkit.logger.debug('Runtime Values: {}\n\n'.format(self._runtime_values))
 
+        # Code folders changed outside the tool (for example, by version control) are found before building
+        self.get_code_index().sync()
         scripts, states = self.get_scripts_manifest()
 
         scripts_with_error = list()
-        state_dict = dict()
+        state_tree = self.get_script_state_tree()
         progress_bar = None
 
-        if tp.is_maya():
+        if nulldcc.is_maya():
             progress_bar = tp.Dcc.get_progress_bar_class()('Process', len(scripts))
             progress_bar.status('Processing: getting ready ...')
 
-        hard_error = kwargs.get('hard_error', True)
-
-        status_list = list()
+        hard_error = kwargs.pop('hard_error', True)
+        if kwargs.get('context', None) is None:
+            kwargs['context'] = self.get_script_context(**kwargs)
+
+        max_workers = kwargs.pop('max_workers', None)
+        incremental = kwargs.pop('incremental', False)
+        start_script = kwargs.pop('start_script', None)
+        checkpoint_interval = kwargs.pop('checkpoint_interval', None)
+        checkpoint_scripts = kwargs.pop('checkpoint_scripts', None)
+        trace = kwargs.pop('trace', None)
+        trace_file = kwargs.pop('trace_file', None)
+        if (trace or trace_file) and not isinstance(trace, buildtrace.BuildTrace):
+            trace = buildtrace.BuildTrace(name=name)
+        self._build_trace = trace or None
+        build_session = None
+        if incremental or start_script or checkpoint_interval is not None or checkpoint_scripts:
+            build_session = buildcache.BuildSession(
+                self.get_build_cache(), incremental=incremental, checkpoint_interval=checkpoint_interval,
+                checkpoint_scripts=checkpoint_scripts)
+
+        build_levels = list()
         for build_level in self.BUILD_STEPS:
+            build_scheduler = scheduler.BuildScheduler(max_workers=max_workers)
+            level_status = dict()
             for i in range(len(scripts)):
-                state = states[i]
                 script = scripts[i]
-                status = ScriptStatus.SKIPPED
-                check_script = script[:-3]
-                state_dict[check_script] = state
-                if progress_bar:
-                    progress_bar.status('Processing: {}'.format(script))
-                    if progress_bar.break_signaled():
-                        if osplatform.get_env_var('RIGBUILDER_RUN') == 'True':
-                            osplatform.set_env_var('RIGBULIDER_STOP', True)
-                        break
-
-                if state:
-                    parent_state = True
-                    for key in state_dict:
-                        if script.find(key) > -1:
-                            parent_state = state_dict[key]
-                            if not parent_state:
-                                break
-
-                    if not parent_state:
-                        tpRigToolkit.logger.warning('Skipping: {}\n\n'.format(script))
-                        if progress_bar:
-                            progress_bar.inc()
-                        continue
-
-                    kwargs['build_level'] = build_level
+                if not states[i]:
+                    tpRigToolkit.logger.warning('\n---------------------------------------------')
+                    tpRigToolkit.logger.warning('Skipping: {}\n\n'.format(script))
+                    level_status[script] = ScriptStatus.SKIPPED
+                    if progress_bar:
+                        progress_bar.inc()
+                elif state_tree.is_ancestor_disabled(script):
+                    tpRigToolkit.logger.warning('Skipping: {}\n\n'.format(script))
+                    if progress_bar:
+                        progress_bar.inc()
+                elif script not in level_status:
+                    level_status[script] = ScriptStatus.SKIPPED
+                    inputs, outputs, dcc_free = self._get_script_build_info(script)
+                    task = build_scheduler.add_task(
+                        script, parent=state_tree.get_parent(script), inputs=inputs, outputs=outputs,
+                        dcc_free=dcc_free)
+                    if build_session:
+                        build_session.add_task(
+                            build_level, task, self._get_script_fingerprint_files(script), outputs=outputs)
+            build_levels.append((build_level, build_scheduler, level_status))
+
+        if build_session:
+            build_session.restore(start_script=start_script)
 
+        status_list = list()
+        self._build_report = list()
+        try:
+            for build_level, build_scheduler, level_status in build_levels:
+                kwargs['build_level'] = build_level
+                level_times = dict()
+
+                def _run_task(script_name):
+                    if build_session and build_session.is_skipped(build_level, script_name):
+                        return ScriptStatus.SKIPPED
+                    if build_session and build_session.is_reused(build_level, script_name):
+                        tpRigToolkit.logger.info('Restored from build cache: {}'.format(script_name))
+                        return build_session.get_status(build_level, script_name)
+                    task = build_scheduler.get_task(script_name)
+                    start_time = time.time()
                     try:
-                        status = self.run_script(script, hard_error=hard_error, **kwargs)
-                    except Exception as exc:
-                        status = ScriptStatus.FAIL
+                        if task.dcc_free:
+                            return self._run_script_outside_dcc(script_name, **kwargs)
+                        if progress_bar:
+                            progress_bar.status('Processing: {}'.format(script_name))
+                        return self.run_script(script_name, hard_error=hard_error, **kwargs)
+                    except Exception:
+                        tpRigToolkit.logger.error(
+                            'Error while executing script: {}'.format(traceback.format_exc()))
+                        return ScriptStatus.FAIL
                     finally:
-                        if not status == ScriptStatus.SUCCESS and status is not True:
-                            error_msg = 'Error while executing script: {}'.format(traceback.format_exc())
-                            scripts_with_error.append(script)
-                            tpRigToolkit.logger.error(error_msg)
-                            if hard_error:
-                                raise Exception('Execution was forced to stop because something went wrong!')
+                        level_times[script_name] = time.time() - start_time
+                        if trace:
+                            trace.add_event(script_name, build_level, start_time, level_times[script_name])
+
+                def _task_finished(script_name, status):
+                    level_status[script_name] = status
+                    self._build_report.append({
+                        'script': script_name, 'build_level': build_level, 'status': status,
+                        'time': level_times.get(script_name, 0.0),
+                        'restored': bool(build_session and build_session.is_reused(build_level, script_name))})
+                    if build_session:
+                        build_session.task_finished(build_level, script_name, status)
+                    if progress_bar:
+                        progress_bar.inc()
+                    if status not in (ScriptStatus.SUCCESS, ScriptStatus.SKIPPED) and status is not True:
+                        scripts_with_error.append(script_name)
+                        tpRigToolkit.logger.error('Error while executing script: {}'.format(script_name))
+                        if hard_error:
+                            raise Exception('Execution was forced to stop because something went wrong!')
 
-                if not states[i]:
-                    tpRigToolkit.logger.warning('\n---------------------------------------------')
-                    tpRigToolkit.logger.warning('Skipping: {}\n\n'.format(script))
+                def _stop_build():
+                    if not progress_bar or not progress_bar.break_signaled():
+                        return False
+                    if osplatform.get_env_var('RIGBUILDER_RUN') == 'True':
+                        osplatform.set_env_var('RIGBULIDER_STOP', True)
+                    return True
 
-                if progress_bar:
-                    progress_bar.inc()
+                build_scheduler.run(_run_task, finished_fn=_task_finished, stop_fn=_stop_build)
 
-                status_list.append([script, status])
+                for script in scripts:
+                    if script in level_status:
+                        status_list.append([script, level_status.pop(script)])
+        finally:
+            if build_session:
+                build_session.finish()
 
         minutes, seconds = watch.stop()
 
@@ -445,6 +1472,13 @@ class ScriptObject(base.BaseObject, object):
         else:
             tpRigToolkit.logger.info('\n\n\nProcess build in {} minutes, {} seconds'.format(minutes, seconds))
 
+        if trace:
+            tpRigToolkit.logger.info('\n\nBuild trace (seconds):\n{}\n'.format(
+                trace.format_summary(limit=self.TRACE_SUMMARY_LIMIT)))
+            if trace_file:
+                trace.export_chrome_trace(trace_file)
+                tpRigToolkit.logger.info('Build trace exported: {}'.format(trace_file))
+
         tpRigToolkit.logger.debug('\n\n')
         for status_entry in status_list:
             tpRigToolkit.logger.debug('{} : {}'.format(status_entry[1], status_entry[0]))
@@ -464,11 +1498,15 @@ class ScriptObject(base.BaseObject, object):
         """
 
         self.run_script(script=script, hard_error=hard_error)
-        children = self.get_code_children(script)
-        manifest_dict = self.get_scripts_manifest_dict()
+        children = self.get_code_descendants(script)
+        state_tree = self.get_script_state_tree()
         for child in children:
-            if manifest_dict[child]:
-                self.run_script(child, hard_error=hard_error)
+            if not state_tree.get_state(child):
+                continue
+            if state_tree.is_ancestor_disabled(child, root=script):
+                tpRigToolkit.logger.warning('Skipping: {}\n\n'.format(child))
+                continue
+            self.run_script(child, hard_error=hard_error)
 
     def run_option_script(self, name, group=None, hard_error=True):
         """
@@ -494,8 +1532,9 @@ class ScriptObject(base.BaseObject, object):
                 if path_utils.is_dir(external_code_path):
                     if not external_code_path in sys.path:
                         sys.path.append(external_code_path)
-            builtins = helpers.ScriptHelpers.get_code_builtins(self)
-            exec(script, globals(), builtins)
+            namespace = self.get_script_context().get_values()
+            code = ScriptCodeCache.get_snippet_code(script)
+            exec(code, globals(), namespace)
             status = ScriptStatus.SUCCESS
         except Exception:
             tpRigToolkit.logger.warning('Script Error! : {}!'.format(script))
@@ -559,32 +1598,15 @@ class ScriptObject(base.BaseObject, object):
         :return: tuple<list, list>
         """
 
-        if not manifest_file:
-            manifest_file = self.get_scripts_manifest_file()
-        if not path_utils.is_file(manifest_file):
+        manifest = self.get_manifest(manifest_file)
+        if not manifest:
             return None, None
 
-        lines = fileio.get_file_lines(manifest_file)
-        if not lines:
+        scripts = manifest.get_scripts()
+        if not scripts:
             return None, None
 
-        scripts = list()
-        states = list()
-
-        for l in lines:
-            if not l:
-                continue
-            states.append(False)
-            split_line = l.split()
-            if len(split_line):
-                script_name = string.join(split_line[:-1])
-                scripts.append(script_name)
-
-            if len(split_line) >= 2:
-                state = eval(split_line[-1])
-                states[-1] = state
-
-        return scripts, states
+        return scripts, manifest.get_states()
 
     def set_scripts_manifest(self, scripts_to_add, states=None, append=False):
         """
@@ -598,7 +1620,8 @@ class ScriptObject(base.BaseObject, object):
             states = list()
 
         manifest_file = self.get_scripts_manifest_file()
-        lines = list()
+        manifest_scripts = list()
+        manifest_states = list()
         script_count = len(scripts_to_add)
         state_count = 0
         if states:
@@ -612,10 +1635,27 @@ class ScriptObject(base.BaseObject, object):
             else:
                 state = states[i]
 
-            line = '{} {}'.format(scripts_to_add[i], state)
-            lines.append(line)
+            manifest_scripts.append(scripts_to_add[i])
+            manifest_states.append(state)
+
+        manifest = self.get_manifest(manifest_file)
+        if append:
+            manifest.append(manifest_scripts, manifest_states)
+        else:
+            manifest.write(manifest_scripts, manifest_states)
+
+    def set_script_state(self, script, state):
+        """
+        Updates the state of the given script in the scripts manifest file
+        :param script: str, name of the script in the manifest
+        :param state: bool
+        """
+
+        manifest = self.get_manifest()
+        if not manifest:
+            return
 
-        fileio.write_lines(manifest_file, lines, append=append)
+        manifest.set_state(script, state)
 
     def get_scripts_from_manifest(self, basename=True):
         """
@@ -661,14 +1701,11 @@ class ScriptObject(base.BaseObject, object):
         :return: bool
         """
 
-        manifest_file = self.get_scripts_manifest_file()
-        lines = fileio.get_file_lines(manifest_file)
-        for l in lines:
-            split_line = l.split(' ')
-            if split_line[0] == entry:
-                return True
+        manifest = self.get_manifest()
+        if not manifest:
+            return False
 
-        return False
+        return manifest.has_script(entry)
 
     def get_scripts_manifest_dict(self, manifest_file=None):
         """
@@ -677,30 +1714,80 @@ class ScriptObject(base.BaseObject, object):
         :return: dict
         """
 
+        manifest = self.get_manifest(manifest_file)
+        if not manifest:
+            return dict()
+
+        return manifest.as_dict()
+
+    def get_script_state_tree(self, manifest_file=None):
+        """
+        Returns tree used to check if the ancestors of the scripts stored in the scripts manifest file are disabled
+        :param manifest_file: variant, str or None
+        :return: ScriptStateTree
+        """
+
+        manifest = self.get_manifest(manifest_file)
+        if not manifest:
+            return ScriptStateTree()
+
+        return manifest.get_state_tree()
+
+    def get_manifest(self, manifest_file=None):
+        """
+        Returns in memory manifest of the given manifest file
+        Manifest is cached and only parsed again when the file changes in disk
+        :param manifest_file: variant, str or None
+        :return: ScriptManifest or None
+        """
+
         if not manifest_file:
             manifest_file = self.get_scripts_manifest_file()
+        if not manifest_file:
+            return None
 
-        manifest_dict = dict()
+        manifest = self._manifests.get(manifest_file, None)
+        if not manifest:
+            manifest = ScriptManifest(manifest_file)
+            self._manifests[manifest_file] = manifest
 
-        if not path_utils.is_file(manifest_file):
-            return manifest_dict
-        lines = fileio.get_file_lines(manifest_file)
-        if not lines:
-            return manifest_dict
-
-        for line in lines:
-            script_name = None
-            if not line:
-                continue
-            split_line = line.split()
-            if len(split_line):
-                script_name = string.join(split_line[:-1])
-                manifest_dict[script_name] = False
-            if len(split_line) >= 2 and script_name:
-                state = eval(split_line[-1])
-                manifest_dict[script_name] = state
+        return manifest
+
+    def get_build_cache(self):
+        """
+        Returns cache used by incremental builds of this object
+        :return: buildcache.BuildCache
+        """
+
+        build_path = path_utils.join_path(self.get_path(), consts.BUILD_FOLDER)
+        if not self._build_cache or self._build_cache.directory != build_path:
+            self._build_cache = buildcache.BuildCache(build_path)
+
+        return self._build_cache
 
-        return manifest_dict
+    def get_build_report(self):
+        """
+        Returns the status and the execution time of each one of the scripts executed by the last build
+        :return: list(dict)
+        """
+
+        return list(self._build_report)
+
+    def get_dry_run_dcc(self):
+        """
+        Returns the null DCC used during the last dry-run build of this object
+        :return: nulldcc.DccRecorder or None
+        """
+
+        return self._dry_run_dcc
+
+    def get_build_trace(self):
+        """
+        Returns the trace recorded during the last traced build of this object
+        :return: BuildTrace or None
+        """
+
+        return self._build_trace
 
     def get_manifest_history(self):
         """
@@ -760,11 +1847,15 @@ class ScriptObject(base.BaseObject, object):
         :return: list<str>
         """
 
-        code_directory = self.get_code_path()
-        if code_name:
-            code_directory = path_utils.join_path(code_directory, code_name)
+        return self.get_code_index().get_folders(code_name)
+
+    def get_code_index(self):
+        """
+        Returns the index of the code folders of the current object
+        :return: CodeFolderIndex
+        """
 
-        return self._get_folders_without_prefix_suffix(code_directory, recursive=True)
+        return CodeFolderIndex.get(self.get_code_path())
 
     def get_top_level_code_folders(self):
         """
@@ -791,12 +1882,37 @@ class ScriptObject(base.BaseObject, object):
         found = list()
 
         scripts, states = self.get_scripts_manifest()
+        if not scripts:
+            return found
+
         for script in scripts:
             if script.startswith(code_name):
                 found.append(script)
 
         return found
 
+    def get_code_descendants(self, code_name):
+        """
+        Returns the scripts of the manifest that are children (at any level) of the given script
+        Unlike get_code_children, path components are matched, so the given script and scripts that only share its
+        name prefix (such as "arm_ik.py" for "arm.py") are not returned
+        :param code_name: str
+        :return: list(str)
+        """
+
+        found = list()
+
+        scripts, states = self.get_scripts_manifest()
+        if not scripts:
+            return found
+
+        state_tree = self.get_script_state_tree()
+        for script in scripts:
+            if state_tree.is_child(script, code_name):
+                found.append(script)
+
+        return found
+
     def get_code_type(self, name):
         """
         Returns the code type name of the code folder with the given name
@@ -919,6 +2035,7 @@ class ScriptObject(base.BaseObject, object):
 
         if name == consts.MANIFEST_FILE:
             data_inst.create()
+            self._mark_code_dirty(name)
             return
 
         if import_data:
@@ -927,6 +2044,7 @@ class ScriptObject(base.BaseObject, object):
             data_inst.set_lines(['', 'def main():', '    return'])
 
         data_inst.create()
+        self._mark_code_dirty(name)
 
         # TODO: We should retrieve file path directly from data instance (not through data object)
         file_name = data_inst.get_file()
@@ -963,6 +2081,7 @@ class ScriptObject(base.BaseObject, object):
                 last_number += 1
 
         folder.move_folder(old_path, test_path)
+        self._mark_code_dirty(old_name, new_name)
         file_name = new_name
         old_basename = path_utils.get_basename(old_name)
         new_basename = path_utils.get_basename(new_name)
@@ -995,6 +2114,7 @@ class ScriptObject(base.BaseObject, object):
         sub_new_name = path_utils.remove_common_path(old_name, new_name)
         code_folder = data.ScriptFolder(old_name, self.get_code_path())
         code_folder.rename(sub_new_name)
+        self._mark_code_dirty(old_name)
 
         script_extension = self.SCRIPT_EXTENSION
         if not script_extension.startswith('.'):
@@ -1010,11 +2130,22 @@ class ScriptObject(base.BaseObject, object):
         """
 
         folder.delete_folder(name, self.get_code_path())
+        self._mark_code_dirty(name)
 
     # ================================================================================================
     # ======================== INTERNAL
     # ================================================================================================
 
+    def _mark_code_dirty(self, *code_names):
+        """
+        Internal function that is called each time code folders are created, moved, renamed or deleted
+        :param code_names: list(str), names of the code folders that changed
+        """
+
+        code_index = self.get_code_index()
+        for code_name in code_names:
+            code_index.mark_dirty(code_name)
+
     def _get_code_file(self, name, basename=False):
         """
         Returns path to code file with the given name in the current object code folder
@@ -1039,27 +2170,127 @@ class ScriptObject(base.BaseObject, object):
 
         return code_name
 
-    def _reset_builtin(self, **kwargs):
+    def _get_synced_manifest(self, scripts_list, states, code_folders):
         """
-        Internal function used to reset current builtin variables
+        Internal function that reconciles given manifest entries with the given code folders
+        :param scripts_list: list(str), scripts stored in the manifest
+        :param states: list(bool), states stored in the manifest
+        :param code_folders: list(str), code folders found in disk
+        :return: tuple(list(str), list(bool)), synced scripts and states
         """
 
-        helpers.ScriptHelpers.reset_code_bultins(self, **kwargs)
+        synced_scripts = list()
+        synced_states = list()
+        synced = set()
+
+        extension = self.SCRIPT_EXTENSION
+        if not extension.startswith('.'):
+            extension = '.{}'.format(extension)
+
+        for i, script_name in enumerate(scripts_list):
+            if script_name in synced:
+                tpRigToolkit.logger.warning(
+                    'Script "{}" is already synced. Do you have scripts with duplicates names?'.format(script_name))
+                continue
+            if not self._is_sync_script_valid(fileio.remove_extension(script_name)):
+                continue
+            synced.add(script_name)
+            synced_scripts.append(script_name)
+            synced_states.append(states[i] if i < len(states) else False)
+
+        for code_folder in code_folders:
+            code_script = code_folder + extension
+            if code_script in synced:
+                continue
+            synced.add(code_script)
+            synced_scripts.append(code_script)
+            synced_states.append(False)
+
+        return synced_scripts, synced_states
+
+    def _is_sync_script_valid(self, script_name):
+        """
+        Internal function that returns whether or not given manifest script should be kept when syncing
+        :param script_name: str, name of the script without extension
+        :return: bool
+        """
+
+        script_path = self._get_code_file(script_name)
+        if not path_utils.is_file(script_path):
+            tpRigToolkit.logger.warning(
+                'Script "{}" does not exists in proper path: {}'.format(script_name, script_path))
+            return False
+
+        return True
+
+    def _get_script_build_info(self, script_name):
+        """
+        Internal function that returns the build information used to schedule the execution of the given script
+        Scripts that return None inputs and outputs are executed in manifest order
+        :param script_name: str, name of the script in the manifest
+        :return: tuple(list(str) or None, list(str) or None, bool), inputs, outputs and whether or not the script
+            can be executed outside the main thread because it does not access the DCC
+        """
+
+        return None, None, False
+
+    def _get_script_fingerprint_files(self, script_name):
+        """
+        Internal function that returns the files whose contents are used to check if the given script changed
+        :param script_name: str, name of the script in the manifest
+        :return: list(str)
+        """
+
+        code_folder = self.get_code_folder(fileio.remove_extension(script_name))
+
+        return buildcache.get_folder_files(code_folder)
+
+    def _run_script_outside_dcc(self, script, **kwargs):
+        """
+        Internal function that runs a script that does not access the DCC, so it can be executed from a worker thread
+        Contrary to run_script, no DCC commands are called and no temporary log is recorded. The script is executed
+        with its own copy of the script context, so tasks running at the same time do not share it
+        :param script: str, name of the script in the rig we want to execute
+        :return: str or bool, status from running the script
+        """
+
+        context = kwargs.get('context', None)
+        kwargs['context'] = context.copy() if context is not None else self.get_script_context(**kwargs)
+
+        script_file = script
+        if not path_utils.is_file(script_file):
+            script_file = self._get_code_file(fileio.remove_extension(script))
+        if not script_file or not path_utils.is_file(script_file):
+            tpRigToolkit.logger.warning('Could not find script: {}'.format(script))
+            return None
+
+        trace = self._build_trace or buildtrace.NULL_TRACE
+        build_level = kwargs.get('build_level', None)
+
+        with trace.span(script, buildtrace.TracePhase.SOURCE, build_level=build_level):
+            module, init_passed, status = self._source_script(script_file, **kwargs)
+        if init_passed and module:
+            if hasattr(module, 'main'):
+                with trace.span(script, buildtrace.TracePhase.EXECUTE, build_level=build_level):
+                    module.main()
+            status = ScriptStatus.SUCCESS
+
+        return status
 
-    def _source_script(self, script, **kwargs):
+    def _source_script(self, script, context=None, **kwargs):
         """
         Internal function that source the given script
         :param script: str, script in task we want to source
+        :param context: ScriptContext or None, context whose variables are injected into the script module
         :return:
         """
 
-        python.delete_pyc_file(script)
-        self._reset_builtin(**kwargs)
-        helpers.ScriptHelpers.setup_code_builtins(self, **kwargs)
+        if context is None:
+            context = self.get_script_context(**kwargs)
 
         tpRigToolkit.logger.info('Sourcing: {}'.format(script))
 
-        module = python.source_python_module(script)
+        module = ScriptCodeCache.source_module(script, namespace=context.get_values())
         status = None
         init_passed = False
 
@@ -1084,7 +2315,7 @@ class ScriptObject(base.BaseObject, object):
         Internal function that centers the current camera in the viewport
         """
 
-        if tp.is_maya():
+        if nulldcc.is_maya():
             if not tp.Dcc.is_batch():
                 try:
                     tp.Dcc.clear_selection()
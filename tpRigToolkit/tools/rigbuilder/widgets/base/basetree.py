@@ -58,6 +58,10 @@ class BaseTree(treewidgets.FileTreeWidget, object):
 
         self._context_menu = None
 
+        # Index of items by their path (with extension). It is built the first time an item is looked up and it is
+        # updated every time items are added, removed, renamed or moved
+        self._items_index = None
+
         self.setSortingEnabled(False)
         self.setSelectionMode(self.ExtendedSelection)
         self.setDragDropMode(self.DragDrop)
@@ -78,6 +82,9 @@ class BaseTree(treewidgets.FileTreeWidget, object):
 
         self._checkbox.stateChanged.connect(self._on_set_all_checked)
         self.customContextMenuRequested.connect(self._on_item_menu)
+        self.model().rowsInserted.connect(self._on_rows_inserted)
+        self.model().rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        self.model().modelReset.connect(self._on_model_reset)
 
     # ================================================================================================
     # ======================== PROPERTIES
@@ -340,6 +347,17 @@ class BaseTree(treewidgets.FileTreeWidget, object):
 
         return False
 
+    def get_start_point_name(self):
+        """
+        Returns the script name (with path and extension) of the item that has the start point
+        :return: str or None
+        """
+
+        if not self._start_item:
+            return None
+
+        return self._get_item_path_name(self._start_item, keep_extension=True)
+
     def set_start_point(self, item=None):
         """
         Sets starts point in given item
@@ -667,14 +685,11 @@ class BaseTree(treewidgets.FileTreeWidget, object):
         :return: list<QTreeWidgetItem>
         """
 
-        item_count = self.topLevelItemCount()
         items = list()
-        for i in range(item_count):
-            item = self.topLevelItem(i)
-            ancestors = self._get_ancestors(item)
-            items.append(item)
-            if ancestors:
-                items += ancestors
+        for it in QTreeWidgetItemIterator(self):
+            item = it.value()
+            if item:
+                items.append(item)
 
         return items
 
@@ -685,14 +700,72 @@ class BaseTree(treewidgets.FileTreeWidget, object):
         :return: QTreeWidgetItem
         """
 
-        items = self._get_all_items()
-        for item in items:
-            item_path = self.get_item_path(item)
-            check_name = self._get_item_path_name(item, keep_extension=True)
-            if check_name == item_name:
-                return item
+        if self._items_index is None:
+            self._build_items_index()
 
-        return None
+        # Index is rebuilt if the item is not found or if it was changed without notifying the tree
+        item_name = self._get_index_key(item_name)
+        item = self._items_index.get(item_name, None)
+        if item is None or item.treeWidget() is not self or self._get_item_index_key(item) != item_name:
+            self._build_items_index()
+            item = self._items_index.get(item_name, None)
+
+        return item
+
+    def _build_items_index(self):
+        """
+        Internal function that indexes all the items of the tree by their path
+        """
+
+        self._items_index = dict()
+        for item in self._get_all_items():
+            self._items_index.setdefault(self._get_item_index_key(item), item)
+
+    def _index_items(self, item):
+        """
+        Internal function that adds the given item and its children into the items index
+        :param item: QTreeWidgetItem
+        """
+
+        if self._items_index is None:
+            return
+
+        for index_item in [item] + self._get_ancestors(item):
+            self._items_index.setdefault(self._get_item_index_key(index_item), index_item)
+
+    def _unindex_items(self, item):
+        """
+        Internal function that removes the given item and its children from the items index
+        Must be called before changing the path of the items
+        :param item: QTreeWidgetItem
+        """
+
+        if self._items_index is None:
+            return
+
+        for index_item in [item] + self._get_ancestors(item):
+            item_name = self._get_item_index_key(index_item)
+            if self._items_index.get(item_name, None) is index_item:
+                self._items_index.pop(item_name)
+
+    def _get_item_index_key(self, item):
+        """
+        Internal function that returns the key used to store the given item in the items index
+        :param item: QTreeWidgetItem
+        :return: str
+        """
+
+        return self._get_index_key(self._get_item_path_name(item, keep_extension=True))
+
+    def _get_index_key(self, item_name):
+        """
+        Internal function that returns the items index key of the given item path. Separators and the spaces around
+        the names of the path are normalized, so items are found no matter how their text is padded
+        :param item_name: str
+        :return: str
+        """
+
+        return '/'.join(name.strip() for name in str(item_name).replace('\\', '/').split('/'))
 
     def _get_entered_item(self, event):
         """
@@ -767,7 +840,9 @@ class BaseTree(treewidgets.FileTreeWidget, object):
         file_path = current_object.get_code_file(new_file_name)
         basename = path_utils.get_basename(file_path)
 
+        self._unindex_items(item)
         item.set_text(basename)
+        self._index_items(item)
 
         self.itemRenamed.emit(old_name, new_name)
 
@@ -848,6 +923,47 @@ class BaseTree(treewidgets.FileTreeWidget, object):
 
         context_menu.exec_(self.viewport().mapToGlobal(pos))
 
+    def _on_rows_inserted(self, parent_index, first, last):
+        """
+        Internal callback function that is called when items are added to the tree (created, moved or dropped)
+        :param parent_index: QModelIndex
+        :param first: int
+        :param last: int
+        """
+
+        if self._items_index is None:
+            return
+
+        parent_item = self.itemFromIndex(parent_index) if parent_index.isValid() else self.invisibleRootItem()
+        for i in range(first, last + 1):
+            item = parent_item.child(i)
+            if item:
+                self._index_items(item)
+
+    def _on_rows_about_to_be_removed(self, parent_index, first, last):
+        """
+        Internal callback function that is called before items are removed from the tree (deleted, moved or dropped)
+        :param parent_index: QModelIndex
+        :param first: int
+        :param last: int
+        """
+
+        if self._items_index is None:
+            return
+
+        parent_item = self.itemFromIndex(parent_index) if parent_index.isValid() else self.invisibleRootItem()
+        for i in range(first, last + 1):
+            item = parent_item.child(i)
+            if item:
+                self._unindex_items(item)
+
+    def _on_model_reset(self):
+        """
+        Internal callback function that is called when all the items of the tree are removed
+        """
+
+        self._items_index = None
+
     def _on_set_all_checked(self, check_number):
         """
         Internal callback function that checks/unchecks all scripts in script tree
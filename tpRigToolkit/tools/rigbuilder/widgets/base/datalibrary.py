@@ -13,7 +13,7 @@ from tpDcc.libs.qt.widgets.library import window
 
 import tpRigToolkit
 from tpRigToolkit.tools import rigbuilder
-from tpRigToolkit.tools.rigbuilder.core import utils, datalibrary, consts
+from tpRigToolkit.tools.rigbuilder.core import utils, datalibrary, consts, watcher
 from tpRigToolkit.tools.rigbuilder.objects import helpers
 
 
@@ -38,6 +38,9 @@ class DataLibraryWindow(window.LibraryWindow):
         )
         self.statusBar().hide()
 
+        self._watcher = watcher.FileWatcher(parent=self)
+        self._watcher.changed.connect(self._on_data_changed)
+
     def manager(self):
         """
         Overrides base window.library manger function
@@ -49,6 +52,21 @@ class DataLibraryWindow(window.LibraryWindow):
 
         return data_manager
 
+    def set_path(self, path):
+        """
+        Overrides base window.LibraryWindow set_path function
+        If the path is a rig, its data folder is watched, so data changes done in disk are synced into the library
+        :param path: str
+        """
+
+        super(DataLibraryWindow, self).set_path(path)
+
+        self._watcher.clear()
+        if not path or not helpers.RigHelpers().is_rig(path):
+            return
+        current_rig = helpers.RigHelpers().get_rig(path)
+        self._watcher.add_root(current_rig.get_data_path(), recursive=True, watch_files=True)
+
     def set_create_widget(self, create_widget):
         """
         Overrides base window.LibraryWindow set_create_widget function
@@ -125,3 +143,15 @@ class DataLibraryWindow(window.LibraryWindow):
         """
 
         self._console = console
+
+    def _on_data_changed(self, events):
+        """
+        Internal callback function that is called when data files of the current rig are added, removed, renamed or
+        modified in disk
+        :param events: list(watcher.WatchEvent)
+        """
+
+        if not self.path():
+            return
+
+        self.sync()
@@ -18,7 +18,7 @@ from tpDcc.libs.python import python
 from tpDcc.libs.qt.core import base
 from tpDcc.libs.qt.widgets import layouts, label, lineedit, buttons, options, dividers
 
-from tpRigToolkit.tools.rigbuilder.core import controls
+from tpRigToolkit.tools.rigbuilder.core import controls, optionstore
 from tpRigToolkit.tools.rigbuilder.data import skeleton
 
 
@@ -44,6 +44,14 @@ class RigBuilderOptionList(options.OptionList, object):
         add_bone_action.triggered.connect(self.add_bone)
         add_control_bone_link_action.triggered.connect(self.add_control_bone_link)
 
+    def _write_options(self, clear=True):
+        super(RigBuilderOptionList, self)._write_options(clear=clear)
+
+        # Options edited through the UI must be visible to the option stores that already loaded the options file
+        option_object = getattr(self, '_option_object', None)
+        if option_object:
+            optionstore.invalidate(option_object.get_option_file())
+
     def add_custom(self, option_type, name, value=None, parent=None, **kwargs):
         if option_type == 'rigcontrol':
             self.add_control_rig(name=name, value=value, parent=parent)
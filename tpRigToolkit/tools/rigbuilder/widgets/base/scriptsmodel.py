@@ -0,0 +1,329 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains item model implementation to show scripts manifests
+Each script is stored in a compact record and children rows are inserted into the model only when they are requested by
+the view, so manifests with thousands of scripts can be shown without creating a widget item per script
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+from Qt.QtCore import *
+
+from tpDcc.libs.python import fileio, path as path_utils
+
+from tpRigToolkit.tools.rigbuilder.items import base
+
+PATH_ROLE = Qt.UserRole + 1
+RUN_STATE_ROLE = Qt.UserRole + 2
+NODE_CLASS_ROLE = Qt.UserRole + 3
+LOG_ROLE = Qt.UserRole + 4
+
+
+class ScriptRecord(object):
+    """
+    Class that stores the data of a script row
+    """
+
+    __slots__ = ('name', 'path', 'state', 'run_state', 'node_class', 'log', 'parent', 'row', 'children', 'fetched')
+
+    def __init__(self, path='', state=False, node_class=None, parent=None, row=0):
+        self.name = path_utils.get_basename(path) if path else ''
+        self.path = path
+        self.state = state
+        self.run_state = -1
+        self.node_class = node_class
+        self.log = ''
+        self.parent = parent
+        self.row = row
+        self.children = list()
+        self.fetched = 0
+
+
+class ScriptsModel(QAbstractItemModel, object):
+    """
+    Item model that shows a scripts manifest as a tree
+    """
+
+    FETCH_SIZE = 256
+
+    checkStateChanged = Signal(object)
+
+    def __init__(self, header_label='Scripts', parent=None):
+        super(ScriptsModel, self).__init__(parent)
+
+        self._header_label = header_label
+        self._root = ScriptRecord()
+        self._records = dict()
+
+    # ================================================================================================
+    # ======================== OVERRIDES
+    # ================================================================================================
+
+    def index(self, row, column, parent=QModelIndex()):
+        parent_record = self.get_record(parent)
+        if column != 0 or row < 0 or row >= parent_record.fetched:
+            return QModelIndex()
+
+        return self.createIndex(row, column, parent_record.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+
+        parent_record = index.internalPointer().parent
+        if parent_record is None or parent_record is self._root:
+            return QModelIndex()
+
+        return self.createIndex(parent_record.row, 0, parent_record)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+
+        return self.get_record(parent).fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        return bool(self.get_record(parent).children)
+
+    def canFetchMore(self, parent):
+        record = self.get_record(parent)
+        return record.fetched < len(record.children)
+
+    def fetchMore(self, parent):
+        record = self.get_record(parent)
+        self._fetch(parent, record, min(len(record.children), record.fetched + self.FETCH_SIZE))
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsUserCheckable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section == 0:
+            return self._header_label
+
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        record = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return record.name
+        elif role == Qt.CheckStateRole:
+            return Qt.Checked if record.state else Qt.Unchecked
+        elif role == Qt.DecorationRole:
+            return base.get_state_icon(record.run_state)
+        elif role == Qt.ToolTipRole:
+            return record.path
+        elif role == PATH_ROLE:
+            return record.path
+        elif role == RUN_STATE_ROLE:
+            return record.run_state
+        elif role == NODE_CLASS_ROLE:
+            return record.node_class
+        elif role == LOG_ROLE:
+            return record.log
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole:
+            return False
+
+        record = index.internalPointer()
+        record.state = value == Qt.Checked or value == 2
+        self.dataChanged.emit(index, index)
+        self.checkStateChanged.emit(record.path)
+
+        return True
+
+    # ================================================================================================
+    # ======================== BASE
+    # ================================================================================================
+
+    def clear(self):
+        """
+        Removes all the scripts from the model
+        """
+
+        self.beginResetModel()
+        self._root = ScriptRecord()
+        self._records.clear()
+        self.endResetModel()
+
+    def set_scripts(self, scripts, states, node_classes=None):
+        """
+        Sets the scripts shown by the model
+        Scripts are given in manifest order, children scripts are stored in a folder with the name of its parent script
+        :param scripts: list(str), script paths relative to the code folder (with extension)
+        :param states: list(bool)
+        :param node_classes: dict(str, str) or None, node class of each script path
+        """
+
+        node_classes = node_classes or dict()
+
+        self.beginResetModel()
+        self._root = ScriptRecord()
+        self._records.clear()
+        parents = dict()
+        ordered = sorted(zip(scripts, states), key=lambda script_state: script_state[0].count('/'))
+        for script_path, state in ordered:
+            parent_record = parents.get(path_utils.get_dirname(script_path), self._root)
+            record = ScriptRecord(
+                script_path, bool(state), node_classes.get(script_path, None), parent_record,
+                len(parent_record.children))
+            parent_record.children.append(record)
+            parents[fileio.remove_extension(script_path)] = record
+            self._records[script_path] = record
+        self.endResetModel()
+
+    def get_record(self, index):
+        """
+        Returns the record of the given index. Invalid indices return the root record
+        :param index: QModelIndex
+        :return: ScriptRecord
+        """
+
+        if not index.isValid():
+            return self._root
+
+        return index.internalPointer()
+
+    def get_scripts_manifest(self):
+        """
+        Returns the scripts and states stored in the model, including the ones that are not fetched yet
+        :return: tuple(list(str), list(bool))
+        """
+
+        scripts = list()
+        states = list()
+        records = list(reversed(self._root.children))
+        while records:
+            record = records.pop()
+            scripts.append(record.path)
+            states.append(record.state)
+            records.extend(reversed(record.children))
+
+        return scripts, states
+
+    def index_from_path(self, script_path):
+        """
+        Returns the index of the given script. Rows of its ancestors are fetched if necessary
+        :param script_path: str
+        :return: QModelIndex
+        """
+
+        record = self._records.get(script_path, None)
+        if not record:
+            return QModelIndex()
+
+        ancestors = list()
+        parent_record = record
+        while parent_record.parent is not None:
+            ancestors.append(parent_record)
+            parent_record = parent_record.parent
+
+        parent_index = QModelIndex()
+        for ancestor in reversed(ancestors):
+            if ancestor.row >= ancestor.parent.fetched:
+                self._fetch(parent_index, ancestor.parent, ancestor.row + 1)
+            parent_index = self.createIndex(ancestor.row, 0, ancestor)
+
+        return parent_index
+
+    def set_run_state(self, script_path, state):
+        """
+        Sets the run state of the given script
+        :param script_path: str
+        :param state: int
+        """
+
+        record = self._records.get(script_path, None)
+        if not record or record.run_state == state:
+            return
+
+        record.run_state = state
+        self._emit_record_changed(record)
+
+    def set_log(self, script_path, log):
+        """
+        Sets the log of the given script
+        :param script_path: str
+        :param log: str
+        """
+
+        record = self._records.get(script_path, None)
+        if not record:
+            return
+
+        record.log = log
+        self._emit_record_changed(record)
+
+    def reset_run_states(self):
+        """
+        Resets the run state of all the scripts
+        """
+
+        for record in self._records.values():
+            record.run_state = -1
+            record.log = ''
+
+        self._emit_rows_changed(QModelIndex(), self._root)
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _fetch(self, parent_index, record, count):
+        """
+        Internal function that inserts the children rows of the given record until the given count is reached
+        :param parent_index: QModelIndex
+        :param record: ScriptRecord
+        :param count: int
+        """
+
+        if count <= record.fetched:
+            return
+
+        self.beginInsertRows(parent_index, record.fetched, count - 1)
+        record.fetched = count
+        self.endInsertRows()
+
+    def _emit_record_changed(self, record):
+        """
+        Internal function that notifies the views that the given record changed. Not fetched rows are skipped
+        :param record: ScriptRecord
+        """
+
+        if record.row >= record.parent.fetched:
+            return
+
+        index = self.createIndex(record.row, 0, record)
+        self.dataChanged.emit(index, index)
+
+    def _emit_rows_changed(self, parent_index, record):
+        """
+        Internal function that notifies the views that all fetched rows below the given record changed
+        :param parent_index: QModelIndex
+        :param record: ScriptRecord
+        """
+
+        if not record.fetched:
+            return
+
+        self.dataChanged.emit(self.index(0, 0, parent_index), self.index(record.fetched - 1, 0, parent_index))
+        for child in record.children[:record.fetched]:
+            self._emit_rows_changed(self.createIndex(child.row, 0, child), child)
@@ -0,0 +1,246 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains view to show big scripts manifests
+Unlike script trees, no widget item is created per script: the view reads the compact records of a ScriptsModel and
+all rows share the same icons and context menu
+"""
+
+from __future__ import print_function, division, absolute_import
+
+__author__ = "Tomas Poveda"
+__license__ = "MIT"
+__maintainer__ = "Tomas Poveda"
+__email__ = "tpovedatd@gmail.com"
+
+import logging
+
+from Qt.QtCore import *
+from Qt.QtWidgets import *
+
+from tpDcc.libs.python import fileio
+
+from tpRigToolkit.tools.rigbuilder.items import base
+from tpRigToolkit.tools.rigbuilder.widgets.base import scriptsmodel
+
+LOGGER = logging.getLogger('tpRigToolkit')
+
+
+class ScriptsView(QTreeView, object):
+
+    HEADER_LABEL = 'Scripts'
+
+    runCode = Signal(object)
+    runCodeGroup = Signal(object)
+    setStartPoint = Signal(object)
+    cancelStartPoint = Signal()
+    setBreakPoint = Signal(object)
+    cancelBreakPoint = Signal()
+    browseCode = Signal(object)
+
+    def __init__(self, settings=None, parent=None):
+        super(ScriptsView, self).__init__(parent)
+
+        self._object = None
+        self._settings = settings
+        self._allow_scripts_manifest_update = True
+
+        self._model = scriptsmodel.ScriptsModel(header_label=self.HEADER_LABEL, parent=self)
+        self.setModel(self._model)
+
+        self.setUniformRowHeights(True)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setAlternatingRowColors(True)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.header().setDefaultAlignment(Qt.AlignCenter)
+
+        self._context_menu = self._create_context_menu()
+
+        self._model.checkStateChanged.connect(self._on_check_state_changed)
+        self.customContextMenuRequested.connect(self._on_item_menu)
+
+    # ================================================================================================
+    # ======================== BASE
+    # ================================================================================================
+
+    def settings(self):
+        """
+        Returns settings used by the view
+        :return: QtSettings
+        """
+
+        return self._settings
+
+    def object(self):
+        """
+        Returns object whose scripts are shown by the view
+        :return: object
+        """
+
+        return self._object
+
+    def set_object(self, script_object):
+        """
+        Sets the object whose scripts are shown by the view
+        :param script_object: object
+        """
+
+        self._object = script_object
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reloads the scripts manifest of the current object
+        """
+
+        current_object = self.object()
+        if not current_object:
+            self._model.clear()
+            return
+
+        scripts, states = current_object.get_scripts_manifest()
+        scripts = scripts or list()
+        states = states or list()
+
+        code_folders = set(current_object.get_code_folders() or list())
+        found_scripts = list()
+        found_states = list()
+        for script_path, state in zip(scripts, states):
+            if fileio.remove_extension(script_path) not in code_folders:
+                continue
+            found_scripts.append(script_path)
+            found_states.append(state)
+
+        self._model.set_scripts(found_scripts, found_states)
+
+    def get_current_path(self):
+        """
+        Returns the path of the current script
+        :return: str or None
+        """
+
+        index = self.currentIndex()
+        if not index.isValid():
+            return None
+
+        return index.data(scriptsmodel.PATH_ROLE)
+
+    def reset_items_state(self):
+        """
+        Resets the states of all scripts
+        """
+
+        self._model.reset_run_states()
+
+    def set_item_state(self, directory, state):
+        """
+        Sets the run state of the script
+        :param directory: str
+        :param state: int
+        """
+
+        if state > -1:
+            index = self._model.index_from_path(directory)
+            if index.isValid():
+                self.scrollTo(index)
+        self._model.set_run_state(directory, state)
+
+    def set_item_log(self, directory, log):
+        """
+        Sets the script log
+        :param directory: str
+        :param log: str
+        """
+
+        self._model.set_log(directory, log)
+
+    def get_current_scripts_manifest(self):
+        """
+        Returns the current script manifest of the object
+        :return: tuple(list(str), list(bool))
+        """
+
+        return self._model.get_scripts_manifest()
+
+    def update_scripts_manifest(self):
+        """
+        Forces the update (if allowed) of the scripts manifest
+        """
+
+        if not self._allow_scripts_manifest_update:
+            return
+
+        current_object = self.object()
+        if not current_object:
+            LOGGER.debug('Impossible to update scripts manifest because script object is not defined!')
+            return
+
+        scripts, states = self.get_current_scripts_manifest()
+        current_object.set_scripts_manifest(scripts, states)
+
+    # ================================================================================================
+    # ======================== INTERNAL
+    # ================================================================================================
+
+    def _create_context_menu(self):
+        """
+        Internal function that creates the context menu shared by all the rows of the view
+        :return: QMenu
+        """
+
+        context_menu = QMenu(self)
+
+        run_action = context_menu.addAction(base.get_icon('play'), 'Run')
+        run_group_action = context_menu.addAction(base.get_icon('play'), 'Run Group')
+        context_menu.addSeparator()
+        set_start_point_action = context_menu.addAction(base.get_icon('start'), 'Set Start Point')
+        cancel_start_point_action = context_menu.addAction(base.get_icon('cancel'), 'Cancel Start Point')
+        context_menu.addSeparator()
+        set_break_point_action = context_menu.addAction(base.get_icon('finish_flag'), 'Set Break Point')
+        cancel_break_point_action = context_menu.addAction(base.get_icon('cancel'), 'Cancel Break Point')
+        context_menu.addSeparator()
+        browse_action = context_menu.addAction(base.get_icon('open'), 'Browse')
+
+        run_action.triggered.connect(lambda: self._emit_current(self.runCode))
+        run_group_action.triggered.connect(lambda: self._emit_current(self.runCodeGroup))
+        set_start_point_action.triggered.connect(lambda: self._emit_current(self.setStartPoint))
+        cancel_start_point_action.triggered.connect(self.cancelStartPoint.emit)
+        set_break_point_action.triggered.connect(lambda: self._emit_current(self.setBreakPoint))
+        cancel_break_point_action.triggered.connect(self.cancelBreakPoint.emit)
+        browse_action.triggered.connect(lambda: self._emit_current(self.browseCode))
+
+        return context_menu
+
+    def _emit_current(self, signal):
+        """
+        Internal function that emits the given signal with the path of the current script
+        :param signal: Signal
+        """
+
+        script_path = self.get_current_path()
+        if script_path:
+            signal.emit(script_path)
+
+    # ================================================================================================
+    # ======================== CALLBACKS
+    # ================================================================================================
+
+    def _on_check_state_changed(self, script_path):
+        """
+        Internal callback function that is called when a script is checked/unchecked by the user
+        :param script_path: str
+        """
+
+        self.update_scripts_manifest()
+
+    def _on_item_menu(self, pos):
+        """
+        Internal callback function that shows the context menu when the user right clicks a script
+        :param pos: QPos
+        """
+
+        if not self.object() or not self.indexAt(pos).isValid():
+            return
+
+        self._context_menu.exec_(self.viewport().mapToGlobal(pos))
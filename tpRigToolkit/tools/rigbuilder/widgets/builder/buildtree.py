@@ -15,7 +15,8 @@ from tpDcc.libs.qt.core import qtutils
 from tpDcc.libs.python import osplatform, timers, path as path_utils
 
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import utils, consts
+from tpRigToolkit.tools.rigbuilder.core import utils, consts, buildtrace
+from tpRigToolkit.tools.rigbuilder.objects import script
 from tpRigToolkit.tools.rigbuilder.items import build
 from tpRigToolkit.tools.rigbuilder.widgets.rig import scriptstree
 
@@ -36,6 +37,8 @@ class BuildTree(scriptstree.ScriptTree, object):
     def __init__(self, settings=None, parent=None):
         super(BuildTree, self).__init__(settings=settings, parent=parent)
 
+        self._build_trace = None
+
         self.setItemDelegate(build.BuildItemsDelegate(self))
 
     # ================================================================================================
@@ -66,13 +69,17 @@ class BuildTree(scriptstree.ScriptTree, object):
         """
 
         add_icon = tp.ResourcesMgr().icon('add')
+        start_icon = tp.ResourcesMgr().icon('start')
         refresh_icon = tp.ResourcesMgr().icon('refresh')
 
         add_action = self._context_menu.addAction(add_icon, 'Add Builder Node')
         self._context_menu.addSeparator()
+        run_from_start_point_action = self._context_menu.addAction(start_icon, 'Run From Start Point')
+        self._context_menu.addSeparator()
         refresh_action = self._context_menu.addAction(refresh_icon, 'Refresh')
 
         add_action.triggered.connect(self._on_add_builder_node)
+        run_from_start_point_action.triggered.connect(self._on_run_from_start_point)
         refresh_action.triggered.connect(self._on_refresh)
 
     def _setup_item(self, item, state):
@@ -141,20 +148,28 @@ class BuildTree(scriptstree.ScriptTree, object):
         item.setBackground(0, background)
 
         status = False
+        trace = self._build_trace or buildtrace.NULL_TRACE
+        node_name = item.text(0)
+        node_path = self.get_item_path(item)
+        if node_path:
+            node_name = path_utils.join_path(node_path, node_name)
 
         try:
             if not item.node.rig:
                 item.node.rig = object
 
-            if run_level == consts.BuildLevel.PRE:
-                status = item.node.pre_run()
-            elif run_level == consts.BuildLevel.MAIN:
-                status = item.node.run()
-            elif run_level == consts.BuildLevel.POST:
-                status = item.node.post_run()
+            with trace.span(node_name, run_level):
+                with trace.span(node_name, buildtrace.TracePhase.EXECUTE, build_level=run_level):
+                    if run_level == consts.BuildLevel.PRE:
+                        status = item.node.pre_run()
+                    elif run_level == consts.BuildLevel.MAIN:
+                        status = item.node.run()
+                    elif run_level == consts.BuildLevel.POST:
+                        status = item.node.post_run()
 
-            log = osplatform.get_env_var('RIGBUILDER_LAST_TEMP_LOG')
-            item.set_log(log)
+                with trace.span(node_name, buildtrace.TracePhase.LOGGING, build_level=run_level):
+                    log = osplatform.get_env_var('RIGBUILDER_LAST_TEMP_LOG')
+                    item.set_log(log)
 
             if log.find('Warning') > -1 or log.find('WARNING') > -1 or log.find('warning') > -1:
                 item.set_state(2)
@@ -222,11 +237,12 @@ class BuildTree(scriptstree.ScriptTree, object):
 
         _reset_item(self.invisibleRootItem())
 
-    def run_current_item(self, external_code_library=None, group_only=False):
+    def run_current_item(self, external_code_library=None, group_only=False, trace_file=None):
         """
         Internal function that executes current item
         :param external_code_library:
         :param group_only: bool
+        :param trace_file: str or None, file where the build trace is exported in Chrome trace format
         """
 
         current_object = self.object()
@@ -248,6 +264,7 @@ class BuildTree(scriptstree.ScriptTree, object):
 
         watch = timers.StopWatch()
         watch.start(feedback=False)
+        self._build_trace = buildtrace.BuildTrace(name=current_object.get_name())
 
         self._reset_items()
         self.repaint()
@@ -260,6 +277,16 @@ class BuildTree(scriptstree.ScriptTree, object):
         if last_path:
             last_name = path_utils.join_path(last_path, last_name)
 
+        items_dict = dict()
+        for item in items:
+            script_name = item.text(0)
+            script_path = self.get_item_path(item)
+            if script_path:
+                script_name = path_utils.join_path(script_path, script_name)
+            items_dict.setdefault(script_name, item)
+
+        state_tree = current_object.get_script_state_tree()
+
         set_end_states = False
         for build_level in [consts.BuildLevel.PRE, consts.BuildLevel.MAIN, consts.BuildLevel.POST]:
             for i in range(len(scripts)):
@@ -270,20 +297,18 @@ class BuildTree(scriptstree.ScriptTree, object):
                         item = self._get_item_by_name(scripts[i])
                         if item:
                             item.set_state(-1)
-                    for item in items:
-                        script_name = item.text(0)
-                        script_path = self.get_item_path(item)
-                        if script_path:
-                            script_name = path_utils.join_path(script_path, script_name)
-                        if script_name == scripts[i]:
-                            run_children = False
-                            if group_only:
-                                run_children = True
-                            self._run_item(item, build_level, item.node, run_children)
-                            if group_only:
-                                break
-                            if script_name == last_name:
-                                set_end_states = True
+                    item = items_dict.get(scripts[i], None)
+                    if item is None:
+                        continue
+                    if state_tree.is_ancestor_disabled(scripts[i]):
+                        tpRigToolkit.logger.warning('Skipping: {}'.format(scripts[i]))
+                    else:
+                        run_children = False
+                        if group_only:
+                            run_children = True
+                        self._run_item(item, build_level, item.node, run_children)
+                    if not group_only and scripts[i] == last_name:
+                        set_end_states = True
 
         osplatform.set_env_var('RIGBUILDER_RUN', False)
         osplatform.set_env_var('RIGBULIDER_STOP', False)
@@ -294,9 +319,57 @@ class BuildTree(scriptstree.ScriptTree, object):
         else:
             tpRigToolkit.logger.info('Builder Nodes run in {} seconds'.format(seconds))
 
+        tpRigToolkit.logger.info('Build trace (seconds):\n{}'.format(
+            self._build_trace.format_summary(limit=script.ScriptObject.TRACE_SUMMARY_LIMIT)))
+        if trace_file:
+            self._build_trace.export_chrome_trace(trace_file)
+            tpRigToolkit.logger.info('Build trace exported: {}'.format(trace_file))
+
+    def get_build_trace(self):
+        """
+        Returns the trace recorded during the last run of the builder nodes
+        :return: BuildTrace or None
+        """
+
+        return self._build_trace
+
+    def run_from_start_point(self, checkpoint_interval=None, checkpoint_scripts=None):
+        """
+        Runs the build of the current object from the start point
+        The scene is restored from the nearest checkpoint saved before the start point, so the nodes before the
+        checkpoint are not executed again
+        :param checkpoint_interval: float or None, seconds of build time between the checkpoints saved during the build.
+            If not given, checkpoints are only saved after the given checkpoint scripts
+        :param checkpoint_scripts: list(str) or None, scripts after which a scene checkpoint is saved
+        """
+
+        current_object = self.object()
+        if not current_object:
+            tpRigToolkit.logger.warning('Impossible to run build because object is not defined!')
+            return
+        start_script = self.get_start_point_name()
+        if not start_script:
+            tpRigToolkit.logger.warning('Impossible to run build because no start point is defined!')
+            return
+
+        self._reset_items()
+        self.repaint()
+
+        status_list = current_object.run(
+            start_script=start_script, checkpoint_interval=checkpoint_interval, checkpoint_scripts=checkpoint_scripts,
+            hard_error=False)
+
+        for script_name, status in status_list or list():
+            if status == script.ScriptStatus.SKIPPED:
+                continue
+            self.set_item_state(script_name, 1 if status == script.ScriptStatus.SUCCESS or status is True else 0)
+
     def _on_run_current_item(self, external_code_library=None, group_only=False):
         self.run_current_item(external_code_library=external_code_library, group_only=group_only)
 
+    def _on_run_from_start_point(self):
+        self.run_from_start_point()
+
     # ================================================================================================
     # ======================== BASE
     # ================================================================================================
@@ -16,13 +16,13 @@ from tpDcc.libs.qt.widgets import tabs, breadcrumb, stack
 from tpDcc.libs.python import osplatform, path as path_utils
 
 import tpRigToolkit
-from tpRigToolkit.tools.rigbuilder.core import tool
+from tpRigToolkit.tools.rigbuilder.core import tool, optionstore
 from tpRigToolkit.tools.rigbuilder.widgets.base import options
 from tpRigToolkit.tools.rigbuilder.widgets.builder import builder
 from tpRigToolkit.tools.rigbuilder.widgets.rig import rigoutliner
 # from tpRigToolkit.tools.rigbuilder.widgets.blueprint import blueprintseditor, blueprint
 # from tpRigToolkit.tools.rigbuilder.widgets.puppeteer import puppeteer
-from tpRigToolkit.tools.rigbuilder.objects import rig
+from tpRigToolkit.tools.rigbuilder.objects import rig, script
 from tpRigToolkit.tools.rigbuilder.tools import datalibrary, controls, properties, puppeteer as puppet_tools
 from tpRigToolkit.tools.rigbuilder.tools import buildnodeslibrary, blueprintslibrary, renamer, connection
 
@@ -502,6 +502,8 @@ class HubWidget(window.BaseWindow, object):
         rigs = self._outliner.tree_widget.selectedItems()
         if not rigs:
             self._update_rig(None)
+            optionstore.evict()
+            script.CodeFolderIndex.evict()
     #         if self._project:
     #             data_library.set_path(self._project.full_path)
     #         else:
@@ -521,6 +523,10 @@ class HubWidget(window.BaseWindow, object):
 
         rig_name = item.get_name()
         self._update_rig(rig_name)
+        # Options files and code indices of the previous rig are not used anymore
+        rig_path = self._current_rig.get_path() if self._current_rig else None
+        optionstore.evict(rig_path)
+        script.CodeFolderIndex.evict(rig_path)
         self._outliner.setFocus()
     #     data_library.set_path(self._current_rig.get_path())
         self._builder.set_rig(self._current_rig)
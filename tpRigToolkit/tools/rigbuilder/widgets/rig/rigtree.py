@@ -7,6 +7,7 @@ Module that contains rig outliner widget for RigBuilder
 
 from __future__ import print_function, division, absolute_import
 
+import os
 import string
 import logging
 
@@ -17,6 +18,7 @@ import tpDcc
 from tpDcc.libs.python import osplatform, fileio, path as path_utils, name as name_utils
 from tpDcc.libs.qt.core import qtutils
 
+from tpRigToolkit.tools.rigbuilder.core import watcher, rigindex, rigstates
 from tpRigToolkit.tools.rigbuilder.items import rig as rig_item
 from tpRigToolkit.tools.rigbuilder.objects import helpers, rig
 from tpRigToolkit.tools.rigbuilder.widgets.base import basetree
@@ -69,6 +71,24 @@ class RigOutlinerTree(basetree.BaseTree, object):
         self.setSelectionMode(self.SingleSelection)
         self.setAlternatingRowColors(True)
 
+        self._watcher = watcher.FileWatcher(parent=self)
+        self._watcher.changed.connect(self._on_files_changed)
+
+        # Rig states (enable state and sub rigs) are resolved in background, visible rigs are resolved first
+        self._pending_states = dict()
+        self._states_loader = rigstates.RigStatesLoader(parent=self)
+        self._states_loader.resolved.connect(self._on_rig_states_resolved)
+        # Worker threads are stopped when the tree is destroyed. The loader is captured instead of the tree because
+        # Python methods of the tree cannot be called safely while it is destroyed
+        states_loader = self._states_loader
+        self.destroyed.connect(lambda *args: states_loader.shutdown())
+        self._prioritize_timer = QTimer(self)
+        self._prioritize_timer.setSingleShot(True)
+        self._prioritize_timer.setInterval(50)
+        self._prioritize_timer.timeout.connect(self._prioritize_visible_rigs)
+        self.verticalScrollBar().valueChanged.connect(self._on_viewport_changed)
+        self.itemExpanded.connect(self._on_viewport_changed)
+
         self._create_context_menu()
         self._update_style()
 
@@ -201,12 +221,19 @@ class RigOutlinerTree(basetree.BaseTree, object):
         Look for rigs on the current project directory
         """
 
+        self._states_loader.cancel()
+        self._pending_states.clear()
+
         rigs, folders = helpers.RigHelpers().find_rigs(directory=self._directory, return_also_non_objects_list=True)
         self._load_rigs(rigs, folders)
 
         self._current_item = None
         self._last_item = None
 
+        self._watcher.clear()
+        if self._directory:
+            self._watcher.add_root(self._directory)
+
     def _create_context_menu(self):
         """
         Overrides base BaseTree _create_context_menu function
@@ -317,6 +344,9 @@ class RigOutlinerTree(basetree.BaseTree, object):
         if self._auto_add_sub_items:
             self._add_sub_items(item)
 
+        if hasattr(item, 'get_path') and not item.is_folder():
+            self._watcher.add_root(item.get_path())
+
         if self._shift_activate:
             child_count = item.childCount()
             for i in range(child_count):
@@ -339,6 +369,9 @@ class RigOutlinerTree(basetree.BaseTree, object):
             self.setCurrentItem(item)
             self.setItemSelected(item, True)
 
+        if hasattr(item, 'get_path'):
+            self._unwatch_rig_path(item.get_path())
+
     def _on_item_menu(self, pos):
         """
         Overrides base BaseTree _on_item_menu function
@@ -725,7 +758,7 @@ class RigOutlinerTree(basetree.BaseTree, object):
         else:
             pass
 
-    def _add_rig_item(self, name, parent_item=None, create=False, find_parent_path=True, folder=False):
+    def _add_rig_item(self, name, parent_item=None, create=False, find_parent_path=True, folder=False, index=None):
         """
         Internal function used to add rig tasks into the tree
         :param name:
@@ -733,6 +766,7 @@ class RigOutlinerTree(basetree.BaseTree, object):
         :param create:
         :param find_parent_path:
         :param folder:
+        :param index: int or None, position where the item is inserted. If given, selected item is not used as parent
         :return:
         """
 
@@ -744,7 +778,7 @@ class RigOutlinerTree(basetree.BaseTree, object):
         if items:
             current_item = items[0]
 
-        if not parent_item and current_item:
+        if not parent_item and current_item and index is None:
             parent_item = current_item
             expand_to = True
 
@@ -759,35 +793,30 @@ class RigOutlinerTree(basetree.BaseTree, object):
 
         item = self.ITEM_WIDGET(directory=self._directory, name=name, library=self.library())
 
-        if not folder:
-            rig_inst = rig.RigObject(name=name)
-            rig_inst.set_directory(self._directory)
-            rig_inst.set_library(self.library())
-        else:
-            rig_inst = None
+        if folder:
             item.set_folder(True)
 
         if create:
             item.create()
 
-        if parent_item and not folder:
-            enable = rig_inst.get_setting('enable')
-            if not enable and self._checkable:
-                item.setCheckState(0, Qt.Unchecked)
-            if enable and self._checkable:
-                item.setCheckState(0, Qt.Checked)
-
         if parent_item:
             if expand_to:
                 self._auto_add_sub_items = False
                 self.expandItem(parent_item)
                 self._auto_add_sub_items = True
-            parent_item.addChild(item)
+            if index is None:
+                parent_item.addChild(item)
+            else:
+                parent_item.insertChild(index, item)
         else:
-            self.addTopLevelItem(item)
+            if index is None:
+                self.addTopLevelItem(item)
+            else:
+                self.insertTopLevelItem(index, item)
 
-        if item.has_parts() and not folder:
-            QTreeWidgetItem(item)
+        # Enable state and sub rigs are resolved in background, see _on_rig_states_resolved
+        if not folder:
+            self._request_rig_state(item, name, checkable=bool(parent_item))
 
         return item
 
@@ -798,7 +827,7 @@ class RigOutlinerTree(basetree.BaseTree, object):
         :param rig_path: str
         """
 
-        parts, folders = helpers.find_rigs(rig_path, return_also_non_rig_list=True)
+        parts, folders = helpers.RigHelpers.find_rigs(rig_path, return_also_non_objects_list=True)
         sub_path = path_utils.remove_common_path(self._directory, rig_path)
         self.setUpdatesEnabled(False)
         try:
@@ -893,6 +922,169 @@ class RigOutlinerTree(basetree.BaseTree, object):
         for f in folders:
             self._add_rig_item(f, create=True, folder=True)
 
+    def _get_watched_path(self, path):
+        """
+        Internal function that returns given path in the format used by the file watcher
+        :param path: str
+        :return: str
+        """
+
+        return (path or '').replace('\\', '/').rstrip('/')
+
+    def _get_rig_item_by_path(self, rig_path):
+        """
+        Internal function that returns the item of the tree that points to the given rig path
+        :param rig_path: str
+        :return: QTreeWidgetItem or None. Tree root item is returned if given path is the project path
+        """
+
+        directory = self._get_watched_path(self._directory)
+        rig_path = self._get_watched_path(rig_path)
+        if rig_path == directory:
+            return self.invisibleRootItem()
+        if not rig_path.startswith('{}/'.format(directory)):
+            return None
+
+        tree_item = self.invisibleRootItem()
+        for name in rig_path[len(directory) + 1:].split('/'):
+            found_item = None
+            for i in range(tree_item.childCount()):
+                child = tree_item.child(i)
+                if isinstance(child, self.ITEM_WIDGET) and child.text(0) == name:
+                    found_item = child
+                    break
+            if not found_item:
+                return None
+            tree_item = found_item
+
+        return tree_item
+
+    def _sync_rig_items(self, rig_path):
+        """
+        Internal function that updates the children items of the item that points to the given path with the rigs and
+        folders that are located in disk. Only the items that changed are added or removed
+        :param rig_path: str
+        """
+
+        tree_item = self._get_rig_item_by_path(rig_path)
+        if not tree_item:
+            return
+
+        rigindex.mark_dirty(rig_path)
+        is_root = tree_item is self.invisibleRootItem()
+
+        # Items that are not expanded only need to know whether they have sub rigs or not
+        if not is_root and not tree_item.isExpanded():
+            if not tree_item.is_folder():
+                self._request_rig_state(tree_item, tree_item.get_name(), checkable=bool(tree_item.parent()))
+            return
+
+        rigs, folders = helpers.RigHelpers.find_rigs(rig_path, return_also_non_objects_list=True)
+        names = [(name, False) for name in rigs] + [(name, True) for name in folders]
+        folder_names = dict(names)
+
+        current_names = list()
+        for i in reversed(range(tree_item.childCount())):
+            child = tree_item.child(i)
+            name = child.text(0)
+            if not isinstance(child, self.ITEM_WIDGET) or folder_names.get(name, None) != child.is_folder():
+                if hasattr(child, 'get_path'):
+                    self._unwatch_rig_path(child.get_path())
+                tree_item.removeChild(child)
+            else:
+                current_names.append(name)
+        current_names = set(current_names)
+
+        sub_path = '' if is_root else tree_item.get_name()
+        self.setUpdatesEnabled(False)
+        try:
+            for i, (name, folder) in enumerate(names):
+                if name in current_names:
+                    continue
+                if sub_path:
+                    name = path_utils.join_path(sub_path, name)
+                self._add_rig_item(
+                    name, None if is_root else tree_item, create=folder, find_parent_path=False, folder=folder,
+                    index=min(i, tree_item.childCount()))
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _request_rig_state(self, item, name, checkable=True):
+        """
+        Internal function that requests the resolution of the enable state and sub rigs of the given rig item
+        :param item: QTreeWidgetItem
+        :param name: str, name of the rig (relative to the tree directory)
+        :param checkable: bool, whether the check state of the item must be updated with the enable state of the rig
+        """
+
+        self._pending_states[path_utils.join_path(self._directory, name)] = (item, checkable)
+        self._states_loader.request(self._directory, [name])
+        self._prioritize_timer.start()
+
+    def _prioritize_visible_rigs(self):
+        """
+        Internal function that moves the pending rig states of the items visible in the viewport to the front of the
+        resolution queue, sorted by their position in the viewport
+        """
+
+        if not self._pending_states:
+            return
+
+        viewport_rect = self.viewport().rect()
+        visible = list()
+        for path, (item, _) in self._pending_states.items():
+            try:
+                item_rect = self.visualItemRect(item)
+            except RuntimeError:
+                continue
+            if item_rect.isValid() and item_rect.intersects(viewport_rect):
+                visible.append((item_rect.top(), path))
+
+        self._states_loader.prioritize([path for _, path in sorted(visible)])
+
+    def _rename_rig_item(self, old_path, new_path):
+        """
+        Internal function that renames the item that points to the given path without rebuilding it
+        :param old_path: str
+        :param new_path: str
+        :return: bool, True if the item was renamed; False otherwise
+        """
+
+        if os.path.dirname(old_path) != os.path.dirname(new_path):
+            return False
+
+        tree_item = self._get_rig_item_by_path(old_path)
+        if not tree_item or tree_item is self.invisibleRootItem():
+            return False
+
+        old_name = tree_item.get_name()
+        new_name = path_utils.join_path(os.path.dirname(old_name), os.path.basename(new_path)).lstrip('/')
+        tree_item.set_name(new_name)
+        tree_item.setText(0, os.path.basename(new_path))
+        for child in self._get_ancestors(tree_item):
+            if not isinstance(child, self.ITEM_WIDGET):
+                continue
+            child_name = child.get_name()
+            if child_name.startswith('{}/'.format(old_name)):
+                child.set_name(new_name + child_name[len(old_name):])
+
+        if tree_item.isExpanded():
+            self._unwatch_rig_path(old_path)
+            self._watcher.add_root(new_path)
+
+        return True
+
+    def _unwatch_rig_path(self, rig_path):
+        """
+        Internal function that stops watching the given rig path and the paths of its sub rigs
+        :param rig_path: str
+        """
+
+        rig_path = self._get_watched_path(rig_path)
+        for root in self._watcher.roots():
+            if root == rig_path or root.startswith('{}/'.format(rig_path)):
+                self._watcher.remove_root(root)
+
     # ================================================================================================
     # ======================== CALLBACKS
     # ================================================================================================
@@ -980,3 +1172,63 @@ class RigOutlinerTree(basetree.BaseTree, object):
 
         if rig_path:
             fileio.open_browser(rig_path)
+
+    def _on_viewport_changed(self, *args):
+        """
+        Internal callback function that is called when the items visible in the viewport change
+        """
+
+        if self._pending_states:
+            self._prioritize_timer.start()
+
+    def _on_rig_states_resolved(self, states):
+        """
+        Internal callback function that is called with a batch of rig states resolved in background
+        :param states: list(rigstates.RigState)
+        """
+
+        self.setUpdatesEnabled(False)
+        try:
+            for state in states:
+                item, checkable = self._pending_states.pop(state.path, (None, False))
+                if not item:
+                    continue
+                try:
+                    if item.treeWidget() is not self:
+                        continue
+                except RuntimeError:
+                    continue
+                # Check state is only applied once, so changes done by the user are not overridden
+                if checkable and self._checkable and state.enabled is not None and \
+                        item.data(0, Qt.CheckStateRole) is None:
+                    item.setCheckState(0, Qt.Checked if state.enabled else Qt.Unchecked)
+                if state.has_parts and not item.childCount():
+                    QTreeWidgetItem(item)
+                elif not state.has_parts and not item.isExpanded():
+                    self.delete_tree_item_children(item)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def _on_files_changed(self, events):
+        """
+        Internal callback function that is called when rigs are added, removed or renamed in disk
+        Only the items of the folders that changed are updated
+        :param events: list(watcher.WatchEvent)
+        """
+
+        if not self._directory:
+            return
+
+        rig_paths = list()
+        for event in events:
+            if not event.is_dir:
+                continue
+            if event.type == watcher.RENAMED:
+                self._rename_rig_item(event.path, event.new_path)
+            for path in (event.path, event.new_path):
+                parent_path = os.path.dirname(path) if path else None
+                if parent_path and parent_path not in rig_paths:
+                    rig_paths.append(parent_path)
+
+        for rig_path in sorted(rig_paths, key=lambda p: p.count('/')):
+            self._sync_rig_items(rig_path)
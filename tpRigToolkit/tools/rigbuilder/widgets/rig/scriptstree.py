@@ -18,7 +18,7 @@ from tpDcc.core import scripts
 from tpDcc.libs.python import osplatform, timers, fileio, path as path_utils
 from tpDcc.libs.qt.core import qtutils
 
-from tpRigToolkit.tools.rigbuilder.core import utils
+from tpRigToolkit.tools.rigbuilder.core import utils, consts, watcher
 from tpRigToolkit.tools.rigbuilder.items import script
 from tpRigToolkit.tools.rigbuilder.widgets.base import basetree
 
@@ -44,6 +44,9 @@ class ScriptTree(basetree.BaseTree, object):
 
         super(ScriptTree, self).__init__(settings=settings, parent=parent)
 
+        self._watcher = watcher.FileWatcher(parent=self)
+        self._watcher.changed.connect(self._on_code_changed)
+
         self.setDragDropMode(self.InternalMove)
         self.setDefaultDropAction(Qt.MoveAction)
         self.setAcceptDrops(False)
@@ -157,6 +160,34 @@ class ScriptTree(basetree.BaseTree, object):
             if item:
                 self.set_break_point(item)
 
+    def set_object(self, script_object):
+        """
+        Overrides base BaseTree set_object function
+        Code folders of the object are watched, so changes done in disk are applied into the tree. Only the contents
+        of the manifest and node info files are watched, the rest of files are only notified when added or removed
+        :param script_object: object
+        """
+
+        super(ScriptTree, self).set_object(script_object)
+
+        self._watcher.clear()
+        if script_object:
+            self._watcher.add_root(
+                script_object.get_code_path(), recursive=True, watch_files=self._is_watched_code_file,
+                ignore=watcher.DEFAULT_IGNORE + ('{}*{}'.format(consts.FOLDERS_PREFIX, consts.FOLDERS_SUFFIX),))
+
+    def _is_watched_code_file(self, file_path):
+        """
+        Internal function that returns whether or not the contents of the given code file are watched
+        Manifest and node info files are named as the code folder they are located in
+        :param file_path: str
+        :return: bool
+        """
+
+        folder_path, _, file_name = file_path.rpartition('/')
+
+        return fileio.remove_extension(file_name) == folder_path.rpartition('/')[2]
+
     def _create_item(self, filename, state=False):
         """
         Internal function that creates a new script tree item
@@ -276,7 +307,7 @@ class ScriptTree(basetree.BaseTree, object):
             LOGGER.debug('Current object has no scripts!')
             return
 
-        code_folders = current_object.get_code_folders()
+        code_folders = set(current_object.get_code_folders() or list())
         found_scripts = list()
         found_states = list()
 
@@ -893,6 +924,72 @@ class ScriptTree(basetree.BaseTree, object):
 
         pass
 
+    def _sync_items(self):
+        """
+        Internal function that updates the tree with the scripts and states stored in disk
+        Only the items that changed are added, removed or updated. If the order of the scripts changed, the full tree
+        is refreshed
+        """
+
+        files = self._get_files()
+        scripts, states = files if files else (list(), list())
+        states = [bool(state) for state in states]
+        current_scripts, current_states = self.get_current_scripts_manifest()
+        if scripts == current_scripts and states == current_states:
+            return
+
+        scripts_set = set(scripts)
+        current_scripts_set = set(current_scripts)
+        if [s for s in current_scripts if s in scripts_set] != [s for s in scripts if s in current_scripts_set]:
+            self.refresh()
+            return
+
+        orig_scripts_manifest_update = self._allow_scripts_manifest_update
+        self._allow_scripts_manifest_update = False
+        self.setUpdatesEnabled(False)
+        try:
+            items = dict()
+            for script_full, item in zip(current_scripts, self._get_all_items()):
+                items[fileio.remove_extension(script_full)] = item
+
+            # Children are stored after their parents, so they are removed first
+            for script_full in reversed(current_scripts):
+                if script_full in scripts_set:
+                    continue
+                item = items.pop(fileio.remove_extension(script_full))
+                if item is self._start_item:
+                    self.cancel_start_point()
+                if item is self._break_item:
+                    self.cancel_break_point()
+                (item.parent() or self.invisibleRootItem()).removeChild(item)
+
+            sibling_counts = dict()
+            for script_full, state in zip(scripts, states):
+                script_name = fileio.remove_extension(script_full)
+                dir_name = path_utils.get_dirname(script_full)
+                index = sibling_counts.get(dir_name, 0)
+                sibling_counts[dir_name] = index + 1
+                item = items.get(script_name, None)
+                if not item:
+                    parent_item = items.get(dir_name, None) if dir_name else self.invisibleRootItem()
+                    if parent_item is None:
+                        LOGGER.warning('Impossible to add script "{}" because its parent is not in the tree'.format(
+                            script_full))
+                        continue
+                    item = self._add_item(
+                        '...temp...', state, parent=False, update_manifest=False, skip_emit=True)
+                    parent_item.insertChild(index, item)
+                    item.set_text(path_utils.get_basename(script_full))
+                    items[script_name] = item
+                    self._update_item(item)
+                if (item.checkState(0) != Qt.Unchecked) != state:
+                    item.setCheckState(0, Qt.Checked if state else Qt.Unchecked)
+        finally:
+            self.setUpdatesEnabled(True)
+            self._allow_scripts_manifest_update = orig_scripts_manifest_update
+
+        self.refreshed.emit()
+
     # ================================================================================================
     # ======================== CALLBACKS
     # ================================================================================================
@@ -996,3 +1093,39 @@ class ScriptTree(basetree.BaseTree, object):
         """
 
         self.refresh(sync=True)
+
+    def _on_code_changed(self, events):
+        """
+        Internal callback function that is called when the code folder of the current object changes in disk
+        :param events: list(watcher.WatchEvent)
+        """
+
+        current_object = self.object()
+        if not current_object:
+            return
+
+        code_path = current_object.get_code_path().replace('\\', '/').rstrip('/')
+        changed_code_names = list()
+        modified_code_names = list()
+        for event in events:
+            for path in (event.path, event.new_path):
+                if not path or not path.startswith('{}/'.format(code_path)):
+                    continue
+                code_name = path[len(code_path) + 1:]
+                if event.is_dir:
+                    changed_code_names.append(code_name)
+                elif event.type == watcher.MODIFIED:
+                    modified_code_names.append(path_utils.get_dirname(code_name))
+                else:
+                    changed_code_names.append(path_utils.get_dirname(code_name))
+
+        if changed_code_names:
+            current_object._mark_code_dirty(*changed_code_names)
+
+        self._sync_items()
+
+        if modified_code_names:
+            current_scripts, _ = self.get_current_scripts_manifest()
+            for script_full, item in zip(current_scripts, self._get_all_items()):
+                if fileio.remove_extension(script_full) in modified_code_names:
+                    self._update_item(item)